@@ -30,6 +30,8 @@ from app.models.decision import *
 from app.models.reflection import *
 from app.models.value_calibration import *
 from app.models.gamification import *
+from app.models.tag_cache import *
+from app.models.tagging_job import *
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,74 @@
+"""add composite indexes for per-user list queries
+
+Revision ID: 9c1f4e7a2b3d
+Revises: 54193ec04383
+Create Date: 2026-10-18 10:12:41.517204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1f4e7a2b3d"
+down_revision: Union[str, None] = "54193ec04383"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) — each matches a `WHERE owner = ? ORDER BY time`
+# list query so the database can seek and read rows already in order.
+INDEXES = [
+    (
+        "ix_decision_journal_entries_user_id_created_at",
+        "decision_journal_entries",
+        ["user_id", "created_at"],
+    ),
+    (
+        "ix_value_calibration_checkins_user_id_created_at",
+        "value_calibration_checkins",
+        ["user_id", "created_at"],
+    ),
+    (
+        "ix_decision_chat_sessions_user_id_started_at",
+        "decision_chat_sessions",
+        ["user_id", "started_at"],
+    ),
+    (
+        "ix_decision_chat_messages_session_id_created_at",
+        "decision_chat_messages",
+        ["session_id", "created_at"],
+    ),
+    (
+        "ix_user_challenges_user_id_started_at",
+        "user_challenges",
+        ["user_id", "started_at"],
+    ),
+    ("ix_user_badges_user_id_awarded_at", "user_badges", ["user_id", "awarded_at"]),
+    ("ix_user_streaks_user_id", "user_streaks", ["user_id"]),
+]
+
+
+def _existing_tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reason: Some tables (e.g. decision_journal_entries) were created outside the
+    # migration chain, so skip any that are absent instead of failing the upgrade.
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = _existing_tables()
+    for name, table, _columns in reversed(INDEXES):
+        if table in tables:
+            op.drop_index(name, table_name=table)
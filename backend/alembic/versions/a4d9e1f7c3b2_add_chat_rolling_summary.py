@@ -0,0 +1,43 @@
+"""add rolling summary to decision_chat_sessions
+
+Revision ID: a4d9e1f7c3b2
+Revises: f1b6c3d8e2a5
+Create Date: 2026-10-18 22:04:31.518260
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d9e1f7c3b2"
+down_revision: Union[str, None] = "f1b6c3d8e2a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "decision_chat_sessions",
+        sa.Column("rolling_summary", sa.String(), nullable=True),
+    )
+    op.add_column(
+        "decision_chat_sessions",
+        sa.Column(
+            "summarized_message_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("decision_chat_sessions") as batch_op:
+        batch_op.drop_column("summarized_message_count")
+        batch_op.drop_column("rolling_summary")
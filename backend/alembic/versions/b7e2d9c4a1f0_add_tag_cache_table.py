@@ -0,0 +1,45 @@
+"""add tag_cache table
+
+Revision ID: b7e2d9c4a1f0
+Revises: 9c1f4e7a2b3d
+Create Date: 2026-10-18 14:03:27.264118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d9c4a1f0"
+down_revision: Union[str, None] = "9c1f4e7a2b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tag_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("taxonomy_version", sa.String(length=64), nullable=False),
+        sa.Column("domain_tags", sa.JSON(), nullable=False),
+        sa.Column("sentiment_tag", sa.String(length=32), nullable=False),
+        sa.Column("keywords", sa.JSON(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        "ix_tag_cache_last_used_at", "tag_cache", ["last_used_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tag_cache_last_used_at", table_name="tag_cache")
+    op.drop_table("tag_cache")
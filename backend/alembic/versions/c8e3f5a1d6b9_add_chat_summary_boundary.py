@@ -0,0 +1,38 @@
+"""add summarized-through boundary to decision_chat_sessions
+
+Revision ID: c8e3f5a1d6b9
+Revises: a4d9e1f7c3b2
+Create Date: 2026-10-18 23:41:12.604318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8e3f5a1d6b9"
+down_revision: Union[str, None] = "a4d9e1f7c3b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "decision_chat_sessions",
+        sa.Column("summarized_through_at", sa.DateTime(), nullable=True),
+    )
+    op.add_column(
+        "decision_chat_sessions",
+        sa.Column("summarized_through_id", sa.String(length=36), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("decision_chat_sessions") as batch_op:
+        batch_op.drop_column("summarized_through_id")
+        batch_op.drop_column("summarized_through_at")
@@ -0,0 +1,72 @@
+"""add tagging_status column and tagging_jobs table
+
+Revision ID: d3a8f61c5e27
+Revises: b7e2d9c4a1f0
+Create Date: 2026-10-18 16:41:09.338712
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8f61c5e27"
+down_revision: Union[str, None] = "b7e2d9c4a1f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_journal_table() -> bool:
+    return "decision_journal_entries" in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reason: decision_journal_entries is not created by this migration chain
+    has_journal = _has_journal_table()
+    if has_journal:
+        op.add_column(
+            "decision_journal_entries",
+            sa.Column("tagging_status", sa.String(length=16), nullable=True),
+        )
+    foreign_keys = (
+        [sa.ForeignKeyConstraint(["entry_id"], ["decision_journal_entries.id"])]
+        if has_journal
+        else []
+    )
+    op.create_table(
+        "tagging_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("entry_id", sa.String(length=36), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(length=1024), nullable=True),
+        sa.Column("run_after", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        *foreign_keys,
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tagging_jobs_status_run_after",
+        "tagging_jobs",
+        ["status", "run_after"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tagging_jobs_entry_id", "tagging_jobs", ["entry_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tagging_jobs_entry_id", table_name="tagging_jobs")
+    op.drop_index("ix_tagging_jobs_status_run_after", table_name="tagging_jobs")
+    op.drop_table("tagging_jobs")
+    if _has_journal_table():
+        with op.batch_alter_table("decision_journal_entries") as batch_op:
+            batch_op.drop_column("tagging_status")
@@ -0,0 +1,41 @@
+"""add tagged_content_hash to decision_journal_entries
+
+Revision ID: e5c2a7b9d014
+Revises: d3a8f61c5e27
+Create Date: 2026-10-18 18:05:22.417305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c2a7b9d014"
+down_revision: Union[str, None] = "d3a8f61c5e27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_journal_table() -> bool:
+    return "decision_journal_entries" in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reason: decision_journal_entries is not created by this migration chain.
+    # Existing rows keep a NULL hash, so their next text update re-tags them.
+    if _has_journal_table():
+        op.add_column(
+            "decision_journal_entries",
+            sa.Column("tagged_content_hash", sa.String(length=64), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _has_journal_table():
+        with op.batch_alter_table("decision_journal_entries") as batch_op:
+            batch_op.drop_column("tagged_content_hash")
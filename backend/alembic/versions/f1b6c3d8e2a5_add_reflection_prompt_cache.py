@@ -0,0 +1,45 @@
+"""add reflection prompt cache to decision_journal_entries
+
+Revision ID: f1b6c3d8e2a5
+Revises: e5c2a7b9d014
+Create Date: 2026-10-18 21:12:47.093518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b6c3d8e2a5"
+down_revision: Union[str, None] = "e5c2a7b9d014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_journal_table() -> bool:
+    return "decision_journal_entries" in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reason: decision_journal_entries is not created by this migration chain
+    if _has_journal_table():
+        op.add_column(
+            "decision_journal_entries",
+            sa.Column("reflection_prompts", sa.JSON(), nullable=True),
+        )
+        op.add_column(
+            "decision_journal_entries",
+            sa.Column("reflection_prompts_hash", sa.String(length=64), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _has_journal_table():
+        with op.batch_alter_table("decision_journal_entries") as batch_op:
+            batch_op.drop_column("reflection_prompts_hash")
+            batch_op.drop_column("reflection_prompts")
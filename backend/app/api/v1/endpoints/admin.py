@@ -2,7 +2,7 @@
 Admin endpoints for Phronesis backend (protected, internal use only).
 """
 
-from fastapi import APIRouter, Request, HTTPException, status
+from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
 from fastapi.responses import JSONResponse
 import subprocess
 
@@ -25,6 +25,11 @@ Admin endpoints for Phronesis backend (internal use only).
 - See backend/README.md and WORKFLOWS.md for usage.
 """
 import os
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
 
 router = APIRouter()
 
@@ -63,3 +68,64 @@ def run_migration(request: Request):
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/admin/tags/backfill", tags=["admin"])
+def backfill_journal_tags(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Auto-tag journal entries that are missing tags, using batched LLM calls.
+    Protected by MIGRATE_SECRET (must be sent in x-migrate-secret header).
+    Call repeatedly, passing the returned `next_cursor` as `cursor`, until
+    `next_cursor` is null. Entries that failed are retried by a new run
+    (without a cursor).
+    """
+    secret = request.headers.get("x-migrate-secret")
+    expected_secret = os.environ.get("MIGRATE_SECRET")
+    if not expected_secret or not secret or secret != expected_secret:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized"
+        )
+    from app.services.background_jobs import backfill_tags
+
+    return backfill_tags(db, limit=limit, cursor=cursor)
+
+
+@router.get("/admin/metrics", tags=["admin"])
+def read_metrics(request: Request):
+    """
+    Return in-process performance counters (caches, pools) for monitoring.
+    Protected by METRICS_SECRET (must be sent in x-metrics-secret header).
+    """
+    secret = request.headers.get("x-metrics-secret")
+    expected_secret = os.environ.get("METRICS_SECRET")
+    if not expected_secret or not secret or secret != expected_secret:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Unauthorized"
+        )
+    from app.core.security import user_cache, password_hasher
+    from app.db.session import pool_status
+    from app.api.v1.endpoints.decisions import session_owner_cache
+    from app.services import llm
+    from app.services.tag_cache import tag_cache
+    from app.services.auto_tagger import AutoTagger
+    from app.services.background_jobs import job_worker
+    from app.services import reflection as reflection_service
+    from app.services import prompt_builder
+
+    return {
+        "user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "session_owner_cache": session_owner_cache.stats(),
+        "llm": llm.stats(),
+        "tag_cache": tag_cache.stats(),
+        "local_tagger": AutoTagger.stats(),
+        "reflection_prompts": reflection_service.stats(),
+        "prompts": prompt_builder.stats(),
+        "background_jobs": job_worker.stats(),
+        "db_pool": pool_status(),
+    }
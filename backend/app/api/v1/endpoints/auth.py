@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from app.models.user import User
 from app.db.session import get_db
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, create_access_token
 
 router = APIRouter()
 
@@ -13,12 +14,31 @@ class LoginRequest(BaseModel):
     password: str
 
 
+def _get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _store_rehashed_password(db: Session, user: User, new_hash: str) -> None:
+    user.hashed_password = new_hash
+    db.commit()
+
+
 @router.post("/login")
-def login(request: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == request.email).first()
-    if not user or not verify_password(request.password, user.hashed_password):
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
+    # Reason: async handler so bcrypt waits on its own pool, not on a request thread
+    user = await run_in_threadpool(_get_user_by_email, db, request.email)
+    if user:
+        valid, new_hash = await verify_password_async(
+            request.password, user.hashed_password
+        )
+    else:
+        valid, new_hash = False, None
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
+    if new_hash:
+        # Reason: Rehash-on-login lets us tune bcrypt cost without a migration
+        await run_in_threadpool(_store_rehashed_password, db, user, new_hash)
     access_token = create_access_token({"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,13 +1,24 @@
-import os
 import logging
+import os
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from app.core.security import get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Tuple
+from app.core.security import get_current_user_async
+from app.db.session import get_async_db
+from app.models.reflection import MessageType
 from app.models.user import User
+from app.services import chat_memory, llm, prompt_builder
+from app.utils.sse import format_sse, sse_response
 
 router = APIRouter()
 
+DECISION_SUPPORT_LLM_BUDGET_SECONDS = float(
+    os.getenv("DECISION_SUPPORT_LLM_BUDGET_SECONDS", "20")
+)
+# Endpoint class for the per-worker LLM concurrency limit (chat_memory shares it)
+LLM_BULKHEAD = "decision_support"
+
 
 class DecisionSupportMessage(BaseModel):
     role: str = Field(..., description="user or ai")
@@ -15,65 +26,210 @@ class DecisionSupportMessage(BaseModel):
 
 
 class DecisionSupportRequest(BaseModel):
-    messages: List[DecisionSupportMessage]
+    messages: Optional[List[DecisionSupportMessage]] = Field(
+        None, description="Full history (legacy clients); omit when using message"
+    )
+    message: Optional[str] = Field(
+        None,
+        min_length=1,
+        description="New user turn; history is read from the session on the server",
+    )
+    session_id: Optional[str] = Field(
+        None,
+        description="Decision chat session holding the history and the AI reply",
+    )
     context: Optional[str] = Field(None, description="Optional context or metadata")
 
 
 class DecisionSupportResponse(BaseModel):
     reply: str
     suggestions: Optional[List[str]] = None
+    message_id: Optional[str] = None
 
 
-# --- OpenAI GPT-4.1-nano integration ---
-try:
-    import openai
-except ImportError:
-    openai = None
+FALLBACK_REPLY = (
+    "I'm here to help you think through your decision. "
+    "Here are a few steps that might help: "
+    "1. Clarify what decision you need to make. "
+    "2. List your main options and possible outcomes. "
+    "3. Reflect on which choice aligns best with your values and goals. "
+    "Would you like to talk through any of these steps or share more about your situation?"
+)
+FALLBACK_SUGGESTIONS = [
+    "Clarify your goals",
+    "Consider possible outcomes",
+    "Reflect on your values",
+]
 
-OPENAI_MODEL = "gpt-4.1-nano"  # GPT-4.1-nano model
+
+async def _prepare_prompt(
+    req: DecisionSupportRequest, db: AsyncSession, user_id: str
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Validate a chat request and build the messages to send to the LLM.
+
+    With `message`, the user turn is stored in the session and the prompt is
+    built from the server-side history (see app.services.chat_memory). With
+    the legacy `messages` list, `session_id`, if given, only receives the AI
+    reply. Either way the prompt is fitted to DECISION_SUPPORT_PROMPT_TOKEN_BUDGET,
+    and the transaction is ended so no DB connection is held during the LLM call.
+
+    Returns:
+        Tuple[List[dict], Optional[str]]: (prompt messages, session_id)
+
+    Raises:
+        HTTPException: 400 if the last message is not from the user; 422 if
+            `message` is sent without `session_id` or the id is invalid; 404
+            for an unknown session.
+    """
+    from app.api.v1.endpoints.decisions import (
+        _ensure_session_owner_async,
+        _parse_session_id,
+    )
+
+    session_id = None
+    if req.session_id:
+        session_id = _parse_session_id(req.session_id)
+    if req.message is not None:
+        if session_id is None:
+            raise HTTPException(
+                status_code=422, detail="session_id is required with message"
+            )
+        await _ensure_session_owner_async(db, session_id, user_id)
+        await chat_memory.add_message(db, session_id, MessageType.user, req.message)
+        messages = await chat_memory.build_prompt(db, session_id)
+    else:
+        if not req.messages or req.messages[-1].role != "user":
+            raise HTTPException(
+                status_code=400, detail="Last message must be from user."
+            )
+        if session_id is not None:
+            await _ensure_session_owner_async(db, session_id, user_id)
+        messages = [{"role": m.role, "content": m.content} for m in req.messages]
+    # Reason: Summary + window can still exceed the budget (e.g. one huge turn)
+    prompt = prompt_builder.build_chat(
+        "decision_support",
+        messages,
+        prompt_builder.DECISION_SUPPORT_PROMPT_TOKEN_BUDGET,
+    )
+    # Reason: Don't hold a pooled DB connection while awaiting the completion
+    await db.commit()
+    return prompt.messages, session_id
 
 
 @router.post("/chat", response_model=DecisionSupportResponse)
-def decision_support_chat(
+async def decision_support_chat(
     req: DecisionSupportRequest,
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """
-    Decision support chat using OpenAI GPT-4.1-nano (if configured). Falls back to mock reply if OpenAI fails or not configured.
+    Decision support chat through the LLM gateway (if configured). Falls back to mock reply if OpenAI fails or not configured.
+
+    Clients send the new user turn as `message` with a `session_id`; the
+    history is kept on the server and the reply is stored in the session.
+    The fallback reply is not stored, so it never enters later prompts, and
+    its `message_id` is None.
     """
-    if not req.messages or req.messages[-1].role != "user":
-        raise HTTPException(status_code=400, detail="Last message must be from user.")
-    last_user_msg = req.messages[-1].content
-    api_key = os.getenv("OPENAI_API_KEY")
+    messages, session_id = await _prepare_prompt(req, db, str(current_user.id))
     try:
-        if openai is not None and api_key:
-            openai.api_key = api_key
-            client = openai.OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[{"role": m.role, "content": m.content} for m in req.messages],
-                max_tokens=512,
-                temperature=0.7,
-            )
-            ai_reply = response.choices[0].message["content"].strip()
-            # Optionally extract suggestions from reply (if structured)
-            return DecisionSupportResponse(reply=ai_reply, suggestions=None)
-        else:
-            raise RuntimeError("OpenAI API key not set or openai not installed.")
+        ai_reply = await llm.acomplete_text(
+            messages,
+            budget=DECISION_SUPPORT_LLM_BUDGET_SECONDS,
+            bulkhead=LLM_BULKHEAD,
+            max_tokens=512,
+            temperature=0.7,
+        )
+        # Optionally extract suggestions from reply (if structured)
+        response = DecisionSupportResponse(reply=ai_reply, suggestions=None)
     except Exception as e:
-        logging.exception("OpenAI DecisionSupport chat failed: %s", e)
+        if isinstance(e, (llm.LLMCircuitOpen, llm.LLMBulkheadFull)):
+            logging.warning("DecisionSupport chat skipped: %s", e)
+        else:
+            logging.exception("OpenAI DecisionSupport chat failed: %s", e)
         # Fallback mock
-        reply = (
-            "I'm here to help you think through your decision. "
-            "Here are a few steps that might help: "
-            "1. Clarify what decision you need to make. "
-            "2. List your main options and possible outcomes. "
-            "3. Reflect on which choice aligns best with your values and goals. "
-            "Would you like to talk through any of these steps or share more about your situation?"
+        response = DecisionSupportResponse(
+            reply=FALLBACK_REPLY, suggestions=list(FALLBACK_SUGGESTIONS)
         )
-        suggestions = [
-            "Clarify your goals",
-            "Consider possible outcomes",
-            "Reflect on your values",
-        ]
-        return DecisionSupportResponse(reply=reply, suggestions=suggestions)
+    if session_id and response.suggestions is None:
+        message = await chat_memory.add_message(
+            db, session_id, MessageType.ai, response.reply
+        )
+        response.message_id = message.id
+    return response
+
+
+async def _save_ai_message(session_id: str, content: str) -> str:
+    """Store the final AI reply in its own session (the request's is closed)."""
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        message = await chat_memory.add_message(db, session_id, MessageType.ai, content)
+        return message.id
+
+
+async def _stream_reply(
+    messages: List[dict], session_id: Optional[str]
+) -> AsyncIterator[str]:
+    parts: List[str] = []
+    suggestions = None
+    try:
+        async for delta in llm.astream_text(
+            messages,
+            budget=DECISION_SUPPORT_LLM_BUDGET_SECONDS,
+            bulkhead=LLM_BULKHEAD,
+            max_tokens=512,
+            temperature=0.7,
+        ):
+            parts.append(delta)
+            yield format_sse({"content": delta}, event="token")
+    except llm.LLMUnavailable as e:
+        if parts:
+            # Reason: Text already reached the client; don't splice in a mock
+            logging.warning("DecisionSupport stream interrupted: %s", e)
+            yield format_sse({"detail": "AI reply interrupted"}, event="error")
+            return
+        logging.warning("DecisionSupport stream unavailable: %s", e)
+        parts = [FALLBACK_REPLY]
+        suggestions = list(FALLBACK_SUGGESTIONS)
+        yield format_sse({"content": FALLBACK_REPLY}, event="token")
+    reply = "".join(parts).strip()
+    message_id = None
+    if session_id and suggestions is None:
+        # Reason: The fallback reply is not an AI turn; keep it out of history
+        message_id = await _save_ai_message(session_id, reply)
+    yield format_sse(
+        {
+            "reply": reply,
+            "suggestions": suggestions,
+            "ai_generated": suggestions is None,
+            "message_id": message_id,
+        },
+        event="done",
+    )
+
+
+@router.post("/chat/stream")
+async def decision_support_chat_stream(
+    req: DecisionSupportRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Streaming variant of /chat: forwards tokens as Server-Sent Events.
+
+    Events:
+        token: {"content": str} for each text delta.
+        done: {"reply", "suggestions", "ai_generated", "message_id"} once the
+            reply is complete (and stored, if `session_id` was given).
+        error: {"detail": str} if the stream breaks after text was sent.
+
+    If the LLM is unavailable before any text is sent, the mock reply is
+    streamed instead and, as in /chat, not stored.
+
+    Raises:
+        HTTPException: 400 if the last message is not from the user; 404/422
+            for an unknown or invalid session_id, or `message` without one.
+    """
+    messages, session_id = await _prepare_prompt(req, db, str(current_user.id))
+    return sse_response(_stream_reply(messages, session_id))
@@ -1,28 +1,169 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, constr
-from app.models.decision import DecisionChatSession, DecisionJournalEntry
+from app.models.decision import (
+    DecisionChatSession,
+    DecisionJournalEntry,
+    TaggingStatus,
+)
 from app.models.reflection import DecisionChatMessage
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.session import get_db, get_async_db
+from app.core.security import get_current_user, get_current_user_async
 from app.models.user import User
-from app.services.auto_tagger import OpenAITagger
+from app.services.auto_tagger import AutoTagger, OpenAITagger, entry_content_hash
+from app.services.background_jobs import (
+    apply_tags,
+    background_tagging_enabled,
+    enqueue_job,
+    has_pending_job,
+    job_worker,
+)
+from app.services import reflection as reflection_service
+from app.utils.cache import TTLCache
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    PREV_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
 from app.schemas.decision_journal import (
     DecisionJournalEntryCreate,
     DecisionJournalEntryUpdate,
     DecisionJournalEntryOut,
+    DecisionJournalEntryTags,
 )
+import asyncio
 import uuid
 import datetime
+import os
 
 router = APIRouter()
 
+JOURNAL_PAGE_DEFAULT = int(os.getenv("JOURNAL_PAGE_DEFAULT", "50"))
+JOURNAL_PAGE_MAX = int(os.getenv("JOURNAL_PAGE_MAX", "200"))
+MESSAGE_PAGE_DEFAULT = int(os.getenv("MESSAGE_PAGE_DEFAULT", "100"))
+MESSAGE_PAGE_MAX = int(os.getenv("MESSAGE_PAGE_MAX", "500"))
+TAGS_WAIT_MAX_SECONDS = float(os.getenv("TAGS_WAIT_MAX_SECONDS", "30"))
+TAGS_POLL_INTERVAL_SECONDS = float(os.getenv("TAGS_POLL_INTERVAL_SECONDS", "0.5"))
+
 
 import logging
 import traceback
 
+logger = logging.getLogger(__name__)
+
+# Reason: A session never changes owner, so session_id -> user_id can be cached
+# briefly and shared by every endpoint that checks session ownership.
+session_owner_cache = TTLCache(
+    max_size=int(os.getenv("SESSION_OWNER_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("SESSION_OWNER_CACHE_TTL_SECONDS", "60")),
+)
+
+
+def _parse_session_id(session_id: str) -> str:
+    """Return the canonical session UUID string or raise a 422."""
+    try:
+        return str(uuid.UUID(session_id))
+    except (ValueError, AttributeError):
+        logger.debug("Invalid session_id format: %r", session_id)
+        raise HTTPException(status_code=422, detail="Invalid session_id format")
+
+
+def _ensure_session_owner(db: Session, session_id: str, user_id: str) -> None:
+    """
+    Check that `session_id` belongs to `user_id` with one primary-key lookup.
+
+    Args:
+        db (Session): SQLAlchemy session dependency.
+        session_id (str): Canonical session UUID string.
+        user_id (str): The authenticated user's id.
+
+    Raises:
+        HTTPException: 404 if the session does not exist or is not owned by the user.
+    """
+    owner = session_owner_cache.get(session_id)
+    if owner is None:
+        owner = (
+            db.query(DecisionChatSession.user_id)
+            .filter(DecisionChatSession.id == session_id)
+            .scalar()
+        )
+        if owner is not None:
+            session_owner_cache.set(session_id, owner)
+    if owner != user_id:
+        logger.debug("Session %s not found for user %s", session_id, user_id)
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+async def _ensure_session_owner_async(
+    db: AsyncSession, session_id: str, user_id: str
+) -> None:
+    """
+    Async counterpart of `_ensure_session_owner` for `async def` handlers.
+
+    Raises:
+        HTTPException: 404 if the session does not exist or is not owned by the user.
+    """
+    owner = session_owner_cache.get(session_id)
+    if owner is None:
+        owner = (
+            await db.execute(
+                select(DecisionChatSession.user_id).where(
+                    DecisionChatSession.id == session_id
+                )
+            )
+        ).scalar()
+        if owner is not None:
+            session_owner_cache.set(session_id, owner)
+    if owner != user_id:
+        logger.debug("Session %s not found for user %s", session_id, user_id)
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+def _tag_or_enqueue(db: Session, entry: DecisionJournalEntry) -> bool:
+    """
+    Fill the entry's tags now, or queue background tagging on a cache miss.
+
+    Args:
+        db (Session): SQLAlchemy session (the job commits with the entry).
+        entry (DecisionJournalEntry): Entry with its current title/context.
+
+    Returns:
+        bool: True if a background tagging job was queued.
+
+    Raises:
+        HTTPException: 503 if inline tagging fails and the local fallback is
+            disabled (sync mode only).
+    """
+    if background_tagging_enabled():
+        tags = OpenAITagger.cached_tags(
+            entry.title, entry.context, db=db
+        ) or AutoTagger.confident_tags(entry.title, entry.context)
+        if tags is None:
+            entry.tagging_status = TaggingStatus.pending.value
+            # Reason: A queued job tags the entry's text as it is when it runs,
+            # so repeated autosaves must not pile up more jobs
+            if has_pending_job(db, entry.id):
+                return False
+            enqueue_job(db, entry.id)
+            return True
+    else:
+        try:
+            tags = OpenAITagger.tag_entry(entry.title, entry.context, db=db)
+        except HTTPException as e:
+            tags = AutoTagger.fallback_tags(entry.title, entry.context)
+            if tags is None:
+                raise
+            logger.warning("Auto-tagging fell back to local tags: %s", e.detail)
+            apply_tags(entry, tags, record_hash=False)
+            return False
+    apply_tags(entry, tags)
+    return False
+
 
 @router.post("/journal", response_model=DecisionJournalEntryOut, status_code=201)
 def create_decision_journal_entry(
@@ -32,9 +173,13 @@ def create_decision_journal_entry(
 ):
     """
     Create a new decision journal entry for the authenticated user.
+
+    In background tagging mode (AUTO_TAG_MODE=background) the entry is saved
+    with tagging_status "pending" and tagged by the job worker; poll
+    GET /journal/{entry_id}/tags for the result. With REFLECTION_PRECOMPUTE
+    the worker also generates the entry's reflection prompts.
     """
     try:
-        tag_result = OpenAITagger.tag_entry(entry_in.title, entry_in.context)
         entry = DecisionJournalEntry(
             id=str(uuid.uuid4()),
             user_id=str(current_user.id),
@@ -42,15 +187,16 @@ def create_decision_journal_entry(
             context=entry_in.context,
             anticipated_outcomes=entry_in.anticipated_outcomes,
             values=entry_in.values,
-            domain_tags=tag_result["domain_tags"],
-            sentiment_tag=tag_result["sentiment_tag"],
-            keywords=tag_result["keywords"],
             created_at=datetime.datetime.utcnow(),
             updated_at=datetime.datetime.utcnow(),
         )
         db.add(entry)
+        queued = _tag_or_enqueue(db, entry)
+        queued = reflection_service.enqueue_precompute(db, entry) or queued
         db.commit()
         db.refresh(entry)
+        if queued:
+            job_worker.notify()
         return entry
     except HTTPException as http_exc:
         logging.error(
@@ -106,18 +252,21 @@ def create_decision_session(
     db.add(session)
     db.commit()
     db.refresh(session)
+    session_owner_cache.set(session.id, session.user_id)
     return session
 
 
 @router.get("/sessions", response_model=List[DecisionSessionOut])
-def list_decision_sessions(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def list_decision_sessions(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    return (
-        db.query(DecisionChatSession)
-        .filter(DecisionChatSession.user_id == current_user.id)
-        .all()
+    result = await db.execute(
+        select(DecisionChatSession).where(
+            DecisionChatSession.user_id == str(current_user.id)
+        )
     )
+    return result.scalars().all()
 
 
 class DecisionMessageOut(BaseModel):
@@ -152,47 +301,19 @@ def create_decision_message(
     """
     Create a new message in a decision chat session.
     """
-    import uuid
-
-    print(
-        f"[DEBUG] create_decision_message: session_id={session_id}, user_id={getattr(current_user, 'id', None)}"
-    )
-    # Convert session_id to UUID
-    try:
-        session_uuid = uuid.UUID(session_id)
-    except (ValueError, AttributeError):
-        print("[DEBUG] Invalid session_id format")
-        raise HTTPException(status_code=422, detail="Invalid session_id format")
-    # Print all sessions for current user
-    all_sessions = (
-        db.query(DecisionChatSession).filter_by(user_id=str(current_user.id)).all()
-    )
-    print(
-        f"[DEBUG] create_decision_message: all sessions for user {current_user.id}: {[{'id': s.id, 'user_id': s.user_id} for s in all_sessions]}"
-    )
-    # Check session ownership
-    session = (
-        db.query(DecisionChatSession)
-        .filter_by(id=str(session_uuid), user_id=str(current_user.id))
-        .first()
-    )
-    print(f"[DEBUG] create_decision_message: session query result: {session}")
-    if not session:
-        print(
-            f"[DEBUG] Session not found for id={session_id}, user_id={getattr(current_user, 'id', None)}"
-        )
-        raise HTTPException(status_code=404, detail="Session not found")
+    session_key = _parse_session_id(session_id)
+    _ensure_session_owner(db, session_key, str(current_user.id))
     # Reason: Enum conversion for sender
     from app.models.reflection import MessageType
 
     try:
         sender_enum = MessageType[message_in.sender]
     except KeyError:
-        print(f"[DEBUG] Invalid sender type: {message_in.sender}")
+        logger.debug("Invalid sender type: %r", message_in.sender)
         raise HTTPException(status_code=422, detail="Invalid sender type")
     message = DecisionChatMessage(
         id=str(uuid.uuid4()),
-        session_id=str(session_uuid),
+        session_id=session_key,
         sender=sender_enum,
         content=message_in.content,
         created_at=datetime.datetime.utcnow(),
@@ -200,38 +321,100 @@ def create_decision_message(
     db.add(message)
     db.commit()
     db.refresh(message)
-    print(f"[DEBUG] Message created: {message}")
+    logger.debug("Message %s created in session %s", message.id, session_key)
     return message
 
 
 @router.get("/sessions/{session_id}/messages", response_model=List[DecisionMessageOut])
 def list_decision_messages(
     session_id: str,
+    response: Response,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = Query(MESSAGE_PAGE_DEFAULT, ge=1, le=MESSAGE_PAGE_MAX),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    List all messages for a given decision chat session.
-    """
-    import uuid
+    List messages for a decision chat session, oldest first within the page.
 
-    try:
-        session_uuid = uuid.UUID(session_id)
-    except (ValueError, AttributeError):
-        raise HTTPException(status_code=422, detail="Invalid session_id format")
-    session = (
-        db.query(DecisionChatSession)
-        .filter_by(id=str(session_uuid), user_id=str(current_user.id))
-        .first()
-    )
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    return (
-        db.query(DecisionChatMessage)
-        .filter_by(session_id=str(session_uuid))
-        .order_by(DecisionChatMessage.created_at)
-        .all()
-    )
+    Without a cursor the latest `limit` messages (the tail) are returned.
+    `before` pages backwards from a cursor and `after` fetches newer messages.
+    The cursor for the next older page is set in `X-Prev-Cursor` (omitted when
+    there is nothing older). Every page sets `X-Next-Cursor` to its newest
+    message (an empty `after` page echoes its cursor), so clients can always
+    fetch newer messages with `after`; a page shorter than `limit` means they
+    are caught up.
+
+    Args:
+        session_id (str): The session UUID (as string).
+        response (Response): Used to set the pagination cursor headers.
+        before (Optional[str]): Return messages older than this cursor.
+        after (Optional[str]): Return messages newer than this cursor.
+        limit (int): Maximum number of messages to return.
+        db (Session): SQLAlchemy session dependency.
+        current_user (User): The authenticated user.
+
+    Returns:
+        List[DecisionChatMessage]: One page of messages in chronological order.
+
+    Raises:
+        HTTPException: If session_id or a cursor is invalid, both cursors are
+            given, or the session is not found.
+    """
+    session_key = _parse_session_id(session_id)
+    if before and after:
+        raise HTTPException(
+            status_code=422, detail="Use either 'before' or 'after', not both"
+        )
+    _ensure_session_owner(db, session_key, str(current_user.id))
+    query = db.query(DecisionChatMessage).filter_by(session_id=session_key)
+    if after:
+        created_at, message_id = decode_cursor(after)
+        query = query.filter(
+            or_(
+                DecisionChatMessage.created_at > created_at,
+                and_(
+                    DecisionChatMessage.created_at == created_at,
+                    DecisionChatMessage.id > message_id,
+                ),
+            )
+        ).order_by(DecisionChatMessage.created_at, DecisionChatMessage.id)
+    else:
+        if before:
+            created_at, message_id = decode_cursor(before)
+            query = query.filter(
+                or_(
+                    DecisionChatMessage.created_at < created_at,
+                    and_(
+                        DecisionChatMessage.created_at == created_at,
+                        DecisionChatMessage.id < message_id,
+                    ),
+                )
+            )
+        # Reason: Read the tail newest-first via the index, then flip for display
+        query = query.order_by(
+            DecisionChatMessage.created_at.desc(), DecisionChatMessage.id.desc()
+        )
+    messages = query.limit(limit + 1).all()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if not after:
+        messages.reverse()
+        if has_more:
+            oldest = messages[0]
+            response.headers[PREV_CURSOR_HEADER] = encode_cursor(
+                oldest.created_at, oldest.id
+            )
+    if messages:
+        newest = messages[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            newest.created_at, newest.id
+        )
+    elif after:
+        # Reason: Nothing newer yet; the client polls again from the same point
+        response.headers[NEXT_CURSOR_HEADER] = after
+    return messages
 
 
 @router.patch("/sessions/{session_id}", response_model=DecisionSessionOut)
@@ -256,34 +439,16 @@ def update_decision_session(
     Raises:
         HTTPException: If session_id is invalid, session not found, or status is invalid.
     """
-    import uuid
-
-    print(
-        f"[DEBUG] update_decision_session: session_id={session_id}, user_id={getattr(current_user, 'id', None)}"
-    )
-    try:
-        session_uuid = uuid.UUID(session_id)
-    except (ValueError, AttributeError):
-        print("[DEBUG] Invalid session_id format")
-        raise HTTPException(status_code=422, detail="Invalid session_id format")
-    # Print all sessions for current user
-    all_sessions = (
-        db.query(DecisionChatSession).filter_by(user_id=str(current_user.id)).all()
-    )
-    print(
-        f"[DEBUG] update_decision_session: all sessions for user {current_user.id}: {[{'id': s.id, 'user_id': s.user_id} for s in all_sessions]}"
-    )
+    session_key = _parse_session_id(session_id)
     session = (
         db.query(DecisionChatSession)
-        .filter_by(id=str(session_uuid), user_id=str(current_user.id))
+        .filter_by(id=session_key, user_id=str(current_user.id))
         .first()
     )
-    print(f"[DEBUG] update_decision_session: session query result: {session}")
     if not session:
-        print(
-            f"[DEBUG] Session not found for id={session_id}, user_id={getattr(current_user, 'id', None)}"
-        )
+        logger.debug("Session %s not found for user %s", session_key, current_user.id)
         raise HTTPException(status_code=404, detail="Session not found")
+    session_owner_cache.set(session_key, session.user_id)
     if session_update.status:
         # Reason: Validate status against enum (only allow valid SessionStatus values)
         from app.models.decision import SessionStatus
@@ -291,7 +456,7 @@ def update_decision_session(
         try:
             session.status = SessionStatus[session_update.status]
         except KeyError:
-            print(f"[DEBUG] Invalid status value: {session_update.status}")
+            logger.debug("Invalid status value: %r", session_update.status)
             raise HTTPException(status_code=422, detail="Invalid status value")
     if session_update.summary is not None:
         session.summary = session_update.summary
@@ -301,7 +466,7 @@ def update_decision_session(
         session.completed_at = session_update.completed_at
     db.commit()
     db.refresh(session)
-    print(f"[DEBUG] update_decision_session: updated session: {session}")
+    logger.debug("Session %s updated", session_key)
     return session
 
 
@@ -309,26 +474,62 @@ def update_decision_session(
 
 
 @router.get("/journal", response_model=List[DecisionJournalEntryOut])
-def list_decision_journal_entries(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_decision_journal_entries(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=JOURNAL_PAGE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """
-    List all decision journal entries for the authenticated user.
+    List the authenticated user's decision journal entries, newest first.
+
+    Without `limit` or `cursor` every entry is returned (unpaged, for existing
+    clients). Otherwise results are keyset-paginated on (created_at, id), with
+    JOURNAL_PAGE_DEFAULT entries per page unless `limit` is given. When more
+    entries exist, the opaque cursor for the next page is returned in the
+    `X-Next-Cursor` response header; pass it back as `?cursor=` to continue.
 
     Args:
-        db (Session): SQLAlchemy session dependency.
+        response (Response): Used to set the next-page cursor header.
+        cursor (Optional[str]): Cursor from a previous page, if any.
+        limit (Optional[int]): Maximum number of entries to return.
+        db (AsyncSession): Async SQLAlchemy session dependency.
         current_user (User): The authenticated user.
 
     Returns:
-        List[DecisionJournalEntry]: All entries for user.
+        List[DecisionJournalEntry]: One page of entries for the user.
+
+    Raises:
+        HTTPException: 422 if the cursor is malformed.
     """
-    return (
-        db.query(DecisionJournalEntry)
-        .filter(DecisionJournalEntry.user_id == str(current_user.id))
-        .order_by(DecisionJournalEntry.created_at.desc())
-        .all()
+    stmt = select(DecisionJournalEntry).where(
+        DecisionJournalEntry.user_id == str(current_user.id)
+    )
+    if cursor:
+        created_at, entry_id = decode_cursor(cursor)
+        # Reason: OR form instead of a row-value comparison so every backend can seek
+        stmt = stmt.where(
+            or_(
+                DecisionJournalEntry.created_at < created_at,
+                and_(
+                    DecisionJournalEntry.created_at == created_at,
+                    DecisionJournalEntry.id < entry_id,
+                ),
+            )
+        )
+    stmt = stmt.order_by(
+        DecisionJournalEntry.created_at.desc(), DecisionJournalEntry.id.desc()
     )
+    if limit is None and not cursor:
+        return list((await db.execute(stmt)).scalars().all())
+    limit = limit or JOURNAL_PAGE_DEFAULT
+    entries = list((await db.execute(stmt.limit(limit + 1))).scalars().all())
+    if len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return entries
 
 
 @router.get("/journal/{entry_id}", response_model=DecisionJournalEntryOut)
@@ -395,18 +596,84 @@ def update_decision_journal_entry(
     data = entry_update.dict(exclude_unset=True)
     for field, value in data.items():
         setattr(entry, field, value)
-    # Re-run auto-tagging if title or context is updated
-    if "title" in data or "context" in data:
-        tag_result = OpenAITagger.tag_entry(
-            data.get("title", entry.title), data.get("context", entry.context)
-        )
-        entry.domain_tags = tag_result["domain_tags"]
-        entry.sentiment_tag = tag_result["sentiment_tag"]
-        entry.keywords = tag_result["keywords"]
+    # Reason: Autosave resends title/context unchanged; only re-tag when the
+    # normalized text differs from what was tagged (or the stored hash is stale)
+    queued = False
+    if ("title" in data or "context" in data) and entry.tagged_content_hash != (
+        entry_content_hash(entry.title, entry.context)
+    ):
+        queued = _tag_or_enqueue(db, entry)
+    # Reason: Drop cached reflection prompts once the fields they came from change
+    if entry.reflection_prompts and reflection_service.cached_prompts(entry) is None:
+        reflection_service.store_prompts(entry, None)
+        queued = reflection_service.enqueue_precompute(db, entry) or queued
     entry.updated_at = datetime.datetime.utcnow()  # Reason: always update timestamp
     db.commit()
     db.refresh(entry)
+    if queued:
+        job_worker.notify()
     return entry
 
 
+@router.get("/journal/{entry_id}/tags", response_model=DecisionJournalEntryTags)
+async def get_decision_journal_entry_tags(
+    entry_id: str,
+    wait: float = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Return an entry's tags and tagging status, optionally long-polling.
+
+    With `wait` > 0 the request is held (up to TAGS_WAIT_MAX_SECONDS) until the
+    entry leaves the "pending" state, so clients get the tags as soon as the
+    background worker stores them without tight polling loops.
+
+    Args:
+        entry_id (str): The entry UUID (as string).
+        wait (float): Seconds to wait while tagging is pending.
+        db (AsyncSession): Async SQLAlchemy session dependency.
+        current_user (User): The authenticated user.
+
+    Returns:
+        DecisionJournalEntryTags: Current tags and tagging status.
+
+    Raises:
+        HTTPException: If entry_id is invalid or entry not found.
+    """
+    try:
+        entry_key = str(uuid.UUID(entry_id))
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=422, detail="Invalid entry_id format")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(wait, TAGS_WAIT_MAX_SECONDS)
+    stmt = (
+        select(DecisionJournalEntry)
+        .where(
+            DecisionJournalEntry.id == entry_key,
+            DecisionJournalEntry.user_id == str(current_user.id),
+        )
+        .execution_options(populate_existing=True)
+    )
+    while True:
+        entry = (await db.execute(stmt)).scalar_one_or_none()
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Entry not found")
+        if (
+            entry.tagging_status != TaggingStatus.pending.value
+            or loop.time() >= deadline
+        ):
+            break
+        # Reason: Release the connection while sleeping between polls
+        await db.rollback()
+        await asyncio.sleep(TAGS_POLL_INTERVAL_SECONDS)
+    return DecisionJournalEntryTags(
+        entry_id=entry.id,
+        tagging_status=entry.tagging_status,
+        domain_tags=entry.domain_tags,
+        sentiment_tag=entry.sentiment_tag,
+        keywords=entry.keywords,
+    )
+
+
 # Endpoints for deleting sessions/messages/entries can be added as needed.
@@ -1,87 +1,218 @@
 """
-Future-Self Simulator API endpoint.
+Future-Self Simulator API endpoints.
 POST /api/v1/future-self/simulate
+POST /api/v1/future-self/simulate/stream (Server-Sent Events)
+POST /api/v1/future-self/simulate/batch
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user_async
 from app.models.user import User
 from app.schemas.future_self import (
+    FutureSelfBatchItem,
+    FutureSelfBatchRequest,
+    FutureSelfBatchResponse,
     FutureSelfSimulationRequest,
     FutureSelfSimulationResponse,
 )
-from typing import List
+from app.services import llm, prompt_builder
+from app.services.future_self import SuggestionStreamParser, parse_simulation
+from app.utils.sse import format_sse, sse_response
+from itertools import product
+from typing import AsyncIterator, List
+import asyncio
 import logging
 import os
-import openai
 
 router = APIRouter()
 
+FUTURE_SELF_LLM_BUDGET_SECONDS = float(
+    os.getenv("FUTURE_SELF_LLM_BUDGET_SECONDS", "20")
+)
+FUTURE_SELF_BATCH_MAX_VARIANTS = int(os.getenv("FUTURE_SELF_BATCH_MAX_VARIANTS", "6"))
+FUTURE_SELF_BATCH_CONCURRENCY = int(os.getenv("FUTURE_SELF_BATCH_CONCURRENCY", "3"))
+# Endpoint class for the per-worker LLM concurrency limit
+LLM_BULKHEAD = "future_self"
+
+
+SYSTEM_PROMPT = (
+    "You are a life coach AI designed to help users envision their future self. "
+    "Given the user's decision context, core values and time horizon, generate a "
+    "personalized, thoughtful future projection and 2-3 actionable suggestions. "
+    "Write the projection first, then a line 'Suggestions:' followed by one "
+    "suggestion per line."
+)
+
+
+def _build_messages(req: FutureSelfSimulationRequest) -> List[dict]:
+    # Reason: decision_context is unbounded; the builder truncates it to the budget
+    return prompt_builder.build_entry(
+        "future_self",
+        SYSTEM_PROMPT,
+        [
+            ("Decision context", req.decision_context),
+            ("Core values", ", ".join(req.values) if req.values else "N/A"),
+            ("Time horizon", req.time_horizon or "the future"),
+        ],
+        prompt_builder.FUTURE_SELF_PROMPT_TOKEN_BUDGET,
+    ).messages
+
+
+def _mock_simulation(req: FutureSelfSimulationRequest) -> FutureSelfSimulationResponse:
+    projection = (
+        f"In {req.time_horizon or 'the future'}, after making your decision, you experience growth and new opportunities. "
+        f"Your values ({', '.join(req.values or [])}) guide your journey."
+    )
+    suggestions = [
+        "Reflect on your long-term goals.",
+        "Seek advice from trusted mentors.",
+        "Consider how this decision aligns with your values.",
+    ]
+    return FutureSelfSimulationResponse(
+        future_projection=projection, suggestions=suggestions, ai_generated=False
+    )
+
 
 @router.post(
     "/simulate", response_model=FutureSelfSimulationResponse, tags=["future-self"]
 )
-def simulate_future_self(
+async def simulate_future_self(
     req: FutureSelfSimulationRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_async),
 ) -> FutureSelfSimulationResponse:
     """
     Simulate user's future self based on a decision context, values, and optional time horizon.
     Uses OpenAI LLM (if configured) or returns a mock response.
     """
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    prompt = (
-        f"You are an AI designed to help users envision their future self. "
-        f"Given the following decision context: '{req.decision_context}', "
-        f"core values: {', '.join(req.values) if req.values else 'N/A'}, "
-        f"and time horizon: {req.time_horizon or 'the future'}, "
-        f"generate a personalized, thoughtful future projection and 2-3 actionable suggestions for this user."
-    )
+    return await _simulate(req)
+
+
+async def _simulate(req: FutureSelfSimulationRequest) -> FutureSelfSimulationResponse:
     try:
-        if not openai_api_key:
-            raise RuntimeError("OpenAI API key not set.")
-        openai.api_key = openai_api_key
-        response = openai.ChatCompletion.create(
-            model="gpt-4.1-nano",
-            messages=[
-                {"role": "system", "content": "You are a life coach AI."},
-                {"role": "user", "content": prompt},
-            ],
+        ai_text = await llm.acomplete_text(
+            _build_messages(req),
+            budget=FUTURE_SELF_LLM_BUDGET_SECONDS,
+            bulkhead=LLM_BULKHEAD,
             max_tokens=512,
             temperature=0.7,
         )
-        ai_text = response.choices[0].message["content"].strip()
-        # Simple split: projection is first paragraph, suggestions are bullets after
-        if "Suggestions:" in ai_text:
-            projection, suggestions_block = ai_text.split("Suggestions:", 1)
-            suggestions = [
-                s.strip("- ")
-                for s in suggestions_block.strip().split("\n")
-                if s.strip()
-            ]
-        else:
-            projection = ai_text
-            suggestions = []
+        # Projection is the text before "Suggestions:", suggestions the lines after
+        projection, suggestions = parse_simulation(ai_text)
         return FutureSelfSimulationResponse(
-            future_projection=projection.strip(),
+            future_projection=projection,
             suggestions=suggestions,
             ai_generated=True,
         )
     except Exception as e:
-        logging.exception("OpenAI FutureSelf simulation failed: %s", e)
+        if isinstance(e, (llm.LLMCircuitOpen, llm.LLMBulkheadFull)):
+            logging.warning("FutureSelf simulation skipped: %s", e)
+        else:
+            logging.exception("OpenAI FutureSelf simulation failed: %s", e)
         # Fallback to mock
-        projection = (
-            f"In {req.time_horizon or 'the future'}, after making your decision, you experience growth and new opportunities. "
-            f"Your values ({', '.join(req.values or [])}) guide your journey."
+        return _mock_simulation(req)
+
+
+@router.post(
+    "/simulate/batch", response_model=FutureSelfBatchResponse, tags=["future-self"]
+)
+async def simulate_future_self_batch(
+    req: FutureSelfBatchRequest,
+    current_user: User = Depends(get_current_user_async),
+) -> FutureSelfBatchResponse:
+    """
+    Simulate several time horizons and/or value sets for one decision.
+
+    Variants run concurrently (at most FUTURE_SELF_BATCH_CONCURRENCY at a
+    time), so the response takes about as long as the slowest simulation
+    rather than their sum. Each variant falls back to the mock on its own.
+
+    Raises:
+        HTTPException: 422 if more than FUTURE_SELF_BATCH_MAX_VARIANTS
+            combinations are requested.
+    """
+    variants = [
+        FutureSelfSimulationRequest(
+            decision_context=req.decision_context,
+            values=values,
+            time_horizon=horizon,
         )
-        suggestions = [
-            "Reflect on your long-term goals.",
-            "Seek advice from trusted mentors.",
-            "Consider how this decision aligns with your values.",
-        ]
-        return FutureSelfSimulationResponse(
-            future_projection=projection, suggestions=suggestions, ai_generated=False
+        for horizon, values in product(
+            req.time_horizons or [None], req.value_sets or [None]
+        )
+    ]
+    if len(variants) > FUTURE_SELF_BATCH_MAX_VARIANTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {FUTURE_SELF_BATCH_MAX_VARIANTS} variants per request",
         )
+    limit = asyncio.Semaphore(max(1, FUTURE_SELF_BATCH_CONCURRENCY))
+
+    async def run(variant: FutureSelfSimulationRequest) -> FutureSelfSimulationResponse:
+        async with limit:
+            return await _simulate(variant)
+
+    results = await asyncio.gather(*(run(variant) for variant in variants))
+    return FutureSelfBatchResponse(
+        results=[
+            FutureSelfBatchItem(
+                time_horizon=variant.time_horizon, values=variant.values, result=result
+            )
+            for variant, result in zip(variants, results)
+        ]
+    )
+
+
+async def _stream_simulation(req: FutureSelfSimulationRequest) -> AsyncIterator[str]:
+    parser = SuggestionStreamParser()
+    started = False
+    try:
+        async for delta in llm.astream_text(
+            _build_messages(req),
+            budget=FUTURE_SELF_LLM_BUDGET_SECONDS,
+            bulkhead=LLM_BULKHEAD,
+            max_tokens=512,
+            temperature=0.7,
+        ):
+            started = True
+            for event, data in parser.feed(delta):
+                yield format_sse(data, event=event)
+    except llm.LLMUnavailable as e:
+        if started:
+            logging.warning("FutureSelf stream interrupted: %s", e)
+            yield format_sse({"detail": "AI simulation interrupted"}, event="error")
+            return
+        logging.warning("FutureSelf stream unavailable: %s", e)
+        mock = _mock_simulation(req)
+        yield format_sse({"content": mock.future_projection}, event="projection")
+        for index, text in enumerate(mock.suggestions):
+            yield format_sse({"index": index, "text": text}, event="suggestion")
+        yield format_sse(mock.model_dump(), event="done")
+        return
+    for event, data in parser.close():
+        yield format_sse(data, event=event)
+    result = FutureSelfSimulationResponse(
+        future_projection=parser.projection,
+        suggestions=parser.suggestions,
+        ai_generated=True,
+    )
+    yield format_sse(result.model_dump(), event="done")
+
+
+@router.post("/simulate/stream", tags=["future-self"])
+async def simulate_future_self_stream(
+    req: FutureSelfSimulationRequest,
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Streaming variant of /simulate using Server-Sent Events.
+
+    Events:
+        projection: {"content": str} projection text as it arrives.
+        suggestion: {"index": int, "text": str} once each suggestion line is complete.
+        done: the full FutureSelfSimulationResponse.
+        error: {"detail": str} if the stream breaks after text was sent.
+
+    Falls back to the mock simulation (as events) if the LLM is unavailable
+    before any text is sent.
+    """
+    return sse_response(_stream_simulation(req))
@@ -3,9 +3,11 @@ Gamification API endpoints: streaks, badges, challenges
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.session import get_db, get_async_db
+from app.core.security import get_current_user, get_current_user_async
 from app.models.user import User
 from app.models.gamification import (
     UserStreak,
@@ -27,10 +29,14 @@ router = APIRouter()
 
 
 @router.get("/streaks", response_model=List[StreakRead], tags=["gamification"])
-def get_streaks(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def get_streaks(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    streaks = db.query(UserStreak).filter_by(user_id=current_user.id).all()
+    result = await db.execute(
+        select(UserStreak).where(UserStreak.user_id == str(current_user.id))
+    )
+    streaks = result.scalars().all()
     return [
         StreakRead(id=s.id, streak_count=s.streak_count, last_checkin=s.last_checkin)
         for s in streaks
@@ -38,34 +44,45 @@ def get_streaks(
 
 
 @router.get("/badges", response_model=List[BadgeRead], tags=["gamification"])
-def get_badges(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def get_badges(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    user_badges = db.query(UserBadge).filter_by(user_id=current_user.id).all()
+    # Reason: Join instead of lazy-loading ub.badge (not allowed on AsyncSession)
+    result = await db.execute(
+        select(UserBadge, Badge)
+        .join(Badge, UserBadge.badge_id == Badge.id)
+        .where(UserBadge.user_id == str(current_user.id))
+    )
     return [
         BadgeRead(
-            id=ub.badge.id,
-            name=ub.badge.name,
-            description=ub.badge.description,
+            id=badge.id,
+            name=badge.name,
+            description=badge.description,
             awarded_at=ub.awarded_at,
         )
-        for ub in user_badges
+        for ub, badge in result.all()
     ]
 
 
 @router.get("/challenges", response_model=List[ChallengeRead], tags=["gamification"])
-def get_challenges(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def get_challenges(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    user_challenges = db.query(UserChallenge).filter_by(user_id=current_user.id).all()
+    rows = await db.execute(
+        select(UserChallenge, Challenge)
+        .join(Challenge, UserChallenge.challenge_id == Challenge.id)
+        .where(UserChallenge.user_id == str(current_user.id))
+    )
     result = []
-    for uc in user_challenges:
+    for uc, challenge in rows.all():
         result.append(
             ChallengeRead(
-                id=uc.challenge.id,
-                name=uc.challenge.name,
-                description=uc.challenge.description,
-                is_active=uc.challenge.is_active,
+                id=challenge.id,
+                name=challenge.name,
+                description=challenge.description,
+                is_active=challenge.is_active,
                 completed_at=uc.completed_at,
             )
         )
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from app.models.user import User
 from app.db.session import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_cached_user
 
 router = APIRouter()
 
@@ -29,7 +29,12 @@ def update_profile(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    current_user.email = update.email
+    # Reason: current_user may be a cached principal; update the row from this session
+    user = db.query(User).filter(User.id == str(current_user.id)).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.email = update.email
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    db.refresh(user)
+    invalidate_cached_user(user.id)
+    return user
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr, constr
 from app.models.user import User, Base
 from app.db.session import get_db
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 import uuid
 
 router = APIRouter()
@@ -14,17 +15,27 @@ class UserCreate(BaseModel):
     password: constr(min_length=8)
 
 
-@router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user_in.email).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(User).filter(User.email == email).first() is not None
+
+
+def _create_user(db: Session, email: str, hashed_password: str) -> User:
     new_user = User(
         id=str(uuid.uuid4()),
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        email=email,
+        hashed_password=hashed_password,
     )
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    return new_user
+
+
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_email_registered, db, user_in.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    # Reason: bcrypt runs on the dedicated hashing pool (503 when saturated)
+    hashed_password = await get_password_hash_async(user_in.password)
+    new_user = await run_in_threadpool(_create_user, db, user_in.email, hashed_password)
     return {"id": str(new_user.id), "email": new_user.email}
@@ -3,11 +3,13 @@ Value Calibration Check-in API endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.session import get_db, get_async_db
+from app.core.security import get_current_user, get_current_user_async
 from app.models.user import User
 from app.models.value_calibration import ValueCalibrationCheckin
 from app.schemas.value_calibration import (
@@ -39,13 +41,13 @@ def create_checkin(
 
 
 @router.get("/checkins", response_model=List[ValueCalibrationCheckinOut])
-def list_checkins(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_checkins(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    return (
-        db.query(ValueCalibrationCheckin)
-        .filter(ValueCalibrationCheckin.user_id == str(current_user.id))
+    result = await db.execute(
+        select(ValueCalibrationCheckin)
+        .where(ValueCalibrationCheckin.user_id == str(current_user.id))
         .order_by(ValueCalibrationCheckin.created_at.desc())
-        .all()
     )
+    return result.scalars().all()
@@ -0,0 +1,91 @@
+"""
+Bounded worker pool for bcrypt hashing/verification.
+
+- bcrypt releases the GIL, so a dedicated thread pool gives real parallelism
+  without tying up the anyio threadpool that serves every other endpoint.
+- Admission is bounded (running + queued); when saturated, callers get a fast
+  503 instead of queueing behind a login burst.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import threading
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+
+class PasswordHasher:
+    """
+    Runs CryptContext operations on a dedicated, bounded thread pool.
+
+    Args:
+        context (CryptContext): Passlib context holding the hashing policy.
+        max_workers (int): Concurrent hashing operations.
+        max_queue (int): Extra operations allowed to wait for a worker.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int, max_queue: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self.in_flight += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password for storing."""
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if the stored hash is outdated, return a new one.
+
+        Returns:
+            Tuple[bool, Optional[str]]: (is_valid, replacement_hash_or_None)
+        """
+        return await asyncio.wrap_future(
+            self._submit(
+                self.context.verify_and_update, plain_password, hashed_password
+            )
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of pool counters for monitoring."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
@@ -6,13 +6,31 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
 from app.models.user import User
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
+from app.utils.cache import TTLCache
+from app.core.password_hasher import PasswordHasher
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Reason: Changing BCRYPT_ROUNDS makes old hashes "need update"; they are rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+)
+
+# Dedicated bcrypt pool so login bursts don't starve the request threadpool
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+    ),
+    max_queue=int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32")),
+)
 
 # OAuth2 token URL
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -21,6 +39,13 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 ALGORITHM = "HS256"
 
+# Reason: Principal lookup is the most executed query; cache it per process (keyed by JWT `sub`)
+user_cache = TTLCache(
+    max_size=int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+)
+_CACHED_USER_FIELDS = ("id", "email", "is_active", "is_superuser", "created_at")
+
 
 def get_password_hash(password: str) -> str:
     """Hash a password for storing."""
@@ -32,6 +57,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the dedicated hashing pool (503 when saturated)."""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    """
+    Verify a password on the dedicated hashing pool (503 when saturated).
+
+    Returns:
+        Tuple[bool, Optional[str]]: (is_valid, new_hash if the stored hash needs an update)
+    """
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta=None) -> str:
     """Create a JWT access token."""
     from datetime import datetime, timedelta
@@ -45,23 +85,81 @@ def create_access_token(data: dict, expires_delta=None) -> str:
 import uuid
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    """Dependency to get the current authenticated user from JWT token."""
-    credentials_exception = HTTPException(
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the principal cache (call after changing the user row)."""
+    user_cache.invalidate(str(user_id))
+
+
+def _cache_user(user: User) -> None:
+    user_cache.set(
+        str(user.id), {name: getattr(user, name) for name in _CACHED_USER_FIELDS}
+    )
+
+
+def _resolve_user(db: Session, user_id: str):
+    """
+    Resolve a user by id, serving from the principal cache when possible.
+
+    Cached principals are returned as fresh transient `User` instances, so
+    callers never share (or accidentally persist) a cached object. Endpoints
+    that modify the user must load it from their own session.
+    """
+    fields = user_cache.get(user_id)
+    if fields is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is not None:
+            _cache_user(user)
+        return user
+    return User(**fields)
+
+
+async def _resolve_user_async(db: AsyncSession, user_id: str):
+    """Async variant of `_resolve_user` for `async def` handlers."""
+    fields = user_cache.get(user_id)
+    if fields is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalars().first()
+        if user is not None:
+            _cache_user(user)
+        return user
+    return User(**fields)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _token_subject(token: str) -> str:
+    """Decode the JWT and return its `sub` claim (401 if invalid)."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
+        raise _credentials_exception()
+    return str(user_id)
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """Dependency to get the current authenticated user from JWT token."""
+    user = _resolve_user(db, _token_subject(token))
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """Async dependency to get the current user, for `async def` handlers."""
+    user = await _resolve_user_async(db, _token_subject(token))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
@@ -0,0 +1,113 @@
+"""
+Read-only telemetry for the SQLAlchemy connection pool.
+
+- Checked-out / overflow / idle counts come straight from the pool.
+- Checkout wait time (including connection creation and pre-ping) is recorded
+  in a fixed-bucket histogram, so pool starvation shows up when latency spikes.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolTelemetry:
+    """
+    Accumulates checkout wait times and timeouts for a connection pool.
+    """
+
+    # Upper bounds (milliseconds) of the wait-time histogram buckets
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets = [0] * (len(self.BUCKETS_MS) + 1)
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_ms_total = 0.0
+            self.wait_ms_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        """Record how long one checkout waited for a connection."""
+        wait_ms = seconds * 1000.0
+        with self._lock:
+            self._buckets[bisect_left(self.BUCKETS_MS, wait_ms)] += 1
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Return pool occupancy plus wait-time statistics.
+
+        Args:
+            pool (Pool): The engine's pool (e.g. `engine.pool`).
+        """
+        with self._lock:
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(self.BUCKETS_MS, self._buckets)
+            }
+            histogram["gt_%dms" % self.BUCKETS_MS[-1]] = self._buckets[-1]
+            waits = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": (
+                    self.wait_ms_total / self.checkouts if self.checkouts else 0.0
+                ),
+                "wait_ms_max": self.wait_ms_max,
+                "wait_ms_histogram": histogram,
+            }
+        occupancy = {"pool_class": type(pool).__name__}
+        # Reason: Only queue-style pools report size/overflow
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            fn = getattr(pool, name, None)
+            if callable(fn):
+                occupancy[name] = fn()
+        return {**occupancy, **waits}
+
+
+pool_telemetry = PoolTelemetry()
+async_pool_telemetry = PoolTelemetry()
+
+
+class _InstrumentedPoolMixin:
+    """
+    Records checkout wait time into `telemetry` (set by the concrete pool class).
+    """
+
+    telemetry: PoolTelemetry
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.telemetry.observe_timeout()
+            raise
+        finally:
+            self.telemetry.observe_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool for the sync engine, reporting into `pool_telemetry`."""
+
+    telemetry = pool_telemetry
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Async-adapted QueuePool for the async engine, reporting into `async_pool_telemetry`."""
+
+    telemetry = async_pool_telemetry
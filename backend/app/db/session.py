@@ -1,26 +1,149 @@
 """
 Session management for SQLAlchemy with FastAPI dependency injection.
+
+Pool settings are environment-driven (Postgres/MSSQL deployments):
+- DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds)
+- DB_POOL_RECYCLE (seconds, -1 disables), DB_POOL_PRE_PING (true/false)
+
+An async engine (`get_async_db`) is configured alongside the sync one for
+`async def` handlers. Its URL is derived from DATABASE_URL (aiosqlite,
+asyncpg, aioodbc) unless ASYNC_DATABASE_URL is set. Each engine has its own
+pool of the configured size.
+
+SQLite engines get the performance pragmas from `app.db.sqlite_tuning`.
 """
 
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+from app.db.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_pool_telemetry,
+    pool_telemetry,
+)
+from app.db.sqlite_tuning import install_sqlite_pragmas
+import logging
 import os
 
-# Reason: Use DATABASE_URL from environment or fallback for local development
-import os
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """True for in-memory SQLite URLs, which cannot use a queue pool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return False
+    return parsed.database in (None, "", ":memory:") or (
+        parsed.query.get("mode") == "memory"
+    )
+
+
+def shared_memory_url(url: str) -> str:
+    """
+    Rewrite a private in-memory SQLite URL to a named shared-cache one.
+
+    Reason: A plain `sqlite:///:memory:` database is private to one connection,
+    so the async engine (and other threads) would see an empty database.
+    """
+    parsed = make_url(url)
+    if not is_memory_sqlite(url) or parsed.query.get("mode") == "memory":
+        return url
+    return (
+        f"{parsed.drivername}:///file:phronesis_memdb"
+        "?mode=memory&cache=shared&uri=true"
+    )
+
+
+def pool_settings() -> dict:
+    """Engine keyword arguments for the connection pool, read from the environment."""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+def engine_kwargs(url: str) -> dict:
+    """Build create_engine() keyword arguments for `url`."""
+    if url.startswith("sqlite"):
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        if is_memory_sqlite(url):
+            # Reason: In-memory SQLite keeps SQLAlchemy's per-thread pool
+            return kwargs
+        return {**kwargs, "poolclass": InstrumentedQueuePool, **pool_settings()}
+    return {"poolclass": InstrumentedQueuePool, **pool_settings()}
+
+
+# Reason: Map sync DBAPI drivers to their asyncio counterparts
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mssql": "mssql+aioodbc",
+}
 
+
+def to_async_url(url: str) -> str:
+    """Return the asyncio-driver equivalent of a sync database URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+def async_engine_kwargs(url: str) -> dict:
+    """Build create_async_engine() keyword arguments for `url`."""
+    if url.startswith("sqlite"):
+        # Reason: SQLite connections are cheap to open and must not be shared across event loops
+        return {"poolclass": NullPool}
+    return {"poolclass": InstrumentedAsyncQueuePool, **pool_settings()}
+
+
+# Reason: Use DATABASE_URL from environment or fallback for local development
 TEST_DB_PATH = os.path.abspath("./test.db")
-database_url = os.getenv("DATABASE_URL", f"sqlite:///{TEST_DB_PATH}")
-print(f"*** Using database_url: {database_url}")
-
-engine = create_engine(
-    database_url,
-    connect_args=(
-        {"check_same_thread": False} if database_url.startswith("sqlite") else {}
-    ),
+database_url = shared_memory_url(os.getenv("DATABASE_URL", f"sqlite:///{TEST_DB_PATH}"))
+
+
+logger.info(
+    "Using database_url: %s",
+    make_url(database_url).render_as_string(hide_password=True),
 )
+
+engine = create_engine(database_url, **engine_kwargs(database_url))
+install_sqlite_pragmas(engine, in_memory=is_memory_sqlite(database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_database_url = os.getenv("ASYNC_DATABASE_URL") or to_async_url(database_url)
+async_engine = create_async_engine(
+    async_database_url, **async_engine_kwargs(async_database_url)
+)
+install_sqlite_pragmas(
+    async_engine.sync_engine, in_memory=is_memory_sqlite(async_database_url)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def pool_status() -> dict:
+    """Read-only pool telemetry (occupancy and checkout wait histogram)."""
+    return {
+        "sync": pool_telemetry.snapshot(engine.pool),
+        "async": async_pool_telemetry.snapshot(async_engine.pool),
+    }
+
 
 def get_db() -> Session:
     """
@@ -31,3 +154,11 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency that provides an AsyncSession for `async def` handlers.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
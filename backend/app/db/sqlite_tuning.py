@@ -0,0 +1,73 @@
+"""
+SQLite performance mode for small-tenant and edge deployments.
+
+Applied through a connect-event hook on every new DBAPI connection:
+- journal_mode=WAL so readers no longer block on writers' commits
+- synchronous=NORMAL (safe with WAL), mmap_size, cache_size
+- busy_timeout so concurrent writers wait instead of failing with "database is locked"
+- foreign_keys=ON so declared ForeignKeys are enforced
+
+Disable with SQLITE_PERFORMANCE_MODE=false; tune each pragma via SQLITE_* env vars.
+"""
+
+from typing import List, Tuple
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def sqlite_pragmas(in_memory: bool = False) -> List[Tuple[str, str]]:
+    """
+    Return the (pragma, value) pairs to apply, read from the environment.
+
+    Args:
+        in_memory (bool): In-memory databases skip WAL and mmap (not applicable).
+    """
+    # Reason: busy_timeout goes first so switching journal mode waits on a locked file
+    pragmas = [("busy_timeout", os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))]
+    if not in_memory:
+        pragmas += [
+            ("journal_mode", os.getenv("SQLITE_JOURNAL_MODE", "WAL")),
+            ("mmap_size", os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        ]
+    pragmas += [
+        ("synchronous", os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")),
+        # Negative cache_size is in KiB (default 64 MiB)
+        ("cache_size", os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+        ("foreign_keys", "ON" if _env_bool("SQLITE_FOREIGN_KEYS", True) else "OFF"),
+    ]
+    return pragmas
+
+
+def install_sqlite_pragmas(engine: Engine, in_memory: bool = False) -> bool:
+    """
+    Register a connect hook applying the performance pragmas to `engine`.
+
+    Args:
+        engine (Engine): A SQLite engine (for async engines pass `engine.sync_engine`).
+        in_memory (bool): Whether the database is in-memory.
+
+    Returns:
+        bool: True if the hook was installed.
+    """
+    if engine.dialect.name != "sqlite" or not _env_bool(
+        "SQLITE_PERFORMANCE_MODE", True
+    ):
+        return False
+    pragmas = sqlite_pragmas(in_memory)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return True
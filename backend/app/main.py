@@ -36,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor"],  # Pagination cursors
 )
 
 
@@ -108,6 +109,34 @@ app.include_router(
 )
 
 
+from app.services import llm
+from app.services.background_jobs import background_tagging_enabled, job_worker
+
+
+@app.on_event("startup")
+def start_background_jobs():
+    # Reason: Journal tagging runs off the request path in background mode
+    if background_tagging_enabled():
+        job_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    job_worker.stop()
+
+
+@app.on_event("shutdown")
+def close_llm_client():
+    # Reason: Release pooled keep-alive connections to the LLM provider
+    llm.reset_client()
+
+
+@app.on_event("shutdown")
+async def close_async_llm_client():
+    # Reason: The async clients belong to the serving loop, so close them there
+    await llm.aclose_client()
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Phronesis API!"}
@@ -5,3 +5,5 @@ from .reflection import *
 from .value_calibration import *
 from .gamification import *
 from .life_theme import *
+from .tag_cache import *
+from .tagging_job import *
@@ -1,5 +1,5 @@
 # DecisionChatSession SQLAlchemy model
-from sqlalchemy import Column, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, String, DateTime, Enum, ForeignKey, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -15,6 +15,14 @@ class SessionStatus(enum.Enum):
     completed = "completed"
 
 
+class TaggingStatus(str, enum.Enum):
+    """Auto-tagging state of a journal entry (stored as a plain string)."""
+
+    pending = "pending"
+    done = "done"
+    failed = "failed"
+
+
 class DecisionChatSession(Base):
     __tablename__ = "decision_chat_sessions"
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -25,8 +33,18 @@ class DecisionChatSession(Base):
     status = Column(Enum(SessionStatus), default=SessionStatus.context_gathering)
     summary = Column(String, nullable=True)
     insights = Column(String, nullable=True)
+    # Reason: Chat memory keeps older turns as a summary instead of resending them
+    rolling_summary = Column(String, nullable=True)
+    summarized_message_count = Column(Integer, nullable=False, default=0)
+    # Reason: Last summarized message, so pending turns are found by index seek
+    summarized_through_at = Column(DateTime, nullable=True)
+    summarized_through_id = Column(String(36), nullable=True)
     user = relationship("User")
 
+    __table_args__ = (
+        Index("ix_decision_chat_sessions_user_id_started_at", "user_id", "started_at"),
+    )
+
 
 class DecisionJournalEntry(Base):
     """
@@ -44,6 +62,12 @@ class DecisionJournalEntry(Base):
         domain_tags (list): List of detected domains.
         sentiment_tag (str): Detected sentiment.
         keywords (list): Extracted keywords/topics.
+        tagging_status (str): Auto-tagging state (pending, done, failed).
+        tagged_content_hash (str): Hash of the text the current tags were
+            computed from (None if unknown or tags are a local fallback).
+        reflection_prompts (list): Cached AI reflection prompts.
+        reflection_prompts_hash (str): Hash of the fields the cached prompts
+            were generated from.
         created_at (datetime): Creation timestamp.
         updated_at (datetime): Last update timestamp.
     """
@@ -60,8 +84,19 @@ class DecisionJournalEntry(Base):
     domain_tags = Column(JSON, nullable=True)  # List of strings
     sentiment_tag = Column(String, nullable=True)
     keywords = Column(JSON, nullable=True)  # List of strings
+    tagging_status = Column(String(16), nullable=True)  # See TaggingStatus
+    tagged_content_hash = Column(String(64), nullable=True)
+    reflection_prompts = Column(JSON, nullable=True)  # List of strings
+    reflection_prompts_hash = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(
         DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
     )
     user = relationship("User")
+
+    # Reason: Per-user listing filters by user_id and orders by created_at
+    __table_args__ = (
+        Index(
+            "ix_decision_journal_entries_user_id_created_at", "user_id", "created_at"
+        ),
+    )
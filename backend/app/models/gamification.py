@@ -1,5 +1,5 @@
 # Gamification SQLAlchemy models
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -15,6 +15,8 @@ class UserStreak(Base):
     last_checkin = Column(DateTime, default=datetime.datetime.utcnow)
     user = relationship("User")
 
+    __table_args__ = (Index("ix_user_streaks_user_id", "user_id"),)
+
 
 class Badge(Base):
     __tablename__ = "badges"
@@ -32,6 +34,10 @@ class UserBadge(Base):
     user = relationship("User")
     badge = relationship("Badge")
 
+    __table_args__ = (
+        Index("ix_user_badges_user_id_awarded_at", "user_id", "awarded_at"),
+    )
+
 
 class Challenge(Base):
     __tablename__ = "challenges"
@@ -50,3 +56,7 @@ class UserChallenge(Base):
     completed_at = Column(DateTime, nullable=True)
     user = relationship("User")
     challenge = relationship("Challenge")
+
+    __table_args__ = (
+        Index("ix_user_challenges_user_id_started_at", "user_id", "started_at"),
+    )
@@ -1,5 +1,5 @@
 # DecisionChatMessage SQLAlchemy model
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -25,3 +25,11 @@ class DecisionChatMessage(Base):
     content = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     session = relationship("DecisionChatSession")
+
+    __table_args__ = (
+        Index(
+            "ix_decision_chat_messages_session_id_created_at",
+            "session_id",
+            "created_at",
+        ),
+    )
@@ -0,0 +1,25 @@
+# Persistent auto-tagging cache SQLAlchemy model
+from sqlalchemy import Column, String, DateTime, Integer, JSON, Index
+from app.models.user import Base
+import datetime
+
+
+class TagCacheEntry(Base):
+    """
+    Auto-tagging result keyed by a hash of normalized title+context,
+    the model name and the tagging taxonomy version.
+    """
+
+    __tablename__ = "tag_cache"
+    key = Column(String(64), primary_key=True)  # sha256 hex digest
+    model = Column(String(255), nullable=False)
+    taxonomy_version = Column(String(64), nullable=False)
+    domain_tags = Column(JSON, nullable=False)
+    sentiment_tag = Column(String(32), nullable=False)
+    keywords = Column(JSON, nullable=False)
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    # Reason: Eviction scans by recency
+    __table_args__ = (Index("ix_tag_cache_last_used_at", "last_used_at"),)
@@ -0,0 +1,43 @@
+# Background job queue SQLAlchemy model
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index
+from app.models.user import Base
+import uuid
+import datetime
+
+
+class TaggingJob(Base):
+    """
+    Persistent job for work done off the request path for a journal entry.
+
+    Attributes:
+        id (str): Primary key.
+        entry_id (str): Target decision journal entry.
+        kind (str): Job type (e.g. "tag_entry").
+        status (str): pending, running, done or failed.
+        attempts (int): Number of attempts made so far.
+        last_error (str): Error from the most recent failed attempt.
+        run_after (datetime): Earliest time the job may run (retry backoff).
+        created_at (datetime): Creation timestamp.
+        updated_at (datetime): Last update timestamp.
+    """
+
+    __tablename__ = "tagging_jobs"
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    entry_id = Column(
+        String(36), ForeignKey("decision_journal_entries.id"), nullable=False
+    )
+    kind = Column(String(32), nullable=False, default="tag_entry")
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(1024), nullable=True)
+    run_after = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(
+        DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow
+    )
+
+    # Reason: Workers claim the oldest runnable job of a given status
+    __table_args__ = (
+        Index("ix_tagging_jobs_status_run_after", "status", "run_after"),
+        Index("ix_tagging_jobs_entry_id", "entry_id"),
+    )
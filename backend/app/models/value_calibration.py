@@ -1,5 +1,5 @@
 # ValueCalibrationCheckin SQLAlchemy model
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -14,3 +14,9 @@ class ValueCalibrationCheckin(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     value_snapshot = Column(String, nullable=False)  # JSON string or serialized values
     user = relationship("User")
+
+    __table_args__ = (
+        Index(
+            "ix_value_calibration_checkins_user_id_created_at", "user_id", "created_at"
+        ),
+    )
@@ -32,8 +32,17 @@ class DecisionJournalEntryOut(DecisionJournalEntryBase):
     domain_tags: Optional[List[str]] = None
     sentiment_tag: Optional[str] = None
     keywords: Optional[List[str]] = None
+    tagging_status: Optional[str] = None
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
     class Config:
         orm_mode = True
+
+
+class DecisionJournalEntryTags(BaseModel):
+    entry_id: UUID
+    tagging_status: Optional[str] = None
+    domain_tags: Optional[List[str]] = None
+    sentiment_tag: Optional[str] = None
+    keywords: Optional[List[str]] = None
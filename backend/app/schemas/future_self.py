@@ -34,3 +34,40 @@ class FutureSelfSimulationResponse(BaseModel):
     ai_generated: bool = Field(
         True, description="Indicates if the response was generated by AI."
     )
+
+
+class FutureSelfBatchRequest(BaseModel):
+    """
+    Request schema for simulating several variants of one decision at once.
+
+    Every combination of `time_horizons` and `value_sets` is simulated; an
+    omitted list counts as a single unspecified value.
+    """
+
+    decision_context: str = Field(
+        ..., description="Description of the user's decision or dilemma."
+    )
+    time_horizons: Optional[List[Optional[str]]] = Field(
+        None, description="Time frames to compare (e.g., ['1 year', '5 years'])."
+    )
+    value_sets: Optional[List[List[str]]] = Field(
+        None, description="Alternative sets of core values to compare."
+    )
+
+
+class FutureSelfBatchItem(BaseModel):
+    """
+    One simulated variant of a batch request.
+    """
+
+    time_horizon: Optional[str] = None
+    values: Optional[List[str]] = None
+    result: FutureSelfSimulationResponse
+
+
+class FutureSelfBatchResponse(BaseModel):
+    """
+    Response schema for a batch simulation, in request order.
+    """
+
+    results: List[FutureSelfBatchItem]
@@ -2,16 +2,27 @@
 OpenAI-based Auto Tagging and Categorization Service for Decision Journal Entries.
 
 - Calls OpenAI LLM with function calling to extract domain_tags, sentiment_tag, keywords.
+- A local lexicon tagger (AutoTagger) answers first when it is confident and
+  serves as the offline fallback.
 - No local NLP dependencies.
 """
 
+from typing import List, NamedTuple, Optional, Dict, Tuple
+import hashlib
+import json
+import logging
 import os
-from typing import List, Optional, Dict
-import openai
+import re
+import threading
 from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.services import llm
+from app.services.tag_cache import content_key, tag_cache
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-nano")
+logger = logging.getLogger(__name__)
+
+AUTO_TAG_BATCH_SIZE = int(os.getenv("AUTO_TAG_BATCH_SIZE", "10"))
+AUTO_TAG_LLM_BUDGET_SECONDS = float(os.getenv("AUTO_TAG_LLM_BUDGET_SECONDS", "15"))
 
 AUTO_TAG_FUNCTION = {
     "name": "auto_tag_journal_entry",
@@ -102,27 +113,135 @@ AUTO_TAG_FUNCTION = {
 }
 
 
+# Reason: Any change to the tagging schema (enums, wording) invalidates cached tags
+TAXONOMY_VERSION = hashlib.sha256(
+    json.dumps(AUTO_TAG_FUNCTION, sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+_ENTRY_PROPERTIES = AUTO_TAG_FUNCTION["parameters"]["properties"]
+ALLOWED_DOMAIN_TAGS = set(_ENTRY_PROPERTIES["domain_tags"]["items"]["enum"])
+ALLOWED_SENTIMENTS = set(_ENTRY_PROPERTIES["sentiment_tag"]["enum"])
+ALLOWED_KEYWORDS = set(_ENTRY_PROPERTIES["keywords"]["items"]["enum"])
+
+# Same per-entry schema as AUTO_TAG_FUNCTION, wrapped in an indexed array
+AUTO_TAG_BATCH_FUNCTION = {
+    "name": "auto_tag_journal_entries",
+    "description": (
+        "Auto-tag several decision journal entries at once. Return exactly one result "
+        "per entry, with `index` set to that entry's number. "
+        + AUTO_TAG_FUNCTION["description"]
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "index": {
+                            "type": "integer",
+                            "description": "Number of the entry these tags belong to",
+                        },
+                        **_ENTRY_PROPERTIES,
+                    },
+                    "required": ["index", *AUTO_TAG_FUNCTION["parameters"]["required"]],
+                },
+            }
+        },
+        "required": ["results"],
+    },
+}
+
+
+def entry_content_hash(title: Optional[str], context: Optional[str]) -> str:
+    """
+    Hash an entry's normalized title/context under the current taxonomy.
+
+    Stored with the tags so updates only re-tag when the tagged text changes.
+    Unlike the tag cache key, the model is left out so a model switch alone
+    does not make every entry stale.
+    """
+    return content_key(title, context, "", TAXONOMY_VERSION)
+
+
+def validate_tags(tags: object) -> Optional[Dict[str, object]]:
+    """
+    Check a tagging result against the taxonomy enums.
+
+    Args:
+        tags (object): Candidate result from the LLM.
+
+    Returns:
+        Optional[Dict[str, object]]: The three tag fields if valid, else None.
+    """
+    if not isinstance(tags, dict):
+        return None
+    domains = tags.get("domain_tags")
+    sentiment = tags.get("sentiment_tag")
+    keywords = tags.get("keywords")
+    if not (
+        isinstance(domains, list) and domains and set(domains) <= ALLOWED_DOMAIN_TAGS
+    ):
+        return None
+    if sentiment not in ALLOWED_SENTIMENTS:
+        return None
+    if not (
+        isinstance(keywords, list) and keywords and set(keywords) <= ALLOWED_KEYWORDS
+    ):
+        return None
+    return {"domain_tags": domains, "sentiment_tag": sentiment, "keywords": keywords}
+
+
 class OpenAITagger:
     """
     Service for auto-tagging decision journal entries using OpenAI LLM with function calling.
     """
 
+    @classmethod
+    def cached_tags(
+        cls,
+        title: Optional[str],
+        context: Optional[str],
+        db: Optional[Session] = None,
+    ) -> Optional[Dict[str, object]]:
+        """
+        Return cached tags for this text without calling the LLM, or None.
+        """
+        key = content_key(title, context, llm.DEFAULT_MODEL, TAXONOMY_VERSION)
+        return tag_cache.get(db, key)
+
     @classmethod
     def tag_entry(
-        cls, title: Optional[str], context: Optional[str]
+        cls,
+        title: Optional[str],
+        context: Optional[str],
+        db: Optional[Session] = None,
     ) -> Dict[str, object]:
         """
         Calls OpenAI to auto-tag a decision journal entry.
 
+        Results are cached by content (see app.services.tag_cache), so identical
+        text is only sent to the LLM once per model and taxonomy version. On a
+        cache miss, confident local tags (AutoTagger) skip the LLM entirely.
+
         Args:
             title (Optional[str]): Entry title.
             context (Optional[str]): Entry context.
+            db (Optional[Session]): Enables the persistent cache tier when given.
         Returns:
             Dict[str, object]: {"domain_tags": [...], "sentiment_tag": str, "keywords": [...]}
         Raises:
             HTTPException(503): If OpenAI API key is not set or call fails.
         """
-        if not OPENAI_API_KEY:
+        key = content_key(title, context, llm.DEFAULT_MODEL, TAXONOMY_VERSION)
+        cached = tag_cache.get(db, key)
+        if cached is not None:
+            return cached
+        local = AutoTagger.confident_tags(title, context)
+        if local is not None:
+            return local
+        if not llm.is_configured():
             raise HTTPException(
                 status_code=503,
                 detail="Auto-tagging unavailable: OpenAI API key not configured.",
@@ -139,16 +258,13 @@ class OpenAITagger:
             },
         ]
         try:
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=messages,
+            response = llm.chat_completion(
+                messages,
+                budget=AUTO_TAG_LLM_BUDGET_SECONDS,
                 functions=[AUTO_TAG_FUNCTION],
                 function_call={"name": "auto_tag_journal_entry"},
             )
             args = response.choices[0].message.function_call.arguments
-            import json
-
             tags = json.loads(args)
             # Validate output
             for k in ("domain_tags", "sentiment_tag", "keywords"):
@@ -156,47 +272,378 @@ class OpenAITagger:
                     raise HTTPException(
                         status_code=503, detail=f"OpenAI tagging missing field: {k}"
                     )
-            return tags
         except Exception as e:
             raise HTTPException(status_code=503, detail=f"Auto-tagging failed: {e}")
+        tag_cache.put(db, key, tags, llm.DEFAULT_MODEL, TAXONOMY_VERSION)
+        return tags
+
+    @classmethod
+    def _tag_batch(
+        cls, entries: List[Tuple[Optional[str], Optional[str]]]
+    ) -> Optional[List[Optional[Dict[str, object]]]]:
+        """
+        Tag several entries with one function call; invalid or missing items are None.
+
+        Returns None if the call itself failed (not configured, transport
+        error, breaker open), so callers don't retry item by item.
+        """
+        results: List[Optional[Dict[str, object]]] = [None] * len(entries)
+        if not llm.is_configured():
+            return None
+        prompt = (
+            "Tag each of the following decision journal entries. For every entry, extract the most relevant domains, "
+            "sentiment (positive/neutral/negative), and 3-7 keywords. Respond strictly in the specified function call format, "
+            "with one result per entry and `index` set to the entry number."
+        )
+        numbered = "\n\n".join(
+            f"Entry {i}:\nTitle: {title or ''}\nContext: {context or ''}"
+            for i, (title, context) in enumerate(entries)
+        )
+        try:
+            response = llm.chat_completion(
+                [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": numbered},
+                ],
+                budget=AUTO_TAG_LLM_BUDGET_SECONDS,
+                functions=[AUTO_TAG_BATCH_FUNCTION],
+                function_call={"name": AUTO_TAG_BATCH_FUNCTION["name"]},
+            )
+        except Exception as e:
+            logger.warning("Batch auto-tagging failed: %s", e)
+            return None
+        try:
+            items = json.loads(response.choices[0].message.function_call.arguments).get(
+                "results"
+            )
+        except Exception as e:
+            logger.warning("Batch auto-tagging reply unreadable: %s", e)
+            return results
+        if not isinstance(items, list):
+            return results
+        for item in items:
+            index = item.get("index") if isinstance(item, dict) else None
+            # Reason: Ignore out-of-range or duplicate indexes rather than guess
+            if isinstance(index, int) and 0 <= index < len(entries):
+                if results[index] is None:
+                    results[index] = validate_tags(item)
+        return results
+
+    @classmethod
+    def tag_entries(
+        cls,
+        entries: List[Tuple[Optional[str], Optional[str]]],
+        db: Optional[Session] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[Optional[Dict[str, object]]]:
+        """
+        Tag many entries, packing cache misses into batched LLM calls.
+
+        Identical texts are tagged once. Items the batch reply leaves missing or
+        invalid are retried with single-entry `tag_entry` calls; if a batch
+        call fails outright, tagging stops and the remaining entries are None.
+
+        Args:
+            entries (List[Tuple[Optional[str], Optional[str]]]): (title, context) pairs.
+            db (Optional[Session]): Enables the persistent cache tier when given.
+            batch_size (Optional[int]): Entries per LLM call (default AUTO_TAG_BATCH_SIZE).
+        Returns:
+            List[Optional[Dict[str, object]]]: Tags aligned with `entries`;
+                None where tagging failed.
+        """
+        size = max(1, batch_size or AUTO_TAG_BATCH_SIZE)
+        results: List[Optional[Dict[str, object]]] = [None] * len(entries)
+        pending: Dict[str, List[int]] = {}
+        for i, (title, context) in enumerate(entries):
+            key = content_key(title, context, llm.DEFAULT_MODEL, TAXONOMY_VERSION)
+            cached = tag_cache.get(db, key)
+            if cached is None:
+                cached = AutoTagger.confident_tags(title, context)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+        keys = list(pending)
+        for start in range(0, len(keys), size):
+            chunk = keys[start : start + size]
+            chunk_entries = [entries[pending[key][0]] for key in chunk]
+            batch_tags = cls._tag_batch(chunk_entries) if len(chunk) > 1 else [None]
+            if batch_tags is None:
+                # Reason: Don't send a failing provider one more call per item
+                return results
+            for key, (title, context), tags in zip(chunk, chunk_entries, batch_tags):
+                if tags is not None:
+                    tag_cache.put(db, key, tags, llm.DEFAULT_MODEL, TAXONOMY_VERSION)
+                else:
+                    try:
+                        tags = cls.tag_entry(title, context, db=db)
+                    except HTTPException as e:
+                        logger.warning("Auto-tagging failed: %s", e.detail)
+                        continue
+                for i in pending[key]:
+                    results[i] = dict(tags)
+        return results
+
+
+# Local tagger lexicon. Keys are taxonomy keywords, values their surface forms.
+KEYWORD_TERMS: Dict[str, Tuple[str, ...]] = {
+    "promotion": ("promotion", "promotions", "promoted", "raise"),
+    "boss": ("boss", "manager", "supervisor", "ceo"),
+    "colleague": ("colleague", "colleagues", "coworker", "coworkers", "teammate"),
+    "salary": ("salary", "pay", "paycheck", "compensation", "wage", "wages"),
+    "job": ("job", "jobs", "work", "career", "employer", "offer", "position"),
+    "deadline": ("deadline", "deadlines", "due date"),
+    "project": ("project", "projects"),
+    "meeting": ("meeting", "meetings", "interview"),
+    "health": ("health", "healthy", "doctor", "illness", "sick", "injury"),
+    "exercise": ("exercise", "workout", "gym", "running", "training", "yoga"),
+    "diet": ("diet", "eating", "nutrition", "food", "meal", "meals"),
+    "stress": ("stress", "stressed", "stressful", "burnout", "pressure"),
+    "sleep": ("sleep", "sleeping", "insomnia", "rest"),
+    "habit": ("habit", "habits", "routine", "routines"),
+    "learning": ("learning", "learn", "course", "study", "studying", "degree"),
+    "reading": ("reading", "read", "book", "books"),
+    "family": ("family", "parents", "mother", "father", "mom", "dad", "kids"),
+    "friend": ("friend", "friends", "friendship"),
+    "partner": ("partner", "wife", "husband", "girlfriend", "boyfriend", "spouse"),
+    "conflict": ("conflict", "argument", "fight", "disagreement"),
+    "support": ("support", "supportive", "help", "helped"),
+    "communication": ("communication", "communicate", "talk", "conversation"),
+    "savings": ("savings", "save", "saving", "emergency fund"),
+    "debt": ("debt", "loan", "loans", "mortgage", "credit card"),
+    "investment": ("investment", "invest", "investing", "stocks", "portfolio"),
+    "expense": ("expense", "expenses", "cost", "costs", "bills", "rent"),
+    "budget": ("budget", "budgeting", "money"),
+    "purchase": ("purchase", "buy", "buying", "bought"),
+    "courage": ("courage", "brave", "risk"),
+    "honesty": ("honesty", "honest", "truth", "lie", "lying"),
+    "integrity": ("integrity", "ethics", "ethical", "principles"),
+    "gratitude": ("gratitude", "grateful", "thankful"),
+    "fear": ("fear", "afraid", "scared", "anxious", "anxiety"),
+    "happiness": ("happiness", "happy", "joy"),
+    "regret": ("regret", "regrets", "regretted"),
+    "motivation": ("motivation", "motivated", "drive", "goal", "goals"),
+}
+
+# Domains each taxonomy keyword counts towards.
+KEYWORD_DOMAINS: Dict[str, Tuple[str, ...]] = {
+    **dict.fromkeys(
+        (
+            "promotion",
+            "boss",
+            "colleague",
+            "job",
+            "deadline",
+            "project",
+            "meeting",
+        ),
+        ("career",),
+    ),
+    "salary": ("career", "finance"),
+    **dict.fromkeys(("health", "exercise", "diet", "sleep"), ("health",)),
+    "stress": ("health", "personal_growth"),
+    "habit": ("health", "personal_growth"),
+    **dict.fromkeys(
+        ("family", "friend", "partner", "conflict", "support", "communication"),
+        ("relationships",),
+    ),
+    **dict.fromkeys(
+        ("savings", "debt", "investment", "expense", "budget", "purchase"),
+        ("finance",),
+    ),
+    **dict.fromkeys(
+        (
+            "learning",
+            "reading",
+            "courage",
+            "honesty",
+            "integrity",
+            "gratitude",
+            "fear",
+            "happiness",
+            "regret",
+            "motivation",
+        ),
+        ("personal_growth",),
+    ),
+}
+
+POSITIVE_TERMS = (
+    "good",
+    "great",
+    "happy",
+    "glad",
+    "excited",
+    "exciting",
+    "love",
+    "proud",
+    "hopeful",
+    "confident",
+    "relieved",
+    "grateful",
+    "thankful",
+    "enjoy",
+    "enjoyed",
+    "better",
+    "calm",
+    "success",
+    "successful",
+    "opportunity",
+    "promising",
+    "thrilled",
+    "won",
+)
+NEGATIVE_TERMS = (
+    "bad",
+    "sad",
+    "angry",
+    "upset",
+    "unhappy",
+    "worried",
+    "worry",
+    "anxious",
+    "afraid",
+    "scared",
+    "stressed",
+    "frustrated",
+    "overwhelmed",
+    "tired",
+    "exhausted",
+    "hate",
+    "regret",
+    "failed",
+    "failure",
+    "lost",
+    "difficult",
+    "struggling",
+    "worse",
+    "terrible",
+    "fired",
+    "lonely",
+)
+NEGATION_TERMS = ("not", "no", "never", "don't", "didn't", "isn't", "wasn't", "can't")
+# Reason: A negator flips sentiment words that start within this many characters
+# and in the same sentence (title and context are separated by a newline)
+NEGATION_WINDOW = 20
+_SENTENCE_END = re.compile(r"[.!?\n]")
+
+AUTO_TAG_LOCAL_CONFIDENCE = float(os.getenv("AUTO_TAG_LOCAL_CONFIDENCE", "0.8"))
+AUTO_TAG_LOCAL_FALLBACK = os.getenv("AUTO_TAG_LOCAL_FALLBACK", "true").lower() in (
+    "1",
+    "true",
+)
+
+
+_local_stats_lock = threading.Lock()
+_local_stats = {"analyzed": 0, "confident": 0, "fallbacks": 0}
+
+
+def _count_local(key: str) -> None:
+    with _local_stats_lock:
+        _local_stats[key] += 1
+
+
+class LocalTags(NamedTuple):
+    tags: Dict[str, object]
+    confidence: float
+
+
+def _build_matcher() -> Tuple["re.Pattern[str]", Dict[str, List[Tuple[str, str]]]]:
+    actions: Dict[str, List[Tuple[str, str]]] = {}
+    for keyword, terms in KEYWORD_TERMS.items():
+        for term in terms:
+            actions.setdefault(term, []).append(("keyword", keyword))
+    for term in POSITIVE_TERMS:
+        actions.setdefault(term, []).append(("sentiment", "positive"))
+    for term in NEGATIVE_TERMS:
+        actions.setdefault(term, []).append(("sentiment", "negative"))
+    for term in NEGATION_TERMS:
+        actions.setdefault(term, []).append(("negation", ""))
+    # Reason: Longest terms first so "credit card" wins over shorter overlaps
+    alternation = "|".join(
+        re.escape(term) for term in sorted(actions, key=len, reverse=True)
+    )
+    return re.compile(rf"\b(?:{alternation})\b"), actions
+
+
+_MATCHER, _TERM_ACTIONS = _build_matcher()
 
 
 class AutoTagger:
     """
-    Service for auto-tagging decision journal entries with domains, sentiment, and keywords.
+    Dependency-free local tagger: one compiled regex over the keyword lexicon
+    plus a lexicon-based sentiment score.
+
+    Used as a confidence-gated first tier in front of the LLM and as the
+    offline fallback when the LLM is unavailable.
     """
 
     @staticmethod
-    def extract_keywords(text: str) -> List[str]:
-        r = Rake()
-        r.extract_keywords_from_text(text or "")
-        return r.get_ranked_phrases()[:5]  # Top 5 keywords
+    def analyze(title: Optional[str], context: Optional[str]) -> LocalTags:
+        """
+        Tag an entry locally and estimate how much the result can be trusted.
 
-    @staticmethod
-    def detect_domain(text: str) -> List[str]:
-        # Reason: Try to match as many relevant domains as possible
-        if not text:
-            return []
-        domains = set()
-        text_lower = text.lower()
-        for domain, keywords in DOMAIN_KEYWORDS.items():
-            for kw in keywords:
-                if kw in text_lower:
-                    domains.add(domain)
-        return list(domains) if domains else []  # Always return a list, never None
+        Confidence is the product of keyword coverage (3+ distinct keywords),
+        domain focus (share of votes for the top domain) and sentiment clarity.
 
-    @staticmethod
-    def analyze_sentiment(text: str) -> str:
-        # Reason: Use a wider neutral range for more realistic results
-        if not text:
-            return "neutral"
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-        if polarity > 0.2:
-            return "positive"
-        elif polarity < -0.2:
-            return "negative"
-        return "neutral"
+        Args:
+            title (Optional[str]): Entry title.
+            context (Optional[str]): Entry context.
+
+        Returns:
+            LocalTags: Tags in the LLM's format and a confidence in [0, 1].
+        """
+        text = f"{title or ''}\n{context or ''}".lower()
+        keyword_counts: Dict[str, int] = {}
+        positive = negative = 0
+        negated_until = -1
+        for match in _MATCHER.finditer(text):
+            for kind, value in _TERM_ACTIONS[match.group()]:
+                if kind == "keyword":
+                    keyword_counts[value] = keyword_counts.get(value, 0) + 1
+                elif kind == "negation":
+                    negated_until = match.end() + NEGATION_WINDOW
+                    end = _SENTENCE_END.search(text, match.end(), negated_until)
+                    if end is not None:
+                        negated_until = end.start()
+                elif (value == "positive") != (match.start() <= negated_until):
+                    positive += 1
+                else:
+                    negative += 1
+        if not keyword_counts:
+            tags = {
+                "domain_tags": ["ambiguous"],
+                "sentiment_tag": "neutral",
+                "keywords": ["ambiguous"],
+            }
+            return LocalTags(tags, 0.0)
+
+        # Reason: dicts keep first-seen order, so ties favour earlier mentions
+        keywords = sorted(keyword_counts, key=keyword_counts.get, reverse=True)[:7]
+        domain_votes: Dict[str, int] = {}
+        for keyword, count in keyword_counts.items():
+            for domain in KEYWORD_DOMAINS[keyword]:
+                domain_votes[domain] = domain_votes.get(domain, 0) + count
+        top = max(domain_votes.values())
+        domains = [d for d, votes in domain_votes.items() if votes * 2 >= top]
+
+        if positive > negative:
+            sentiment = "positive"
+        elif negative > positive:
+            sentiment = "negative"
+        else:
+            sentiment = "neutral"
+        polar = positive + negative
+        clarity = abs(positive - negative) / polar if polar else 0.5
+
+        coverage = min(1.0, len(keyword_counts) / 3)
+        focus = top / sum(domain_votes.values())
+        tags = {
+            "domain_tags": domains,
+            "sentiment_tag": sentiment,
+            "keywords": keywords,
+        }
+        return LocalTags(tags, round(coverage * focus * clarity, 3))
 
     @classmethod
     def tag_entry(
@@ -205,12 +652,40 @@ class AutoTagger:
         """
         Given title/context, return dict with domain_tags, sentiment_tag, keywords.
         """
-        full_text = f"{title or ''} {context or ''}"
-        domains = cls.detect_domain(full_text)
-        sentiment = cls.analyze_sentiment(full_text)
-        keywords = cls.extract_keywords(full_text)
-        return {
-            "domain_tags": domains,
-            "sentiment_tag": sentiment,
-            "keywords": keywords,
-        }
+        return cls.analyze(title, context).tags
+
+    @classmethod
+    def confident_tags(
+        cls, title: Optional[str], context: Optional[str]
+    ) -> Optional[Dict[str, object]]:
+        """
+        Return local tags if their confidence reaches AUTO_TAG_LOCAL_CONFIDENCE.
+        """
+        result = cls.analyze(title, context)
+        _count_local("analyzed")
+        if result.confidence >= AUTO_TAG_LOCAL_CONFIDENCE:
+            _count_local("confident")
+            return result.tags
+        return None
+
+    @classmethod
+    def fallback_tags(
+        cls, title: Optional[str], context: Optional[str]
+    ) -> Optional[Dict[str, object]]:
+        """
+        Return local tags to use when the LLM is unavailable, or None if the
+        offline fallback is disabled (AUTO_TAG_LOCAL_FALLBACK).
+        """
+        if not AUTO_TAG_LOCAL_FALLBACK:
+            return None
+        _count_local("fallbacks")
+        return cls.tag_entry(title, context)
+
+    @staticmethod
+    def stats() -> Dict[str, object]:
+        """Return local tier counters for monitoring."""
+        with _local_stats_lock:
+            snapshot: Dict[str, object] = dict(_local_stats)
+        snapshot["confidence_threshold"] = AUTO_TAG_LOCAL_CONFIDENCE
+        snapshot["fallback_enabled"] = AUTO_TAG_LOCAL_FALLBACK
+        return snapshot
@@ -0,0 +1,475 @@
+"""
+Persistent background job queue and worker pool.
+
+- Jobs live in the `tagging_jobs` table, so they survive restarts and can be
+  drained by any process running the worker.
+- Workers claim a job with a conditional UPDATE (pending -> running), so several
+  threads or processes can share the table without double-processing.
+- Failed jobs are retried with exponential backoff up to a maximum number of
+  attempts; running jobs left behind by a crashed worker are requeued.
+- Enabled with AUTO_TAG_MODE=background (the default `sync` tags inline).
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional
+import datetime
+import logging
+import os
+import threading
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.decision import DecisionJournalEntry, TaggingStatus
+from app.models.tagging_job import TaggingJob
+from app.services.auto_tagger import (
+    AUTO_TAG_BATCH_SIZE,
+    AutoTagger,
+    OpenAITagger,
+    entry_content_hash,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+AUTO_TAG_MODE = os.getenv("AUTO_TAG_MODE", "sync").lower()  # sync | background
+AUTO_TAG_WORKERS = int(os.getenv("AUTO_TAG_WORKERS", "2"))
+AUTO_TAG_POLL_SECONDS = float(os.getenv("AUTO_TAG_POLL_SECONDS", "2"))
+AUTO_TAG_MAX_ATTEMPTS = int(os.getenv("AUTO_TAG_MAX_ATTEMPTS", "5"))
+AUTO_TAG_RETRY_BACKOFF_SECONDS = float(
+    os.getenv("AUTO_TAG_RETRY_BACKOFF_SECONDS", "10")
+)
+AUTO_TAG_STALE_SECONDS = float(os.getenv("AUTO_TAG_STALE_SECONDS", "300"))
+
+JOB_KIND_TAG_ENTRY = "tag_entry"
+
+
+def background_tagging_enabled() -> bool:
+    """Return True when journal tagging runs on the background worker."""
+    return AUTO_TAG_MODE == "background"
+
+
+class JobHandler(NamedTuple):
+    run: Callable[[Session, TaggingJob], None]
+    on_failure: Optional[Callable[[Session, TaggingJob], None]] = None
+    # Processes several jobs at once; returns {job_id: error} for the ones that failed
+    run_batch: Optional[Callable[[Session, List[TaggingJob]], Dict[str, str]]] = None
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(
+    kind: str,
+    run: Callable[[Session, TaggingJob], None],
+    on_failure: Optional[Callable[[Session, TaggingJob], None]] = None,
+    run_batch: Optional[Callable[[Session, List[TaggingJob]], Dict[str, str]]] = None,
+) -> None:
+    """
+    Register the function that processes jobs of `kind`.
+
+    Args:
+        kind (str): Job kind stored in `TaggingJob.kind`.
+        run (Callable): Does the work; raising marks the attempt as failed.
+        on_failure (Optional[Callable]): Called once the job has failed for good.
+        run_batch (Optional[Callable]): Optional multi-job variant of `run`.
+    """
+    JOB_HANDLERS[kind] = JobHandler(run, on_failure, run_batch)
+
+
+def enqueue_job(
+    db: Session, entry_id: str, kind: str = JOB_KIND_TAG_ENTRY
+) -> TaggingJob:
+    """
+    Add a job to the caller's session; it is committed with the caller's transaction.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        entry_id (str): Target journal entry id.
+        kind (str): Job kind.
+
+    Returns:
+        TaggingJob: The pending job.
+    """
+    now = datetime.datetime.utcnow()
+    job = TaggingJob(
+        entry_id=str(entry_id),
+        kind=kind,
+        status="pending",
+        attempts=0,
+        run_after=now,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    return job
+
+
+def has_pending_job(db: Session, entry_id: str, kind: str = JOB_KIND_TAG_ENTRY) -> bool:
+    """Return True if a job of this kind for the entry is waiting to be claimed."""
+    return (
+        db.query(TaggingJob.id)
+        .filter_by(entry_id=str(entry_id), kind=kind, status="pending")
+        .first()
+        is not None
+    )
+
+
+def apply_tags(
+    entry: DecisionJournalEntry, tags: Dict[str, object], record_hash: bool = True
+) -> None:
+    """
+    Store tagging results on an entry and mark it done.
+
+    Args:
+        entry (DecisionJournalEntry): Entry whose current title/context were tagged.
+        tags (Dict[str, object]): domain_tags, sentiment_tag and keywords.
+        record_hash (bool): False for fallback tags, leaving the entry stale
+            so it is re-tagged later.
+    """
+    entry.domain_tags = tags["domain_tags"]
+    entry.sentiment_tag = tags["sentiment_tag"]
+    entry.keywords = tags["keywords"]
+    entry.tagging_status = TaggingStatus.done.value
+    entry.tagged_content_hash = (
+        entry_content_hash(entry.title, entry.context) if record_hash else None
+    )
+
+
+def run_tagging_job(db: Session, job: TaggingJob) -> None:
+    """Tag the job's journal entry with its current title/context."""
+    entry = db.get(DecisionJournalEntry, job.entry_id)
+    if entry is None:
+        return
+    apply_tags(entry, OpenAITagger.tag_entry(entry.title, entry.context, db=db))
+
+
+def run_tagging_batch(db: Session, jobs: List[TaggingJob]) -> Dict[str, str]:
+    """Tag the entries of several jobs with batched LLM calls."""
+    entry_ids = {job.entry_id for job in jobs}
+    entries = {
+        entry.id: entry
+        for entry in db.query(DecisionJournalEntry).filter(
+            DecisionJournalEntry.id.in_(entry_ids)
+        )
+    }
+    targets = [(job, entries[job.entry_id]) for job in jobs if job.entry_id in entries]
+    results = OpenAITagger.tag_entries(
+        [(entry.title, entry.context) for _, entry in targets], db=db
+    )
+    errors: Dict[str, str] = {}
+    for (job, entry), tags in zip(targets, results):
+        if tags is None:
+            errors[job.id] = "Auto-tagging failed"
+        else:
+            apply_tags(entry, tags)
+    return errors
+
+
+def backfill_tags(
+    db: Session, limit: int = 100, cursor: Optional[str] = None
+) -> Dict[str, object]:
+    """
+    Tag entries that have no tags yet, whose tagging failed, or whose tags
+    were not computed from known text (no content hash), in batches.
+
+    Entries are visited oldest first and each call resumes after the cursor,
+    so entries that keep failing are not picked up again in the same run.
+
+    Args:
+        db (Session): Database session; changes are committed.
+        limit (int): Maximum number of entries to process in this call.
+        cursor (Optional[str]): `next_cursor` from the previous call.
+
+    Returns:
+        Dict[str, object]: Counts of entries processed, tagged and failed,
+            plus `next_cursor` (None once every candidate has been visited).
+
+    Raises:
+        HTTPException: 422 if the cursor is malformed.
+    """
+    query = db.query(DecisionJournalEntry).filter(
+        or_(
+            DecisionJournalEntry.domain_tags.is_(None),
+            DecisionJournalEntry.tagging_status == TaggingStatus.failed.value,
+            DecisionJournalEntry.tagged_content_hash.is_(None),
+        )
+    )
+    if cursor:
+        created_at, entry_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                DecisionJournalEntry.created_at > created_at,
+                and_(
+                    DecisionJournalEntry.created_at == created_at,
+                    DecisionJournalEntry.id > entry_id,
+                ),
+            )
+        )
+    entries = (
+        query.order_by(DecisionJournalEntry.created_at, DecisionJournalEntry.id)
+        .limit(limit)
+        .all()
+    )
+    results = OpenAITagger.tag_entries(
+        [(entry.title, entry.context) for entry in entries], db=db
+    )
+    tagged = 0
+    for entry, tags in zip(entries, results):
+        if tags is not None:
+            apply_tags(entry, tags)
+            tagged += 1
+    next_cursor = None
+    if len(entries) == limit:
+        last = entries[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    db.commit()
+    return {
+        "processed": len(entries),
+        "tagged": tagged,
+        "failed": len(entries) - tagged,
+        "next_cursor": next_cursor,
+    }
+
+
+def mark_tagging_failed(db: Session, job: TaggingJob) -> None:
+    """
+    Record that tagging gave up so clients stop waiting. Local fallback tags
+    are stored if enabled; the failed status keeps the entry eligible for
+    backfill.
+    """
+    entry = db.get(DecisionJournalEntry, job.entry_id)
+    if entry is not None and entry.tagging_status == TaggingStatus.pending.value:
+        tags = AutoTagger.fallback_tags(entry.title, entry.context)
+        if tags is not None:
+            apply_tags(entry, tags, record_hash=False)
+        entry.tagging_status = TaggingStatus.failed.value
+
+
+register_job_handler(
+    JOB_KIND_TAG_ENTRY, run_tagging_job, mark_tagging_failed, run_tagging_batch
+)
+
+
+class JobWorker:
+    """
+    Pool of daemon threads that drain the job table.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates worker DB sessions.
+        workers (int): Number of worker threads.
+        poll_seconds (float): Idle wait between polls (notify() wakes workers early).
+        max_attempts (int): Attempts before a job is marked failed.
+        retry_backoff_seconds (float): Base delay for exponential retry backoff.
+        stale_seconds (float): Running jobs older than this are requeued on start.
+        handlers (Optional[Dict[str, JobHandler]]): Defaults to JOB_HANDLERS.
+        batch_size (int): Jobs of one kind claimed together for batch handlers.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        workers: int = AUTO_TAG_WORKERS,
+        poll_seconds: float = AUTO_TAG_POLL_SECONDS,
+        max_attempts: int = AUTO_TAG_MAX_ATTEMPTS,
+        retry_backoff_seconds: float = AUTO_TAG_RETRY_BACKOFF_SECONDS,
+        stale_seconds: float = AUTO_TAG_STALE_SECONDS,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        batch_size: int = AUTO_TAG_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.stale_seconds = stale_seconds
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.batch_size = max(1, batch_size)
+        self._threads: list = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def _count(self, attr: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + amount)
+
+    def _claim(
+        self, db: Session, limit: int, kind: Optional[str] = None
+    ) -> List[TaggingJob]:
+        """Claim up to `limit` runnable jobs (optionally of one kind)."""
+        now = datetime.datetime.utcnow()
+        query = select(TaggingJob.id).where(
+            TaggingJob.status == "pending", TaggingJob.run_after <= now
+        )
+        if kind is not None:
+            query = query.where(TaggingJob.kind == kind)
+        # Reason: Over-fetch candidates since other workers may win some claims
+        candidates = (
+            db.execute(query.order_by(TaggingJob.run_after).limit(limit + self.workers))
+            .scalars()
+            .all()
+        )
+        claimed: List[str] = []
+        for job_id in candidates:
+            if len(claimed) >= limit:
+                break
+            won = db.execute(
+                update(TaggingJob)
+                .where(TaggingJob.id == job_id, TaggingJob.status == "pending")
+                .values(
+                    status="running", attempts=TaggingJob.attempts + 1, updated_at=now
+                )
+            ).rowcount
+            db.commit()
+            if won:
+                claimed.append(job_id)
+        return [db.get(TaggingJob, job_id) for job_id in claimed]
+
+    def _record_failure(
+        self,
+        db: Session,
+        job_id: str,
+        error: str,
+        handler: Optional[JobHandler],
+    ) -> None:
+        job = db.get(TaggingJob, job_id)
+        job.last_error = error[:1024]
+        if job.attempts >= self.max_attempts:
+            job.status = "failed"
+            if handler is not None and handler.on_failure is not None:
+                handler.on_failure(db, job)
+            self._count("failed")
+        else:
+            job.status = "pending"
+            job.run_after = datetime.datetime.utcnow() + datetime.timedelta(
+                seconds=self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+            )
+            self._count("retried")
+
+    def run_once(self) -> bool:
+        """
+        Claim and process the next runnable job, together with further jobs of
+        the same kind when its handler supports batching.
+
+        Returns:
+            bool: True if any job was processed (successfully or not).
+        """
+        with self.session_factory() as db:
+            first = self._claim(db, 1)
+            if not first:
+                return False
+            kind = first[0].kind
+            handler = self.handlers.get(kind)
+            jobs = first
+            if handler is not None and handler.run_batch is not None:
+                jobs += self._claim(db, self.batch_size - 1, kind=kind)
+            job_ids = [job.id for job in jobs]
+            try:
+                if handler is None:
+                    raise RuntimeError(f"No handler for job kind {kind!r}")
+                if handler.run_batch is not None and len(jobs) > 1:
+                    errors = handler.run_batch(db, jobs)
+                else:
+                    handler.run(db, jobs[0])
+                    errors = {}
+                for job in jobs:
+                    if job.id not in errors:
+                        job.status = "done"
+                        job.last_error = None
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                errors = {job_id: str(e) for job_id in job_ids}
+            for job_id, error in errors.items():
+                logger.warning("Background job %s (%s) failed: %s", job_id, kind, error)
+                self._record_failure(db, job_id, error, handler)
+            db.commit()
+            self._count("completed", len(job_ids) - len(errors))
+            return True
+
+    def drain(self, max_rounds: int = 1000) -> int:
+        """
+        Process runnable jobs until none are left.
+
+        Returns:
+            int: Number of worker rounds (a round may cover a batch of jobs).
+        """
+        rounds = 0
+        while rounds < max_rounds and self.run_once():
+            rounds += 1
+        return rounds
+
+    def requeue_stale(self) -> int:
+        """Return jobs stuck in `running` (e.g. after a crash) to `pending`."""
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=self.stale_seconds
+        )
+        with self.session_factory() as db:
+            requeued = db.execute(
+                update(TaggingJob)
+                .where(TaggingJob.status == "running", TaggingJob.updated_at < cutoff)
+                .values(status="pending")
+            ).rowcount
+            db.commit()
+        return requeued
+
+    def notify(self) -> None:
+        """Wake idle workers because a job was just enqueued."""
+        self._wakeup.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:
+                logger.exception("Background job worker error")
+                worked = False
+            if not worked:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def start(self) -> None:
+        """Requeue stale jobs and start the worker threads (idempotent)."""
+        if self._threads:
+            return
+        self.requeue_stale()
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._loop, name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal worker threads to exit and wait for them."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> Dict[str, object]:
+        """Return worker counters for monitoring."""
+        with self._lock:
+            return {
+                "mode": AUTO_TAG_MODE,
+                "running": bool(self._threads),
+                "workers": self.workers,
+                "batch_size": self.batch_size,
+                "completed": self.completed,
+                "retried": self.retried,
+                "failed": self.failed,
+            }
+
+
+def _default_session_factory() -> Session:
+    from app.db.session import SessionLocal
+
+    return SessionLocal()
+
+
+job_worker = JobWorker(session_factory=_default_session_factory)
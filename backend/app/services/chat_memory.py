@@ -0,0 +1,213 @@
+"""
+Server-side conversation memory for decision-support chat.
+
+- History lives in DecisionChatMessage; clients send only the new user turn.
+- The prompt holds the most recent turns verbatim, up to a token budget
+  (counted by app.services.prompt_builder), plus
+  a rolling summary of older turns stored on the DecisionChatSession.
+- When the unsummarized history outgrows the budget, the oldest turns are
+  folded into the summary until only half the budget remains, so the summary
+  call runs once every few turns rather than on every turn.
+- The session records the (created_at, id) of the last summarized message, so
+  the pending turns are read with an index seek, not by skipping the history.
+- Everything here is async (AsyncSession, async LLM gateway) for the async
+  decision-support handlers.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import datetime
+import logging
+import os
+import uuid
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.decision import DecisionChatSession
+from app.models.reflection import DecisionChatMessage, MessageType
+from app.services import llm, prompt_builder
+
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "256"))
+CHAT_SUMMARY_LLM_BUDGET_SECONDS = float(
+    os.getenv("CHAT_SUMMARY_LLM_BUDGET_SECONDS", "10")
+)
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a decision-coaching conversation. "
+    "Merge the previous summary with the new messages into one concise summary "
+    "that keeps the decision, options, constraints, values and feelings the user "
+    "mentioned. Reply with the summary only."
+)
+ChatMessage = Dict[str, str]
+MessageKey = Tuple[datetime.datetime, str]
+
+
+def role_for(sender: MessageType) -> str:
+    """Map a stored message sender to a chat-completion role."""
+    return "assistant" if sender == MessageType.ai else "user"
+
+
+async def add_message(
+    db: AsyncSession, session_id: str, sender: MessageType, content: str
+) -> DecisionChatMessage:
+    """Store and commit one chat message."""
+    message = DecisionChatMessage(
+        id=str(uuid.uuid4()),
+        session_id=session_id,
+        sender=sender,
+        content=content,
+        created_at=datetime.datetime.utcnow(),
+    )
+    db.add(message)
+    await db.commit()
+    return message
+
+
+async def pending_messages(
+    db: AsyncSession, chat_session: DecisionChatSession
+) -> Tuple[List[ChatMessage], List[MessageKey]]:
+    """
+    Return the session's messages not yet folded into the rolling summary.
+
+    Returns:
+        Tuple[List[ChatMessage], List[MessageKey]]: The messages, oldest first,
+            and the (created_at, id) of each for recording the summary boundary.
+    """
+    query = (
+        select(
+            DecisionChatMessage.sender,
+            DecisionChatMessage.content,
+            DecisionChatMessage.created_at,
+            DecisionChatMessage.id,
+        )
+        .where(DecisionChatMessage.session_id == chat_session.id)
+        .order_by(DecisionChatMessage.created_at, DecisionChatMessage.id)
+    )
+    through_at = chat_session.summarized_through_at
+    if through_at is not None:
+        query = query.where(
+            or_(
+                DecisionChatMessage.created_at > through_at,
+                and_(
+                    DecisionChatMessage.created_at == through_at,
+                    DecisionChatMessage.id > chat_session.summarized_through_id,
+                ),
+            )
+        )
+    elif chat_session.summarized_message_count:
+        # Reason: Sessions summarized before the boundary was stored
+        query = query.offset(chat_session.summarized_message_count)
+    rows = (await db.execute(query)).all()
+    messages = [
+        {"role": role_for(sender), "content": content} for sender, content, _, _ in rows
+    ]
+    return messages, [(created_at, id_) for _, _, created_at, id_ in rows]
+
+
+async def summarize(previous: Optional[str], messages: List[ChatMessage]) -> str:
+    """
+    Fold messages into the rolling summary.
+
+    Args:
+        previous (Optional[str]): Current summary, if any.
+        messages (List[ChatMessage]): Messages to add, oldest first.
+
+    Returns:
+        str: The new summary.
+
+    Raises:
+        llm.LLMUnavailable: If the LLM is unavailable or fails.
+    """
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    summary = await llm.acomplete_text(
+        [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"Previous summary:\n{previous or '(none)'}\n\n"
+                f"New messages:\n{transcript}",
+            },
+        ],
+        budget=CHAT_SUMMARY_LLM_BUDGET_SECONDS,
+        bulkhead="decision_support",
+        max_tokens=CHAT_SUMMARY_MAX_TOKENS,
+        temperature=0.3,
+    )
+    return summary.strip()
+
+
+async def _fold_into_summary(
+    db: AsyncSession,
+    chat_session: DecisionChatSession,
+    older: List[ChatMessage],
+    through: MessageKey,
+) -> bool:
+    # Reason: Don't hold a pooled DB connection while the summary is generated
+    await db.commit()
+    try:
+        summary = await summarize(chat_session.rolling_summary, older)
+    except Exception as e:
+        # Reason: Older turns just drop out of this prompt; the next turn retries
+        logger.warning("Chat summary update failed: %s", e)
+        return False
+    count = chat_session.summarized_message_count or 0
+    # Reason: Compare-and-set so concurrent turns cannot fold the same messages twice
+    won = (
+        await db.execute(
+            update(DecisionChatSession)
+            .where(
+                DecisionChatSession.id == chat_session.id,
+                DecisionChatSession.summarized_message_count == count,
+            )
+            .values(
+                rolling_summary=summary,
+                summarized_message_count=count + len(older),
+                summarized_through_at=through[0],
+                summarized_through_id=through[1],
+            )
+        )
+    ).rowcount
+    await db.commit()
+    await db.refresh(chat_session)
+    if not won:
+        # Reason: A concurrent turn folded first; its summary is not ours to use
+        return False
+    logger.debug("Folded %d messages into summary of %s", len(older), chat_session.id)
+    return True
+
+
+async def build_prompt(db: AsyncSession, session_id: str) -> List[ChatMessage]:
+    """
+    Build the chat prompt for a session from its stored history.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session; committed if the summary
+            is updated.
+        session_id (str): Decision chat session id (ownership already checked).
+
+    Returns:
+        List[ChatMessage]: An optional summary system message followed by the
+            most recent turns within CHAT_HISTORY_TOKEN_BUDGET.
+    """
+    chat_session = await db.get(DecisionChatSession, session_id)
+    messages, keys = await pending_messages(db, chat_session)
+    older, recent = prompt_builder.fit_history(messages, CHAT_HISTORY_TOKEN_BUDGET)
+    if older:
+        folded, kept = prompt_builder.fit_history(
+            messages, CHAT_HISTORY_TOKEN_BUDGET // 2
+        )
+        if await _fold_into_summary(db, chat_session, folded, keys[len(folded) - 1]):
+            recent = kept
+    prompt: List[ChatMessage] = []
+    if chat_session.rolling_summary:
+        prompt.append(
+            {
+                "role": "system",
+                "content": "Summary of the earlier conversation:\n"
+                + chat_session.rolling_summary,
+            }
+        )
+    return prompt + recent
@@ -0,0 +1,106 @@
+"""
+Parsing of future-self simulation output.
+
+The model writes a projection, then a "Suggestions:" marker followed by one
+suggestion per line. `SuggestionStreamParser` splits that output incrementally
+so streaming clients get projection text as it arrives and each suggestion as
+soon as its line is complete; `parse_simulation` applies the same rules to a
+full reply.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+SUGGESTIONS_MARKER = "Suggestions:"
+
+ParsedEvent = Tuple[str, Dict[str, Any]]
+
+
+def clean_suggestion(line: str) -> str:
+    """Strip bullets and surrounding whitespace from a suggestion line."""
+    return line.strip().strip("- ").strip()
+
+
+class SuggestionStreamParser:
+    """
+    Incremental splitter for "<projection> Suggestions: <lines>" text.
+
+    `feed` and `close` return ("projection", {"content"}) and
+    ("suggestion", {"index", "text"}) events.
+    """
+
+    def __init__(self, marker: str = SUGGESTIONS_MARKER):
+        self.marker = marker
+        self.projection_parts: List[str] = []
+        self.suggestions: List[str] = []
+        self._buffer = ""
+        self._in_suggestions = False
+
+    @property
+    def projection(self) -> str:
+        return "".join(self.projection_parts).strip()
+
+    def _projection_event(self, text: str) -> List[ParsedEvent]:
+        if not self.projection_parts:
+            text = text.lstrip()
+        if not text:
+            return []
+        self.projection_parts.append(text)
+        return [("projection", {"content": text})]
+
+    def _suggestion_event(self, line: str) -> List[ParsedEvent]:
+        text = clean_suggestion(line)
+        if not text:
+            return []
+        self.suggestions.append(text)
+        return [("suggestion", {"index": len(self.suggestions) - 1, "text": text})]
+
+    def _drain_lines(self) -> List[ParsedEvent]:
+        events: List[ParsedEvent] = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            events += self._suggestion_event(line)
+        return events
+
+    def feed(self, delta: str) -> List[ParsedEvent]:
+        """
+        Consume the next chunk of model output.
+
+        Args:
+            delta (str): Text as received from the stream.
+
+        Returns:
+            List[ParsedEvent]: Events that are now complete.
+        """
+        self._buffer += delta
+        if self._in_suggestions:
+            return self._drain_lines()
+        index = self._buffer.find(self.marker)
+        if index >= 0:
+            events = self._projection_event(self._buffer[:index])
+            self._buffer = self._buffer[index + len(self.marker) :]
+            self._in_suggestions = True
+            return events + self._drain_lines()
+        # Reason: Hold back a tail that could be the start of a split marker
+        cut = max(0, len(self._buffer) - (len(self.marker) - 1))
+        emit, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._projection_event(emit)
+
+    def close(self) -> List[ParsedEvent]:
+        """Flush buffered text once the stream has ended."""
+        rest, self._buffer = self._buffer, ""
+        if self._in_suggestions:
+            return self._suggestion_event(rest)
+        return self._projection_event(rest)
+
+
+def parse_simulation(text: str) -> Tuple[str, List[str]]:
+    """
+    Split a complete simulation reply into projection and suggestions.
+
+    Returns:
+        Tuple[str, List[str]]: (projection, suggestions)
+    """
+    parser = SuggestionStreamParser()
+    parser.feed(text)
+    parser.close()
+    return parser.projection, parser.suggestions
@@ -0,0 +1,46 @@
+# LLM gateway: shared, pooled clients (sync and asyncio) used by all AI endpoints
+from app.services.llm.client import (
+    DEFAULT_MODEL,
+    LLMBulkheadFull,
+    LLMCircuitOpen,
+    LLMUnavailable,
+    breaker,
+    chat_completion,
+    complete_text,
+    get_client,
+    is_available,
+    is_configured,
+    reset_client,
+    single_flight,
+    stats,
+    stream_text,
+)
+from app.services.llm.async_client import (
+    achat_completion,
+    aclose_client,
+    acomplete_text,
+    astream_text,
+    get_async_pool,
+)
+
+__all__ = [
+    "DEFAULT_MODEL",
+    "LLMBulkheadFull",
+    "LLMCircuitOpen",
+    "LLMUnavailable",
+    "achat_completion",
+    "aclose_client",
+    "acomplete_text",
+    "astream_text",
+    "breaker",
+    "chat_completion",
+    "complete_text",
+    "get_async_pool",
+    "get_client",
+    "is_available",
+    "is_configured",
+    "reset_client",
+    "single_flight",
+    "stats",
+    "stream_text",
+]
@@ -0,0 +1,345 @@
+"""
+Asyncio LLM gateway for `async def` handlers.
+
+- Same retries, deadline budgets, circuit breaker, single-flight and bulkheads
+  as the sync gateway, sharing its breaker and counters; waiting happens on
+  the event loop instead of in a threadpool thread, so one worker can hold
+  hundreds of in-flight completions.
+- Clients belong to the event loop that created them, since an httpx async
+  pool cannot be used from another loop (in production: one loop per worker).
+  A replaced pool (new API key, base URL or loop) is closed on its own loop
+  while that loop still runs; otherwise the leak is logged.
+- One deadline per call covers the bulkhead wait, the connection wait and
+  every attempt.
+- LLM_MAX_CONNECTIONS is split over several `openai.AsyncOpenAI` clients of at
+  most LLM_ASYNC_POOL_SHARD_SIZE connections each, and a call only enters a
+  client that has a free connection. Reason: httpcore scans every pooled
+  connection and queued request on each request event, so a single pool of
+  hundreds of connections spends O(n²) CPU on bookkeeping.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+
+import httpx
+import openai
+
+from app.services.llm import bulkhead as bulkheads
+from app.services.llm.client import (
+    DEFAULT_MODEL,
+    LLM_BUDGET_SECONDS,
+    LLM_CONNECT_TIMEOUT,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE,
+    LLM_MAX_RETRIES,
+    LLM_READ_TIMEOUT,
+    LLMBulkheadFull,
+    LLMUnavailable,
+    _admit,
+    _api_key,
+    _attempt_timeout,
+    _count,
+    _fail,
+    _request_key,
+    _retry_delay,
+    breaker,
+    single_flight,
+)
+from app.services.llm.singleflight import SingleFlightTimeout
+
+logger = logging.getLogger(__name__)
+
+LLM_ASYNC_POOL_SHARD_SIZE = int(os.getenv("LLM_ASYNC_POOL_SHARD_SIZE", "20"))
+
+
+def _build_async_client(
+    api_key: str, base_url: Optional[str], max_connections: int, max_keepalive: int
+) -> openai.AsyncOpenAI:
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT, pool=LLM_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        ),
+    )
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        organization=os.getenv("OPENAI_ORG_ID") or None,
+        max_retries=0,
+        http_client=http_client,
+    )
+
+
+class AsyncClientPool:
+    """
+    The async clients of one event loop, handed out one connection at a time.
+
+    Args:
+        api_key (str): Provider API key.
+        base_url (Optional[str]): OpenAI-compatible endpoint (None = OpenAI).
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str]):
+        shards = max(1, math.ceil(LLM_MAX_CONNECTIONS / LLM_ASYNC_POOL_SHARD_SIZE))
+        size = math.ceil(LLM_MAX_CONNECTIONS / shards)
+        keepalive = max(1, math.ceil(LLM_MAX_KEEPALIVE / shards))
+        self.clients = [
+            _build_async_client(api_key, base_url, size, min(size, keepalive))
+            for _ in range(shards)
+        ]
+        self.in_flight = [0] * shards
+        self._slots = asyncio.Semaphore(size * shards)
+
+    @asynccontextmanager
+    async def connection(self, timeout: float) -> AsyncIterator[openai.AsyncOpenAI]:
+        """
+        Hold a connection slot on the least busy client for the block.
+
+        Args:
+            timeout (float): Seconds to wait for a free slot.
+
+        Raises:
+            LLMUnavailable: If every connection stayed busy for `timeout`.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            # Reason: Local saturation, not a provider failure; leave the breaker alone
+            _count("pool_timeouts")
+            raise LLMUnavailable("LLM unavailable: connection pool exhausted")
+        index = min(range(len(self.clients)), key=self.in_flight.__getitem__)
+        self.in_flight[index] += 1
+        try:
+            yield self.clients[index]
+        finally:
+            self.in_flight[index] -= 1
+            self._slots.release()
+
+    async def close(self) -> None:
+        """Close every client's connections."""
+        for client in self.clients:
+            await client.close()
+
+
+_pool: Optional[AsyncClientPool] = None
+_pool_key: Optional[Tuple[str, Optional[str]]] = None
+# Reason: A weak reference, since a finished loop's id() can be reused by a new one
+_pool_loop: Optional["weakref.ref[asyncio.AbstractEventLoop]"] = None
+_pool_lock = threading.Lock()
+# Reason: The loop only holds weak references to tasks
+_closing: Set["asyncio.Task[None]"] = set()
+
+
+def _discard_pool(
+    pool: AsyncClientPool,
+    pool_loop: Optional[asyncio.AbstractEventLoop],
+    loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Close a replaced pool on the loop that owns its connections."""
+    if pool_loop is loop:
+        task = loop.create_task(pool.close())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    elif pool_loop is not None and pool_loop.is_running():
+        asyncio.run_coroutine_threadsafe(pool.close(), pool_loop)
+    else:
+        logger.warning(
+            "Dropping async LLM clients of a finished event loop without closing them"
+        )
+
+
+def get_async_pool() -> AsyncClientPool:
+    """
+    Return the shared async client pool for the running event loop.
+
+    Returns:
+        AsyncClientPool: Clients bound to the current loop.
+
+    Raises:
+        LLMUnavailable: If no API key is configured.
+    """
+    global _pool, _pool_key, _pool_loop
+    api_key = _api_key()
+    if not api_key:
+        raise LLMUnavailable("OpenAI API key not configured.")
+    key = (api_key, os.getenv("OPENAI_BASE_URL") or None)
+    loop = asyncio.get_running_loop()
+    with _pool_lock:
+        pool = _pool
+        if pool is not None and _pool_key == key and _pool_loop() is loop:
+            return pool
+        old_loop = _pool_loop() if _pool_loop is not None else None
+        _pool = AsyncClientPool(*key)
+        _pool_key = key
+        _pool_loop = weakref.ref(loop)
+        new_pool = _pool
+    if pool is not None:
+        _discard_pool(pool, old_loop, loop)
+    return new_pool
+
+
+async def aclose_client() -> None:
+    """Close and drop the async clients (call from the loop that uses them)."""
+    global _pool, _pool_key, _pool_loop
+    with _pool_lock:
+        pool, _pool = _pool, None
+        _pool_key = _pool_loop = None
+    if pool is not None:
+        await pool.close()
+
+
+async def _acreate(
+    client: openai.AsyncOpenAI,
+    messages: List[Dict[str, Any]],
+    model: Optional[str],
+    deadline: float,
+    params: Dict[str, Any],
+) -> Any:
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            response = await client.chat.completions.create(
+                model=model or DEFAULT_MODEL,
+                messages=messages,
+                timeout=_attempt_timeout(deadline),
+                **params,
+            )
+        except asyncio.CancelledError:
+            # Reason: Cancellation (client gone) says nothing about provider
+            # health, but a half-open probe must not stay claimed forever
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            await asyncio.sleep(_retry_delay(e, attempt, deadline))
+        else:
+            breaker.record_success()
+            return response
+
+
+def _remaining(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
+
+@asynccontextmanager
+async def _connection(deadline: float) -> AsyncIterator[openai.AsyncOpenAI]:
+    """Hold a connection, then pass the breaker."""
+    timeout = min(LLM_CONNECT_TIMEOUT, _remaining(deadline))
+    async with get_async_pool().connection(timeout) as client:
+        _admit()
+        yield client
+
+
+@asynccontextmanager
+async def _bulkhead_slot(name: Optional[str], timeout: float) -> AsyncIterator[None]:
+    if name is None:
+        yield
+        return
+    bulkhead = bulkheads.get_bulkhead(name)
+    try:
+        await bulkhead.aenter(timeout)
+    except bulkheads.BulkheadFull as e:
+        _count("shed")
+        raise LLMBulkheadFull(f"LLM unavailable: {e}") from e
+    try:
+        yield
+    finally:
+        bulkhead.leave()
+
+
+async def achat_completion(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    budget: Optional[float] = None,
+    bulkhead: Optional[str] = None,
+    **params: Any,
+) -> Any:
+    """
+    Async counterpart of `chat_completion`.
+
+    Raises:
+        LLMCircuitOpen: If the circuit breaker is open.
+        LLMBulkheadFull: If the bulkhead is saturated.
+        LLMUnavailable: If the LLM is not configured, every attempt failed, or
+            the budget ran out.
+    """
+    budget = budget if budget is not None else LLM_BUDGET_SECONDS
+    deadline = time.monotonic() + budget
+
+    async def call() -> Any:
+        async with _bulkhead_slot(bulkhead, _remaining(deadline)), _connection(
+            deadline
+        ) as client:
+            return await _acreate(client, messages, model, deadline, params)
+
+    try:
+        return await single_flight.ado(
+            _request_key(messages, model, params), call, timeout=budget
+        )
+    except SingleFlightTimeout as e:
+        _count("deadline_exceeded")
+        raise LLMUnavailable(f"LLM unavailable: {e}") from e
+
+
+async def acomplete_text(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    budget: Optional[float] = None,
+    bulkhead: Optional[str] = None,
+    **params: Any,
+) -> str:
+    """
+    Async counterpart of `complete_text`.
+
+    Raises:
+        LLMUnavailable: If the LLM is not configured, fails, or returns no text.
+    """
+    response = await achat_completion(
+        messages, model=model, budget=budget, bulkhead=bulkhead, **params
+    )
+    content = response.choices[0].message.content
+    if not content:
+        raise LLMUnavailable("LLM returned an empty reply.")
+    return content.strip()
+
+
+async def astream_text(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    budget: Optional[float] = None,
+    bulkhead: Optional[str] = None,
+    **params: Any,
+) -> AsyncIterator[str]:
+    """
+    Async counterpart of `stream_text`, yielding text deltas.
+
+    Raises:
+        LLMCircuitOpen: If the circuit breaker is open.
+        LLMBulkheadFull: If the bulkhead is saturated.
+        LLMUnavailable: If the stream cannot be opened or breaks midway.
+    """
+    budget = budget if budget is not None else LLM_BUDGET_SECONDS
+    deadline = time.monotonic() + budget
+    async with _bulkhead_slot(bulkhead, _remaining(deadline)), _connection(
+        deadline
+    ) as client:
+        stream = await _acreate(
+            client, messages, model, deadline, {**params, "stream": True}
+        )
+        _count("streams")
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except (openai.OpenAIError, httpx.HTTPError) as e:
+            raise _fail(f"stream interrupted: {e}") from e
+        finally:
+            await stream.close()
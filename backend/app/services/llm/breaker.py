@@ -0,0 +1,137 @@
+"""
+Circuit breaker shared by every LLM call in the process.
+
+- closed: calls go through; consecutive transient failures are counted.
+- open: after `failure_threshold` consecutive failures, calls are rejected
+  immediately for `reset_timeout` seconds so endpoints fall back to their mock
+  responses instead of waiting on a slow or failing provider.
+- half_open: after the timeout one probe call is let through; success closes
+  the breaker, failure opens it again.
+"""
+
+from typing import Any, Dict, Optional
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure circuit breaker.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker
+            (0 disables the breaker).
+        reset_timeout (float): Seconds to stay open before allowing a probe.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.trips = 0
+        self.short_circuits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def _current_state(self, now: float) -> str:
+        # Reason: Open -> half-open is time based, so it is derived on read
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def is_open(self) -> bool:
+        """Return True if calls would currently be rejected (no side effects)."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == OPEN or (state == HALF_OPEN and self._probe_in_flight)
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may proceed; in half-open state only one probe
+        is admitted at a time.
+
+        Returns:
+            bool: False if the call should short-circuit.
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuits += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            state = self._current_state(time.monotonic())
+            if state == HALF_OPEN or (
+                state == CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+                self.trips += 1
+
+    def release_probe(self) -> None:
+        """Give up an admitted call without a verdict (e.g. it was cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self) -> None:
+        """Close the breaker and clear counters."""
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+            self.trips = 0
+            self.short_circuits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return breaker state and counters for monitoring."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "trips": self.trips,
+                "short_circuits": self.short_circuits,
+                "open_for_seconds": (
+                    round(now - self._opened_at, 3) if state == OPEN else 0.0
+                ),
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+            }
@@ -0,0 +1,240 @@
+"""
+Per-endpoint-class bulkheads for outbound LLM calls.
+
+- Each class of AI endpoint (reflection, future_self, decision_support) gets
+  its own limit on concurrent LLM calls per worker process, plus a bounded
+  queue of callers waiting for a slot.
+- Callers that find the queue full, or wait longer than the queue timeout,
+  are rejected at once so the endpoint can serve its fallback response.
+- Because waiting is bounded too, an AI-heavy spike on a sync caller can only
+  hold max_concurrent + max_queue threads per class, leaving the rest of the
+  threadpool to auth and CRUD endpoints. The AI endpoints themselves are async
+  and hold no thread while they wait, so here the limits protect the provider
+  (rate limits) and the connection pool.
+
+Limits come from LLM_BULKHEAD_MAX_CONCURRENT, LLM_BULKHEAD_MAX_QUEUE and
+LLM_BULKHEAD_QUEUE_TIMEOUT_SECONDS, overridable per class as e.g.
+LLM_BULKHEAD_REFLECTION_MAX_CONCURRENT.
+
+Sync callers (threads) and async callers (coroutines) share the same slots;
+async callers wait with `aenter`, which never blocks the event loop. A freed
+slot is handed straight to the first async waiter, woken on its own loop.
+"""
+
+from contextlib import contextmanager
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, Optional
+import asyncio
+import os
+import threading
+import time
+
+LLM_BULKHEAD_MAX_CONCURRENT = int(os.getenv("LLM_BULKHEAD_MAX_CONCURRENT", "32"))
+LLM_BULKHEAD_MAX_QUEUE = int(os.getenv("LLM_BULKHEAD_MAX_QUEUE", "32"))
+LLM_BULKHEAD_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("LLM_BULKHEAD_QUEUE_TIMEOUT_SECONDS", "1")
+)
+
+
+class BulkheadFull(RuntimeError):
+    """Raised when a call is shed: queue full or queue timeout expired."""
+
+
+class _AsyncWaiter:
+    """A coroutine queued in `aenter`, woken from any thread by `leave`."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+        self.granted = False
+
+    def wake(self) -> bool:
+        """Hand this waiter a slot; False if its event loop is gone."""
+        try:
+            # Reason: Slots are released from threads and other event loops
+            self.loop.call_soon_threadsafe(self._resolve)
+        except RuntimeError:
+            return False
+        self.granted = True
+        return True
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class Bulkhead:
+    """
+    Counting semaphore with a bounded, time-limited wait queue.
+
+    Args:
+        name (str): Endpoint class, for stats and errors.
+        max_concurrent (int): Calls allowed at once (0 sheds every call).
+        max_queue (int): Callers allowed to wait for a slot.
+        queue_timeout (float): Seconds a caller may wait for a slot.
+    """
+
+    def __init__(
+        self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._async_waiters: Deque[_AsyncWaiter] = deque()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def enter(self, timeout: Optional[float] = None) -> None:
+        """
+        Take a slot, waiting in the queue if all slots are busy.
+
+        Args:
+            timeout (Optional[float]): Caller's own limit on queueing; the
+                shorter of this and `queue_timeout` applies.
+
+        Raises:
+            BulkheadFull: If the queue is full or the wait timed out.
+        """
+        with self._cond:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                self.admitted += 1
+                return
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFull(f"{self.name} bulkhead full")
+            wait = (
+                self.queue_timeout
+                if timeout is None
+                else min(self.queue_timeout, timeout)
+            )
+            deadline = time.monotonic() + wait
+            self.waiting += 1
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        raise BulkheadFull(f"{self.name} bulkhead queue timeout")
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.admitted += 1
+
+    async def aenter(self, timeout: Optional[float] = None) -> None:
+        """
+        Async counterpart of `enter` for coroutines.
+
+        Raises:
+            BulkheadFull: If the queue is full or the wait timed out.
+        """
+        with self._cond:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                self.admitted += 1
+                return
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFull(f"{self.name} bulkhead full")
+            waiter = _AsyncWaiter()
+            self._async_waiters.append(waiter)
+            self.waiting += 1
+        wait = (
+            self.queue_timeout if timeout is None else min(self.queue_timeout, timeout)
+        )
+        try:
+            await asyncio.wait((waiter.future,), timeout=wait)
+        except asyncio.CancelledError:
+            with self._cond:
+                self.waiting -= 1
+                if not waiter.granted:
+                    self._async_waiters.remove(waiter)
+            if waiter.granted:
+                self.leave()
+            raise
+        with self._cond:
+            self.waiting -= 1
+            # Reason: `granted` is set under the lock, before the loop sees it
+            if waiter.granted:
+                self.admitted += 1
+                return
+            self._async_waiters.remove(waiter)
+            self.timed_out += 1
+        raise BulkheadFull(f"{self.name} bulkhead queue timeout")
+
+    def leave(self) -> None:
+        """Give back a slot taken with `enter` or `aenter`."""
+        with self._cond:
+            if self.active <= self.max_concurrent:
+                while self._async_waiters:
+                    # Reason: Hand the slot over so no newcomer can take it first
+                    if self._async_waiters.popleft().wake():
+                        return
+            self.active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """Hold a slot (see `enter`) for the duration of the block."""
+        self.enter(timeout)
+        try:
+            yield
+        finally:
+            self.leave()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return occupancy and counters for monitoring."""
+        with self._cond:
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+            }
+
+
+_bulkheads: Dict[str, Bulkhead] = {}
+_registry_lock = threading.Lock()
+
+
+def _setting(name: str, key: str, default: str) -> str:
+    return os.getenv(f"LLM_BULKHEAD_{name.upper()}_{key}", default)
+
+
+def get_bulkhead(name: str) -> Bulkhead:
+    """Return the process-wide bulkhead for an endpoint class, creating it on first use."""
+    with _registry_lock:
+        bulkhead = _bulkheads.get(name)
+        if bulkhead is None:
+            bulkhead = _bulkheads[name] = Bulkhead(
+                name,
+                max_concurrent=int(
+                    _setting(name, "MAX_CONCURRENT", str(LLM_BULKHEAD_MAX_CONCURRENT))
+                ),
+                max_queue=int(_setting(name, "MAX_QUEUE", str(LLM_BULKHEAD_MAX_QUEUE))),
+                queue_timeout=float(
+                    _setting(
+                        name,
+                        "QUEUE_TIMEOUT_SECONDS",
+                        str(LLM_BULKHEAD_QUEUE_TIMEOUT_SECONDS),
+                    )
+                ),
+            )
+        return bulkhead
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Return stats of every bulkhead created so far."""
+    with _registry_lock:
+        bulkheads = list(_bulkheads.values())
+    return {b.name: b.stats() for b in bulkheads}
@@ -0,0 +1,416 @@
+"""
+Process-wide LLM gateway used by every AI endpoint.
+
+- One `openai.OpenAI` client per process, backed by a keep-alive httpx pool,
+  so requests reuse connections instead of paying a TLS handshake each time.
+- Explicit connect/read timeouts and bounded retries with full jitter.
+- Each call has a deadline budget covering all attempts and backoff, and a
+  shared circuit breaker short-circuits calls while the provider is failing,
+  so callers fall back quickly instead of tying up workers.
+- `OPENAI_BASE_URL` points the gateway at any OpenAI-compatible server (e.g. a
+  local stand-in for tests and benchmarks).
+- Identical non-streaming calls that are in flight at the same time (double
+  submits, several tabs) share one provider call (single-flight).
+- Calls made with a `bulkhead` name are limited per endpoint class and shed
+  with LLMBulkheadFull when that class is saturated (see bulkhead.py).
+- `async def` handlers use the asyncio counterparts (`acomplete_text` etc.,
+  see async_client.py), which share this module's breaker and counters.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+import httpx
+import openai
+
+from app.services.llm import bulkhead as bulkheads
+from app.services.llm.breaker import CircuitBreaker
+from app.services.llm.singleflight import SingleFlight, SingleFlightTimeout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-nano")
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "30"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "50"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+# Default per-call deadline; endpoints pass tighter budgets (see call sites)
+LLM_BUDGET_SECONDS = float(os.getenv("LLM_BUDGET_SECONDS", "30"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+LLM_SINGLE_FLIGHT = os.getenv("LLM_SINGLE_FLIGHT", "true").lower() in ("1", "true")
+
+# Reason: Only transient failures are retried; 4xx errors would fail again.
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class LLMUnavailable(RuntimeError):
+    """Raised when the LLM is not configured or a call fails after retries."""
+
+
+class LLMCircuitOpen(LLMUnavailable):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+
+class LLMBulkheadFull(LLMUnavailable):
+    """Raised without calling the provider when the caller's bulkhead is full."""
+
+
+_client: Optional[openai.OpenAI] = None
+_client_config: Optional[Tuple[str, Optional[str]]] = None
+_client_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "streams": 0,
+    "retries": 0,
+    "failures": 0,
+    "deadline_exceeded": 0,
+    "shed": 0,
+    # Async calls that found every pooled connection busy (see async_client)
+    "pool_timeouts": 0,
+}
+
+breaker = CircuitBreaker(
+    failure_threshold=LLM_BREAKER_FAILURES, reset_timeout=LLM_BREAKER_RESET_SECONDS
+)
+single_flight = SingleFlight(enabled=LLM_SINGLE_FLIGHT)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _api_key() -> Optional[str]:
+    return os.getenv("OPENAI_API_KEY") or None
+
+
+def is_configured() -> bool:
+    """Return True when an API key is available for LLM calls."""
+    return _api_key() is not None
+
+
+def is_available() -> bool:
+    """Return True when configured and the circuit breaker is not open."""
+    return is_configured() and not breaker.is_open()
+
+
+def _build_client(api_key: str, base_url: Optional[str]) -> openai.OpenAI:
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(
+            LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT, pool=LLM_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+        ),
+    )
+    # Reason: Retries are handled here so they can be counted and bounded centrally
+    return openai.OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        organization=os.getenv("OPENAI_ORG_ID") or None,
+        max_retries=0,
+        http_client=http_client,
+    )
+
+
+def get_client() -> openai.OpenAI:
+    """
+    Return the shared OpenAI client, building it on first use.
+
+    The client is rebuilt only if OPENAI_API_KEY or OPENAI_BASE_URL change.
+
+    Returns:
+        openai.OpenAI: Process-wide client.
+
+    Raises:
+        LLMUnavailable: If no API key is configured.
+    """
+    global _client, _client_config
+    api_key = _api_key()
+    if not api_key:
+        raise LLMUnavailable("OpenAI API key not configured.")
+    config = (api_key, os.getenv("OPENAI_BASE_URL") or None)
+    with _client_lock:
+        if _client is None or _client_config != config:
+            if _client is not None:
+                _client.close()
+            _client = _build_client(*config)
+            _client_config = config
+        return _client
+
+
+def reset_client() -> None:
+    """Close and drop the shared client (e.g. on shutdown)."""
+    global _client, _client_config
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _client_config = None
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _backoff(attempt: int) -> float:
+    # Reason: Full jitter spreads retries from concurrent callers apart
+    return random.uniform(0, LLM_RETRY_BACKOFF_SECONDS * (2**attempt))
+
+
+def _fail(message: str) -> LLMUnavailable:
+    _count("failures")
+    breaker.record_failure()
+    return LLMUnavailable(f"LLM unavailable: {message}")
+
+
+def _admit() -> None:
+    """Pass the circuit breaker and count the request."""
+    if not breaker.allow():
+        raise LLMCircuitOpen("LLM unavailable: circuit breaker open")
+    _count("requests")
+
+
+def _start(budget: Optional[float]) -> float:
+    """Pass the circuit breaker, count the request and return its deadline."""
+    _admit()
+    return time.monotonic() + (budget if budget is not None else LLM_BUDGET_SECONDS)
+
+
+def _attempt_timeout(deadline: float) -> httpx.Timeout:
+    remaining = deadline - time.monotonic()
+    # Reason: The read timeout shrinks with the budget left
+    return httpx.Timeout(
+        max(0.001, min(LLM_READ_TIMEOUT, remaining)),
+        connect=min(LLM_CONNECT_TIMEOUT, max(0.001, remaining)),
+    )
+
+
+def _retry_delay(error: Exception, attempt: int, deadline: float) -> float:
+    """
+    Handle a failed attempt: return the backoff before retrying, or raise.
+
+    Raises:
+        LLMUnavailable: If the error is not retryable, retries are exhausted
+            or the backoff would overrun the deadline.
+    """
+    if isinstance(error, RETRYABLE_ERRORS):
+        if attempt >= LLM_MAX_RETRIES:
+            raise _fail(str(error)) from error
+        delay = _backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            _count("deadline_exceeded")
+            raise _fail(f"deadline exceeded after {attempt + 1} attempt(s): {error}")
+        _count("retries")
+        logger.debug("LLM call failed (%s), retrying in %.2fs", error, delay)
+        return delay
+    if isinstance(error, openai.OpenAIError):
+        # Reason: Client errors (bad request, auth) mean the call is wrong,
+        # not that the provider is unhealthy, so the breaker ignores them
+        _count("failures")
+        breaker.record_success()
+        raise LLMUnavailable(f"LLM unavailable: {error}") from error
+    # Reason: Never leave a half-open probe unresolved
+    raise _fail(str(error)) from error
+
+
+def _create(
+    messages: List[Dict[str, Any]],
+    model: Optional[str],
+    budget: Optional[float],
+    params: Dict[str, Any],
+) -> Any:
+    client = get_client()
+    deadline = _start(budget)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            response = client.chat.completions.create(
+                model=model or DEFAULT_MODEL,
+                messages=messages,
+                timeout=_attempt_timeout(deadline),
+                **params,
+            )
+        except Exception as e:
+            time.sleep(_retry_delay(e, attempt, deadline))
+        else:
+            breaker.record_success()
+            return response
+
+
+@contextmanager
+def _bulkhead_slot(name: Optional[str], timeout: float) -> Iterator[None]:
+    if name is None:
+        yield
+        return
+    bulkhead = bulkheads.get_bulkhead(name)
+    try:
+        bulkhead.enter(timeout)
+    except bulkheads.BulkheadFull as e:
+        _count("shed")
+        raise LLMBulkheadFull(f"LLM unavailable: {e}") from e
+    try:
+        yield
+    finally:
+        bulkhead.leave()
+
+
+def _request_key(
+    messages: List[Dict[str, Any]], model: Optional[str], params: Dict[str, Any]
+) -> str:
+    # Reason: Whitespace-only differences (e.g. a trailing newline) share a call
+    normalized = [
+        {
+            **m,
+            "content": (
+                _WHITESPACE.sub(" ", m["content"]).strip()
+                if isinstance(m.get("content"), str)
+                else m.get("content")
+            ),
+        }
+        for m in messages
+    ]
+    payload = json.dumps(
+        [model or DEFAULT_MODEL, normalized, params], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chat_completion(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    budget: Optional[float] = None,
+    bulkhead: Optional[str] = None,
+    **params: Any,
+) -> Any:
+    """
+    Run a chat completion through the shared client with bounded retries.
+
+    A call identical to one already in flight waits for it and shares its
+    response instead of calling the provider again.
+
+    Args:
+        messages (List[Dict[str, Any]]): Chat messages.
+        model (Optional[str]): Model name; defaults to OPENAI_MODEL.
+        budget (Optional[float]): Seconds the whole call (all attempts and
+            backoff) may take; defaults to LLM_BUDGET_SECONDS.
+        bulkhead (Optional[str]): Endpoint class whose concurrency limit
+            applies; None for no limit.
+        **params: Extra parameters passed to `chat.completions.create`.
+
+    Returns:
+        ChatCompletion: The OpenAI response object.
+
+    Raises:
+        LLMCircuitOpen: If the circuit breaker is open.
+        LLMBulkheadFull: If the bulkhead is saturated.
+        LLMUnavailable: If the LLM is not configured, every attempt failed, or
+            the budget ran out (including while waiting for an identical
+            in-flight call).
+    """
+    budget = budget if budget is not None else LLM_BUDGET_SECONDS
+
+    def call() -> Any:
+        # Reason: Only the caller that actually hits the provider takes a slot
+        with _bulkhead_slot(bulkhead, budget):
+            return _create(messages, model, budget, params)
+
+    try:
+        return single_flight.do(
+            _request_key(messages, model, params), call, timeout=budget
+        )
+    except SingleFlightTimeout as e:
+        _count("deadline_exceeded")
+        raise LLMUnavailable(f"LLM unavailable: {e}") from e
+
+
+def stream_text(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    budget: Optional[float] = None,
+    bulkhead: Optional[str] = None,
+    **params: Any,
+) -> Iterator[str]:
+    """
+    Stream a chat completion, yielding text deltas as the provider sends them.
+
+    Opening the stream gets the same retries, budget and breaker handling as
+    `chat_completion`; the budget bounds the wait for the stream to start and
+    LLM_READ_TIMEOUT bounds each stall between chunks. Nothing is retried once
+    text has been yielded.
+
+    Args:
+        messages (List[Dict[str, Any]]): Chat messages.
+        model (Optional[str]): Model name; defaults to OPENAI_MODEL.
+        budget (Optional[float]): Seconds allowed until the stream opens.
+        bulkhead (Optional[str]): Endpoint class whose concurrency limit
+            applies; the slot is held until the stream ends.
+        **params: Extra parameters passed to `chat.completions.create`.
+
+    Yields:
+        str: Non-empty content deltas.
+
+    Raises:
+        LLMCircuitOpen: If the circuit breaker is open.
+        LLMBulkheadFull: If the bulkhead is saturated.
+        LLMUnavailable: If the stream cannot be opened or breaks midway.
+    """
+    budget = budget if budget is not None else LLM_BUDGET_SECONDS
+    with _bulkhead_slot(bulkhead, budget):
+        stream = _create(messages, model, budget, {**params, "stream": True})
+        _count("streams")
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except (openai.OpenAIError, httpx.HTTPError) as e:
+            raise _fail(f"stream interrupted: {e}") from e
+        finally:
+            stream.close()
+
+
+def complete_text(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    budget: Optional[float] = None,
+    bulkhead: Optional[str] = None,
+    **params: Any,
+) -> str:
+    """
+    Run a chat completion and return the stripped text of the first choice.
+
+    Raises:
+        LLMUnavailable: If the LLM is not configured, fails, or returns no text.
+    """
+    response = chat_completion(
+        messages, model=model, budget=budget, bulkhead=bulkhead, **params
+    )
+    content = response.choices[0].message.content
+    if not content:
+        raise LLMUnavailable("LLM returned an empty reply.")
+    return content.strip()
+
+
+def stats() -> Dict[str, Any]:
+    """Return gateway counters for monitoring."""
+    with _stats_lock:
+        snapshot: Dict[str, Any] = dict(_stats)
+    snapshot["configured"] = is_configured()
+    snapshot["breaker"] = breaker.stats()
+    snapshot["single_flight"] = single_flight.stats()
+    snapshot["bulkheads"] = bulkheads.stats()
+    snapshot["base_url"] = os.getenv("OPENAI_BASE_URL") or "default"
+    return snapshot
@@ -0,0 +1,162 @@
+"""
+Single-flight coalescing of identical in-flight LLM calls.
+
+- The first caller for a key runs the call; callers arriving with the same key
+  while it is in flight wait for it and share its result (or its error).
+- Nothing is cached: once the call finishes the key is released, so the next
+  request for the same input calls the provider again.
+- `do` coalesces threads and `ado` coroutines; asyncio futures are bound to
+  their event loop, so async calls are only shared within one loop.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiting caller whose own timeout expired first."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe registry of in-flight calls keyed by request.
+
+    Args:
+        enabled (bool): When False, every call runs on its own.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(
+        self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run `fn` unless a call for `key` is already in flight, then share it.
+
+        Args:
+            key (Hashable): Identity of the request.
+            fn (Callable[[], Any]): The call to run.
+            timeout (Optional[float]): Seconds a waiting caller waits for the
+                in-flight call (None waits indefinitely).
+
+        Returns:
+            Any: The result of `fn` (possibly from another caller's run).
+
+        Raises:
+            SingleFlightTimeout: If waiting for the in-flight call timed out.
+            Exception: Whatever `fn` raised, for the runner and all waiters.
+        """
+        if not self.enabled:
+            with self._lock:
+                self.executions += 1
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            if not call.done.wait(timeout):
+                raise SingleFlightTimeout("timed out waiting for in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Async counterpart of `do`: await `fn()` unless an identical call is
+        already in flight on this event loop, then share its outcome.
+
+        Raises:
+            SingleFlightTimeout: If waiting for the in-flight call timed out
+                (or the call was cancelled).
+            Exception: Whatever `fn` raised, for the runner and all waiters.
+        """
+        if not self.enabled:
+            with self._lock:
+                self.executions += 1
+            return await fn()
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._async_calls[loop_key] = loop.create_future()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            try:
+                # Reason: shield so one waiter timing out does not cancel the call
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                raise SingleFlightTimeout("timed out waiting for in-flight call")
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(SingleFlightTimeout("in-flight call was cancelled"))
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            # Reason: Mark the outcome retrieved so unshared errors are not logged
+            if future.done() and not future.cancelled():
+                future.exception()
+            with self._lock:
+                del self._async_calls[loop_key]
+
+    def reset(self) -> None:
+        """Clear counters (in-flight calls are left alone)."""
+        with self._lock:
+            self.executions = 0
+            self.coalesced = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing counters for monitoring."""
+        with self._lock:
+            calls = self.executions + self.coalesced
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalescing_ratio": round(self.coalesced / calls, 4) if calls else 0.0,
+            }
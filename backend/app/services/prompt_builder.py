@@ -0,0 +1,276 @@
+"""
+Token-budgeted prompt assembly for the AI endpoints.
+
+- Token counts use tiktoken when it is installed (and its encoding can be
+  loaded) and a ~4 characters per token estimate otherwise.
+- tiktoken counts are memoized per text in an LRU, so chat history and
+  journal fields that are resent on every call are only encoded once. The
+  estimate is cheaper than the cache lookup, so it is never cached.
+- Each endpoint has a prompt budget; chat history keeps the newest turns that
+  fit and entry fields are truncated fairly, so prompt size (and with it
+  latency and cost) stays bounded however much a user writes.
+- Tokens sent, calls and trims are recorded per endpoint for /admin/metrics.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import logging
+import os
+import threading
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+PROMPT_TOKEN_ENCODING = os.getenv("PROMPT_TOKEN_ENCODING", "cl100k_base")
+REFLECTION_PROMPT_TOKEN_BUDGET = int(os.getenv("REFLECTION_PROMPT_TOKEN_BUDGET", "800"))
+FUTURE_SELF_PROMPT_TOKEN_BUDGET = int(
+    os.getenv("FUTURE_SELF_PROMPT_TOKEN_BUDGET", "800")
+)
+DECISION_SUPPORT_PROMPT_TOKEN_BUDGET = int(
+    os.getenv("DECISION_SUPPORT_PROMPT_TOKEN_BUDGET", "2500")
+)
+# Reason: Per-message framing of the chat format (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+TRUNCATION_MARKER = " […]"
+
+ChatMessage = Dict[str, str]
+
+token_count_cache = TTLCache(
+    max_size=int(os.getenv("TOKEN_COUNT_CACHE_MAX_SIZE", "8192")),
+    ttl_seconds=float(os.getenv("TOKEN_COUNT_CACHE_TTL_SECONDS", "3600")),
+)
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_encoding_loaded = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    with _encoding_lock:
+        if not _encoding_loaded and tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding(PROMPT_TOKEN_ENCODING)
+            except Exception as e:
+                # Reason: The encoding file is fetched on first use; offline hosts estimate
+                logger.warning("tiktoken encoding unavailable, estimating: %s", e)
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """
+    Count the tokens of a text (tiktoken counts are memoized by content).
+
+    Args:
+        text (Optional[str]): Text to count.
+
+    Returns:
+        int: Token count (0 for empty text).
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        # Reason: Hashing the text and a locked LRU lookup cost more than this
+        return (len(text) + 3) // 4
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    cached = token_count_cache.get(key)
+    if cached is not None:
+        return cached
+    count = len(encoding.encode(text))
+    token_count_cache.set(key, count)
+    return count
+
+
+def message_tokens(message: ChatMessage) -> int:
+    """Count the tokens of one chat message including its framing."""
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """
+    Cut a text to at most `max_tokens` tokens, marking the cut.
+
+    Args:
+        text (str): Text to shorten.
+        max_tokens (int): Token limit for the result.
+
+    Returns:
+        str: `text` unchanged if it fits, else its head plus a marker.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    keep = max(0, max_tokens - count_tokens(TRUNCATION_MARKER))
+    encoding = _get_encoding()
+    if encoding is not None:
+        head = encoding.decode(encoding.encode(text)[:keep])
+    else:
+        head = text[: keep * 4]
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+class BuiltPrompt(NamedTuple):
+    messages: List[ChatMessage]
+    tokens: int
+    trimmed: bool
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _record(name: str, prompt: BuiltPrompt) -> BuiltPrompt:
+    with _stats_lock:
+        entry = _stats.setdefault(
+            name, {"calls": 0, "tokens": 0, "max_tokens": 0, "trimmed": 0}
+        )
+        entry["calls"] += 1
+        entry["tokens"] += prompt.tokens
+        entry["max_tokens"] = max(entry["max_tokens"], prompt.tokens)
+        entry["trimmed"] += int(prompt.trimmed)
+    logger.debug(
+        "%s prompt: %d tokens%s",
+        name,
+        prompt.tokens,
+        " (trimmed)" if prompt.trimmed else "",
+    )
+    return prompt
+
+
+def fit_history(
+    messages: Sequence[ChatMessage], budget: int
+) -> Tuple[List[ChatMessage], List[ChatMessage]]:
+    """
+    Split messages into (older, recent) where `recent` is the longest suffix
+    within `budget` tokens. The last message is always kept.
+
+    Args:
+        messages (Sequence[ChatMessage]): Chronological chat messages.
+        budget (int): Token budget for the recent window.
+
+    Returns:
+        Tuple[List[ChatMessage], List[ChatMessage]]: Messages outside and
+            inside the window, both in chronological order.
+    """
+    used = 0
+    start = len(messages)
+    while start > 0:
+        cost = message_tokens(messages[start - 1])
+        if start < len(messages) and used + cost > budget:
+            break
+        used += cost
+        start -= 1
+    return list(messages[:start]), list(messages[start:])
+
+
+def build_chat(name: str, messages: Sequence[ChatMessage], budget: int) -> BuiltPrompt:
+    """
+    Fit a chat prompt into a token budget.
+
+    Leading system messages are always kept; of the remaining turns the newest
+    that fit are kept. If the last turn alone is over budget it is truncated.
+
+    Args:
+        name (str): Endpoint name for the per-endpoint stats.
+        messages (Sequence[ChatMessage]): System messages followed by turns.
+        budget (int): Token budget for the whole prompt.
+
+    Returns:
+        BuiltPrompt: The messages to send and their token count.
+    """
+    split = 0
+    while split < len(messages) and messages[split]["role"] == "system":
+        split += 1
+    system, turns = list(messages[:split]), list(messages[split:])
+    remaining = budget - sum(message_tokens(m) for m in system)
+    older, recent = fit_history(turns, remaining)
+    trimmed = bool(older)
+    if recent:
+        overflow = sum(message_tokens(m) for m in recent) - remaining
+        if overflow > 0:
+            last = recent[-1]
+            limit = max(0, message_tokens(last) - overflow - MESSAGE_OVERHEAD_TOKENS)
+            recent[-1] = {**last, "content": truncate_text(last["content"], limit)}
+            trimmed = True
+    prompt = system + recent
+    return _record(
+        name, BuiltPrompt(prompt, sum(message_tokens(m) for m in prompt), trimmed)
+    )
+
+
+def _fair_shares(sizes: List[int], available: int) -> List[int]:
+    # Reason: Small fields stay whole; the budget left over is split evenly
+    # among the larger ones (water-filling)
+    shares = [0] * len(sizes)
+    left = max(0, available)
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for position, i in enumerate(order):
+        shares[i] = min(sizes[i], left // (len(sizes) - position))
+        left -= shares[i]
+    return shares
+
+
+def build_entry(
+    name: str,
+    system: str,
+    fields: Sequence[Tuple[str, Optional[str]]],
+    budget: int,
+) -> BuiltPrompt:
+    """
+    Build a system + user prompt from labeled fields within a token budget.
+
+    Empty fields are skipped; when the fields do not fit, the longest ones
+    are truncated until they do.
+
+    Args:
+        name (str): Endpoint name for the per-endpoint stats.
+        system (str): System message.
+        fields (Sequence[Tuple[str, Optional[str]]]): (label, value) pairs,
+            rendered as "Label: value" lines.
+        budget (int): Token budget for the whole prompt.
+
+    Returns:
+        BuiltPrompt: The messages to send and their token count.
+    """
+    present = [(label, value) for label, value in fields if value]
+    labels = [f"{label}: " for label, _ in present]
+    fixed = (
+        message_tokens({"content": system})
+        + MESSAGE_OVERHEAD_TOKENS
+        + sum(count_tokens(label) + 1 for label in labels)
+    )
+    sizes = [count_tokens(value) for _, value in present]
+    trimmed = fixed + sum(sizes) > budget
+    if trimmed:
+        shares = _fair_shares(sizes, budget - fixed)
+        values = [truncate_text(v, s) for (_, v), s in zip(present, shares)]
+    else:
+        values = [value for _, value in present]
+    user = "".join(f"{label}{value}\n" for label, value in zip(labels, values))
+    prompt = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+    return _record(
+        name, BuiltPrompt(prompt, sum(message_tokens(m) for m in prompt), trimmed)
+    )
+
+
+def stats() -> Dict[str, object]:
+    """Return per-endpoint prompt sizes and token count cache counters."""
+    with _stats_lock:
+        endpoints = {name: dict(entry) for name, entry in _stats.items()}
+    return {
+        "tokenizer": "tiktoken" if _get_encoding() is not None else "estimate",
+        "endpoints": endpoints,
+        "token_count_cache": token_count_cache.stats(),
+    }
@@ -0,0 +1,250 @@
+"""
+Reflection prompt generation with a per-entry cache.
+
+- Generated prompts are stored on the journal entry together with a hash of
+  the fields the prompt is built from, so re-opening an entry costs no LLM call.
+- Editing any of those fields makes the stored hash stale; the journal update
+  endpoint clears the cached prompts when that happens.
+- Optionally (REFLECTION_PRECOMPUTE with the background worker running),
+  prompts are generated by a background job right after an entry is created.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.decision import DecisionJournalEntry
+from app.models.tagging_job import TaggingJob
+from app.services import llm, prompt_builder
+from app.services.background_jobs import (
+    background_tagging_enabled,
+    enqueue_job,
+    register_job_handler,
+)
+from app.services.tag_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+REFLECTION_LLM_BUDGET_SECONDS = float(os.getenv("REFLECTION_LLM_BUDGET_SECONDS", "15"))
+REFLECTION_PRECOMPUTE = os.getenv("REFLECTION_PRECOMPUTE", "false").lower() in (
+    "1",
+    "true",
+)
+
+JOB_KIND_REFLECTION_PROMPTS = "reflection_prompts"
+# Endpoint class for the per-worker LLM concurrency limit
+LLM_BULKHEAD = "reflection"
+SYSTEM_PROMPT = "You are a decision coach. Generate 3 concise, thoughtful reflection questions for the user, based on the following decision journal entry."
+# Reason: Changing the prompt wording invalidates previously stored prompts
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+# Entry fields the prompt is built from
+PROMPT_FIELDS = ("title", "context", "anticipated_outcomes", "values", "domain")
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "precomputed": 0}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def prompt_content_hash(entry: DecisionJournalEntry) -> str:
+    """
+    Hash the normalized prompt fields of an entry plus the prompt version.
+
+    Args:
+        entry (DecisionJournalEntry): Journal entry.
+
+    Returns:
+        str: sha256 hex digest.
+    """
+    fields = [
+        (
+            [normalize_text(v) for v in getattr(entry, name)]
+            if name == "values" and getattr(entry, name)
+            else normalize_text(getattr(entry, name))
+        )
+        for name in PROMPT_FIELDS
+    ]
+    payload = json.dumps([PROMPT_VERSION, fields], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fallback_prompts(entry: DecisionJournalEntry) -> List[str]:
+    """Static prompts used when the LLM is unavailable."""
+    return [
+        f"Reflect on your decision: '{entry.title}'.",
+        "What was your main motivation?",
+        "What would you do differently next time?",
+    ]
+
+
+def _clean_prompt(line: str) -> str:
+    # Remove leading numbers, dashes, bullets, whitespace
+    return re.sub(r"^(\s*[-•\d]+[\.)]?\s*)", "", line).strip()
+
+
+def _prompt_messages(entry: DecisionJournalEntry) -> List[Dict[str, str]]:
+    return prompt_builder.build_entry(
+        "reflection",
+        SYSTEM_PROMPT,
+        [
+            ("Title", entry.title),
+            ("Context", entry.context),
+            ("Anticipated Outcomes", entry.anticipated_outcomes),
+            ("Values", ", ".join(entry.values) if entry.values else None),
+            ("Domain", entry.domain),
+        ],
+        prompt_builder.REFLECTION_PROMPT_TOKEN_BUDGET,
+    ).messages
+
+
+def _llm_params(bulkhead: Optional[str]) -> Dict[str, object]:
+    return {
+        "budget": REFLECTION_LLM_BUDGET_SECONDS,
+        "bulkhead": bulkhead,
+        "max_tokens": 256,
+        "n": 1,
+        "temperature": 0.7,
+    }
+
+
+def _parse_prompts(ai_output: str) -> List[str]:
+    # Reason: Expect model to return numbered or bulleted questions
+    prompts = [_clean_prompt(q) for q in ai_output.split("\n") if _clean_prompt(q)][:3]
+    if len(prompts) < 2:
+        raise ValueError("OpenAI did not return enough prompts")
+    return prompts
+
+
+def generate_prompts(
+    entry: DecisionJournalEntry, bulkhead: Optional[str] = None
+) -> List[str]:
+    """
+    Ask the LLM for reflection questions about an entry.
+
+    Args:
+        entry (DecisionJournalEntry): Journal entry.
+        bulkhead (Optional[str]): LLM concurrency class (request path only).
+
+    Returns:
+        List[str]: Two or three prompts.
+
+    Raises:
+        llm.LLMUnavailable: If the LLM is unavailable or fails.
+        ValueError: If the reply does not contain enough prompts.
+    """
+    return _parse_prompts(
+        llm.complete_text(_prompt_messages(entry), **_llm_params(bulkhead))
+    )
+
+
+async def agenerate_prompts(
+    entry: DecisionJournalEntry, bulkhead: Optional[str] = None
+) -> List[str]:
+    """
+    Async counterpart of `generate_prompts` for `async def` handlers.
+
+    Raises:
+        llm.LLMUnavailable: If the LLM is unavailable or fails.
+        ValueError: If the reply does not contain enough prompts.
+    """
+    return _parse_prompts(
+        await llm.acomplete_text(_prompt_messages(entry), **_llm_params(bulkhead))
+    )
+
+
+def store_prompts(entry: DecisionJournalEntry, prompts: Optional[List[str]]) -> None:
+    """Store (or with None, clear) an entry's cached prompts."""
+    entry.reflection_prompts = prompts
+    entry.reflection_prompts_hash = prompt_content_hash(entry) if prompts else None
+
+
+def cached_prompts(entry: DecisionJournalEntry) -> Optional[List[str]]:
+    """Return the entry's stored prompts if they match its current content."""
+    if entry.reflection_prompts and entry.reflection_prompts_hash == (
+        prompt_content_hash(entry)
+    ):
+        return list(entry.reflection_prompts)
+    return None
+
+
+async def get_or_generate_prompts(
+    db: AsyncSession, entry: DecisionJournalEntry
+) -> Tuple[List[str], bool]:
+    """
+    Return stored prompts for an entry, generating and storing them on a miss.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session; its transaction is ended
+            before the LLM call and the prompts are stored in a new one.
+        entry (DecisionJournalEntry): Journal entry owned by the caller.
+
+    Returns:
+        Tuple[List[str], bool]: (prompts, from_llm). Fallback prompts are
+            returned with from_llm False and are not stored.
+    """
+    prompts = cached_prompts(entry)
+    if prompts is not None:
+        _count("hits")
+        return prompts, True
+    _count("misses")
+    if not llm.is_available():
+        return fallback_prompts(entry), False
+    # Reason: Don't hold a pooled DB connection for the whole completion
+    await db.commit()
+    try:
+        prompts = await agenerate_prompts(entry, bulkhead=LLM_BULKHEAD)
+    except Exception as e:
+        logger.warning("OpenAI reflection prompt generation failed: %s", e)
+        return fallback_prompts(entry), False
+    store_prompts(entry, prompts)
+    await db.commit()
+    return prompts, True
+
+
+def precompute_enabled() -> bool:
+    """Return True when new entries should get prompts from the job worker."""
+    return REFLECTION_PRECOMPUTE and background_tagging_enabled()
+
+
+def enqueue_precompute(db: Session, entry: DecisionJournalEntry) -> bool:
+    """
+    Queue prompt precomputation for an entry (committed with the caller's
+    transaction) if enabled.
+
+    Returns:
+        bool: True if a job was queued.
+    """
+    if not precompute_enabled() or not llm.is_configured():
+        return False
+    enqueue_job(db, entry.id, kind=JOB_KIND_REFLECTION_PROMPTS)
+    return True
+
+
+def run_precompute_job(db: Session, job: TaggingJob) -> None:
+    """Generate and store prompts for the job's entry unless already current."""
+    entry = db.get(DecisionJournalEntry, job.entry_id)
+    if entry is None or cached_prompts(entry) is not None:
+        return
+    store_prompts(entry, generate_prompts(entry))
+    _count("precomputed")
+
+
+register_job_handler(JOB_KIND_REFLECTION_PROMPTS, run_precompute_job)
+
+
+def stats() -> Dict[str, object]:
+    """Return prompt cache counters for monitoring."""
+    with _stats_lock:
+        snapshot: Dict[str, object] = dict(_stats)
+    snapshot["precompute_enabled"] = precompute_enabled()
+    return snapshot
@@ -0,0 +1,252 @@
+"""
+Content-addressed cache for auto-tagging results.
+
+- Key: sha256 of normalized title+context, model name and taxonomy version, so
+  identical text is only sent to the LLM once per model/taxonomy.
+- Two tiers: an in-process LRU in front of the persistent `tag_cache` table.
+- The table is bounded by age and row count; eviction runs opportunistically
+  every TAG_CACHE_EVICT_EVERY inserts.
+- Cache writes use their own session/transaction so a failed or racing cache
+  write never affects the journal write that triggered it.
+- Database hits are counted in memory and written, together with
+  `last_used_at`, at most once per TOUCH_INTERVAL per row, so reads stay reads.
+"""
+
+from typing import Any, Dict, Optional
+import datetime
+import hashlib
+import logging
+import os
+import re
+import threading
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.tag_cache import TagCacheEntry
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+TAG_CACHE_ENABLED = os.getenv("TAG_CACHE_ENABLED", "true").lower() in ("1", "true")
+TAG_CACHE_MEMORY_SIZE = int(os.getenv("TAG_CACHE_MEMORY_SIZE", "2048"))
+TAG_CACHE_MEMORY_TTL_SECONDS = float(os.getenv("TAG_CACHE_MEMORY_TTL_SECONDS", "3600"))
+TAG_CACHE_MAX_AGE_DAYS = int(os.getenv("TAG_CACHE_MAX_AGE_DAYS", "90"))
+TAG_CACHE_MAX_ROWS = int(os.getenv("TAG_CACHE_MAX_ROWS", "50000"))
+TAG_CACHE_EVICT_EVERY = int(os.getenv("TAG_CACHE_EVICT_EVERY", "500"))
+# Reason: Refreshing last_used_at on every hit would turn reads into writes
+TOUCH_INTERVAL = datetime.timedelta(hours=24)
+
+TAG_FIELDS = ("domain_tags", "sentiment_tag", "keywords")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so trivially different text shares a key."""
+    return _WHITESPACE.sub(" ", (text or "").strip()).lower()
+
+
+def content_key(
+    title: Optional[str], context: Optional[str], model: str, taxonomy_version: str
+) -> str:
+    """
+    Build the cache key for an entry's text under a model and taxonomy.
+
+    Args:
+        title (Optional[str]): Entry title.
+        context (Optional[str]): Entry context.
+        model (str): LLM model name.
+        taxonomy_version (str): Version of the tagging schema.
+
+    Returns:
+        str: sha256 hex digest.
+    """
+    payload = "\x1f".join(
+        (normalize_text(title), normalize_text(context), model, taxonomy_version)
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TagCache:
+    """
+    Two-tier (memory LRU + database) cache of tagging results.
+
+    Args:
+        memory (TTLCache): In-process LRU tier.
+        max_age_days (int): Rows unused for longer than this are evicted.
+        max_rows (int): Upper bound on rows kept in the table.
+        evict_every (int): Run eviction after this many inserts (0 disables).
+        enabled (bool): When False, every lookup misses and nothing is stored.
+    """
+
+    def __init__(
+        self,
+        memory: TTLCache,
+        max_age_days: int,
+        max_rows: int,
+        evict_every: int,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.memory = memory
+        self.max_age_days = max_age_days
+        self.max_rows = max_rows
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._inserts_since_evict = 0
+        self._pending_hits: Dict[str, int] = {}
+        self.db_hits = 0
+        self.db_misses = 0
+        self.evicted_rows = 0
+
+    def _count(self, attr: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + amount)
+
+    def get(self, db: Optional[Session], key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached tags, checking memory first and then the database.
+
+        Args:
+            db (Optional[Session]): Caller's session (only its bind is used).
+            key (str): Cache key from `content_key`.
+
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the cached tags, or None.
+        """
+        if not self.enabled:
+            return None
+        tags = self.memory.get(key)
+        if tags is not None:
+            return dict(tags)
+        if db is None:
+            return None
+        try:
+            with Session(bind=db.get_bind()) as cache_db:
+                row = cache_db.get(TagCacheEntry, key)
+                if row is None:
+                    self._count("db_misses")
+                    return None
+                tags = {field: getattr(row, field) for field in TAG_FIELDS}
+                now = datetime.datetime.utcnow()
+                with self._lock:
+                    pending = self._pending_hits.pop(key, 0) + 1
+                    touch = (
+                        row.last_used_at is None
+                        or now - row.last_used_at > TOUCH_INTERVAL
+                    )
+                    if not touch:
+                        self._pending_hits[key] = pending
+                if touch:
+                    row.hits = (row.hits or 0) + pending
+                    row.last_used_at = now
+                    cache_db.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Tag cache read failed: %s", e)
+            return None
+        self._count("db_hits")
+        self.memory.set(key, tags)
+        return dict(tags)
+
+    def put(
+        self,
+        db: Optional[Session],
+        key: str,
+        tags: Dict[str, Any],
+        model: str,
+        taxonomy_version: str,
+    ) -> None:
+        """
+        Store tags in both tiers. Database errors (e.g. a concurrent insert of
+        the same key) are logged and ignored.
+        """
+        if not self.enabled:
+            return
+        value = {field: tags[field] for field in TAG_FIELDS}
+        self.memory.set(key, value)
+        if db is None:
+            return
+        now = datetime.datetime.utcnow()
+        try:
+            with Session(bind=db.get_bind()) as cache_db:
+                cache_db.merge(
+                    TagCacheEntry(
+                        key=key,
+                        model=model,
+                        taxonomy_version=taxonomy_version,
+                        hits=0,
+                        created_at=now,
+                        last_used_at=now,
+                        **value,
+                    )
+                )
+                cache_db.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Tag cache write failed: %s", e)
+            return
+        with self._lock:
+            self._inserts_since_evict += 1
+            due = self.evict_every > 0 and self._inserts_since_evict >= self.evict_every
+            if due:
+                self._inserts_since_evict = 0
+        if due:
+            self.evict(db)
+
+    def evict(self, db: Session) -> int:
+        """
+        Delete rows older than `max_age_days`, then the least recently used rows
+        beyond `max_rows`.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=self.max_age_days)
+        deleted = 0
+        try:
+            with Session(bind=db.get_bind()) as cache_db:
+                deleted += cache_db.execute(
+                    delete(TagCacheEntry).where(TagCacheEntry.last_used_at < cutoff)
+                ).rowcount
+                total = cache_db.scalar(select(func.count()).select_from(TagCacheEntry))
+                if total > self.max_rows:
+                    stale_keys = (
+                        select(TagCacheEntry.key)
+                        .order_by(TagCacheEntry.last_used_at.asc())
+                        .limit(total - self.max_rows)
+                    )
+                    deleted += cache_db.execute(
+                        delete(TagCacheEntry).where(
+                            TagCacheEntry.key.in_(stale_keys.scalar_subquery())
+                        )
+                    ).rowcount
+                cache_db.commit()
+        except SQLAlchemyError as e:
+            logger.warning("Tag cache eviction failed: %s", e)
+            return 0
+        self._count("evicted_rows", deleted)
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for both tiers for monitoring."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "memory": self.memory.stats(),
+                "db_hits": self.db_hits,
+                "db_misses": self.db_misses,
+                "evicted_rows": self.evicted_rows,
+                "max_rows": self.max_rows,
+                "max_age_days": self.max_age_days,
+            }
+
+
+tag_cache = TagCache(
+    memory=TTLCache(
+        max_size=TAG_CACHE_MEMORY_SIZE, ttl_seconds=TAG_CACHE_MEMORY_TTL_SECONDS
+    ),
+    max_age_days=TAG_CACHE_MAX_AGE_DAYS,
+    max_rows=TAG_CACHE_MAX_ROWS,
+    evict_every=TAG_CACHE_EVICT_EVERY,
+    enabled=TAG_CACHE_ENABLED,
+)
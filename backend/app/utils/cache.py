@@ -0,0 +1,92 @@
+"""
+In-process TTL + LRU cache used for hot lookups (e.g. principal resolution).
+
+- Entries expire after a fixed time-to-live.
+- When full, the least recently used entry is evicted.
+- Thread-safe: sync endpoints run in a threadpool and share one instance per process.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after `ttl_seconds`.
+
+    A `ttl_seconds` or `max_size` of 0 disables caching (every lookup is a miss).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None if missing/expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entry if full.
+        """
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop `key` from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the cache counters for monitoring.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,57 @@
+"""
+Opaque keyset (cursor) pagination helpers.
+
+- A cursor encodes the (created_at, id) of the last row on a page.
+- The next page seeks past that position via the composite index, so the cost
+  of a page does not grow with how far the client has scrolled.
+"""
+
+from typing import Tuple
+import base64
+import binascii
+import datetime
+import json
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+def encode_cursor(created_at: datetime.datetime, row_id: str) -> str:
+    """
+    Encode a row position as an opaque, URL-safe cursor.
+
+    Args:
+        created_at (datetime.datetime): Sort timestamp of the row.
+        row_id (str): Primary key of the row (tie-breaker for equal timestamps).
+
+    Returns:
+        str: URL-safe base64 cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, str]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Opaque cursor from a previous response.
+
+    Returns:
+        Tuple[datetime.datetime, str]: (created_at, row_id)
+
+    Raises:
+        HTTPException: 422 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor",
+        )
@@ -0,0 +1,41 @@
+"""
+Server-Sent Events helpers for streaming endpoints.
+
+- Each event carries a JSON payload, so text containing newlines is safe.
+- Headers disable proxy buffering so events reach the client as they are sent.
+"""
+
+from typing import Any, AsyncIterable, Iterable, Optional, Union
+import json
+
+from fastapi.responses import StreamingResponse
+
+SSE_MEDIA_TYPE = "text/event-stream"
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Reason: nginx/Azure front doors otherwise buffer the whole response
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """
+    Format one SSE event.
+
+    Args:
+        data (Any): JSON-serializable payload.
+        event (Optional[str]): Event name; omitted for the default "message".
+
+    Returns:
+        str: The event, terminated by a blank line.
+    """
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_response(
+    events: Union[Iterable[str], AsyncIterable[str]],
+) -> StreamingResponse:
+    """Wrap a (sync or async) iterable of formatted events in an SSE response."""
+    return StreamingResponse(events, media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
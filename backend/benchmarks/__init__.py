@@ -0,0 +1 @@
+# benchmarks/__init__.py for standalone performance scripts (not collected by pytest)
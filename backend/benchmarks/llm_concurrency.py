@@ -0,0 +1,280 @@
+"""
+Concurrent LLM request capacity of one worker: sync gateway on a threadpool vs async gateway.
+
+Usage (from backend/):
+    python -m benchmarks.llm_concurrency --requests 400 --delay 0.5 --threads 40
+    python -m benchmarks.llm_concurrency --database-url postgresql://...
+
+All requests arrive at once; latency is measured from that moment.
+
+A local stand-in for an OpenAI-compatible provider answers every chat
+completion after --delay seconds, so the numbers measure how many calls one
+worker keeps in flight, not provider speed. The sync mode runs
+`llm.complete_text` on --threads threads (Starlette's default threadpool for
+`def` handlers is 40); the async mode awaits `llm.acomplete_text` for all
+requests on one event loop. --connections sets LLM_MAX_CONNECTIONS, the
+client pool size, which caps every mode.
+
+The endpoint mode sends the same load through the real
+`POST /api/v1/decision-support/chat` handler (auth, server-side history and
+stored reply, one chat session per request) in-process over ASGI, so it also
+counts any async DB pool waits the handlers cause. It uses a throwaway SQLite
+database unless --database-url is given; use the production database type to
+see pool limits (SQLite uses no async pool).
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StandInProvider:
+    """
+    Minimal HTTP/1.1 keep-alive server answering chat completions after a delay.
+
+    Runs in its own process so it does not compete with the gateway for the GIL.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.port = None
+        self._peak = multiprocessing.Value("i", 0)
+        self._process = None
+
+    @property
+    def peak(self) -> int:
+        return self._peak.value
+
+    def start(self) -> None:
+        ports = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=self._run, args=(ports,), daemon=True
+        )
+        self._process.start()
+        self.port = ports.get()
+
+    def stop(self) -> None:
+        self._process.terminate()
+
+    def reset_peak(self) -> None:
+        self._peak.value = 0
+
+    def _run(self, ports) -> None:
+        async def serve() -> None:
+            server = await asyncio.start_server(
+                self._serve, "127.0.0.1", 0, backlog=2048
+            )
+            ports.put(server.sockets[0].getsockname()[1])
+            await server.serve_forever()
+
+        asyncio.run(serve())
+
+    async def _serve(self, reader, writer) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode("latin-1").split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = json.loads(await reader.readexactly(length))
+                self.in_flight += 1
+                self._peak.value = max(self._peak.value, self.in_flight)
+                await asyncio.sleep(self.delay)
+                self.in_flight -= 1
+                payload = json.dumps(
+                    {
+                        "id": "chatcmpl-bench",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": body.get("model", "bench"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "finish_reason": "stop",
+                                "message": {"role": "assistant", "content": "ok"},
+                            }
+                        ],
+                    }
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    + f"content-length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def summarize(label: str, latencies, errors: int, elapsed: float, peak: int) -> None:
+    done = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{label:>6}: {done / elapsed:7.1f} req/s  peak in-flight={peak:4d}  "
+        f"p50={statistics.median(latencies):6.2f}s  p95={p95:6.2f}s  "
+        f"wall={elapsed:6.2f}s  errors={errors}"
+    )
+
+
+def messages(i: int):
+    # Reason: Distinct prompts, so single-flight does not coalesce them
+    return [{"role": "user", "content": f"benchmark request {i}"}]
+
+
+def run_sync(llm, requests: int, threads: int):
+    latencies, errors = [], 0
+
+    def call(i: int, submitted: float):
+        llm.complete_text(messages(i), max_tokens=8)
+        return time.perf_counter() - submitted
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # Reason: Latency includes the wait for a free thread, as a client sees it
+        futures = [pool.submit(call, i, start) for i in range(requests)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run_async(llm, requests: int):
+    async def call(i: int):
+        start = time.perf_counter()
+        await llm.acomplete_text(messages(i), max_tokens=8)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(call(i) for i in range(requests)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    await llm.aclose_client()
+    latencies = [r for r in results if not isinstance(r, BaseException)]
+    return latencies, len(results) - len(latencies), elapsed
+
+
+def seed_chat_sessions(requests: int):
+    """Create a user with one chat session per request; return (token, ids)."""
+    from app.core.security import create_access_token
+    from app.db.session import SessionLocal, engine
+    from app.models.decision import DecisionChatSession
+    from app.models.user import Base, User
+
+    Base.metadata.create_all(bind=engine)
+    user_id = str(uuid.uuid4())
+    user = User(
+        id=user_id,
+        email=f"bench_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+    )
+    ids = [str(uuid.uuid4()) for _ in range(requests)]
+    with SessionLocal() as db:
+        db.add(user)
+        db.add_all(
+            DecisionChatSession(id=session_id, user_id=user_id, title="Benchmark")
+            for session_id in ids
+        )
+        db.commit()
+    return create_access_token({"sub": user_id}), ids
+
+
+async def run_endpoint(llm, requests: int):
+    import httpx
+    from app.main import app
+
+    token, session_ids = seed_chat_sessions(requests)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def call(client, i: int):
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/v1/decision-support/chat",
+            json={"session_id": session_ids[i], "message": f"benchmark request {i}"},
+            headers=headers,
+        )
+        # Reason: The handler answers 200 with a canned reply when the LLM call fails
+        if response.status_code != 200 or response.json()["message_id"] is None:
+            raise RuntimeError(f"request {i} failed or fell back")
+        return time.perf_counter() - start
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(call(client, i) for i in range(requests)), return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+    await llm.aclose_client()
+    latencies = [r for r in results if not isinstance(r, BaseException)]
+    return latencies, len(results) - len(latencies), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--delay", type=float, default=0.5, help="provider latency")
+    parser.add_argument("--threads", type=int, default=40, help="sync threadpool")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument(
+        "--database-url", help="database for the endpoint mode (default: temp SQLite)"
+    )
+    args = parser.parse_args()
+
+    provider = StandInProvider(args.delay)
+    provider.start()
+    # Reason: The gateway reads its settings at import time
+    os.environ.update(
+        OPENAI_API_KEY="bench-key",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{provider.port}/v1",
+        LLM_MAX_CONNECTIONS=str(args.connections),
+        LLM_MAX_KEEPALIVE=str(args.connections),
+        LLM_MAX_RETRIES="0",
+        DATABASE_URL=args.database_url
+        or f"sqlite:///{tempfile.mkdtemp()}/llm_concurrency.db",
+        # Reason: Every request carries its own prompt; the default limits would shed
+        LLM_BULKHEAD_MAX_CONCURRENT=str(args.requests),
+    )
+    from app.services import llm
+
+    print(
+        f"{args.requests} requests, {args.delay}s provider latency, "
+        f"{args.threads} sync threads, {args.connections} connections"
+    )
+    latencies, errors, elapsed = run_sync(llm, args.requests, args.threads)
+    summarize("sync", latencies, errors, elapsed, provider.peak)
+    llm.reset_client()
+    provider.reset_peak()
+    latencies, errors, elapsed = asyncio.run(run_async(llm, args.requests))
+    summarize("async", latencies, errors, elapsed, provider.peak)
+    provider.reset_peak()
+    latencies, errors, elapsed = asyncio.run(run_endpoint(llm, args.requests))
+    summarize("endpt", latencies, errors, elapsed, provider.peak)
+    from app.db.session import pool_status
+
+    db_pool = pool_status()["async"]
+    print(
+        f"{'':>6}  async DB pool {db_pool['pool_class']}: "
+        f"wait max={db_pool['wait_ms_max']:.0f}ms  timeouts={db_pool['timeouts']}"
+    )
+    provider.stop()
+
+
+if __name__ == "__main__":
+    main()
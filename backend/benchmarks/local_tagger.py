@@ -0,0 +1,68 @@
+"""
+Single-core throughput of the local (lexicon) tagger.
+
+Usage (from backend/):
+    python -m benchmarks.local_tagger --entries 20000 --min-rate 2000
+
+Entries are built from a mix of realistic journal sentences so the regex sees
+keyword, sentiment and negation matches. Exits non-zero if the measured rate
+is below --min-rate.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from app.services.auto_tagger import AutoTagger
+
+SENTENCES = (
+    "My boss offered me a promotion but it means moving away from my family.",
+    "I am worried about the mortgage and our monthly expenses.",
+    "Started going to the gym again and my sleep is much better.",
+    "Had a difficult conversation with my partner about money.",
+    "Not sure whether to invest my savings or pay off the loan first.",
+    "The project deadline is stressful and my colleagues are exhausted.",
+    "Reading more books has kept me motivated and grateful.",
+    "Nothing special happened today.",
+)
+
+
+def make_entries(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        (
+            f"Entry {i}",
+            " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 8))),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries, args.seed)
+    confident = 0
+    start = time.perf_counter()
+    for title, context in entries:
+        if AutoTagger.analyze(title, context).confidence >= 0.8:
+            confident += 1
+    elapsed = time.perf_counter() - start
+    rate = len(entries) / elapsed
+    chars = sum(len(t) + len(c) for t, c in entries) / len(entries)
+    print(
+        f"{len(entries)} entries (avg {chars:.0f} chars) in {elapsed:.3f}s: "
+        f"{rate:,.0f} entries/s, {confident / len(entries):.0%} above 0.8 confidence"
+    )
+    if rate < args.min_rate:
+        print(f"FAIL: below --min-rate {args.min_rate:,.0f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
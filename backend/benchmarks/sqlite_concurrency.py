@@ -0,0 +1,119 @@
+"""
+Concurrent read/write throughput on SQLite: default rollback journal vs performance mode.
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 2 --seconds 5
+
+Readers run the journal list query; writers insert + commit journal entries,
+mirroring the write endpoints. Each mode uses a fresh database file. Read
+throughput also depends on table size, so compare runs with similar write counts.
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.sqlite_tuning import install_sqlite_pragmas
+from app.models.user import Base, User
+from app.models.decision import DecisionJournalEntry
+
+
+def make_entry(user_id: str) -> DecisionJournalEntry:
+    now = datetime.datetime.utcnow()
+    return DecisionJournalEntry(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        title="Benchmark entry",
+        context="Concurrent write throughput",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def run_mode(
+    performance_mode: bool, readers: int, writers: int, seconds: float, seed: int
+):
+    os.environ["SQLITE_PERFORMANCE_MODE"] = "true" if performance_mode else "false"
+    tmpdir = tempfile.mkdtemp(prefix="phronesis-bench-")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+        connect_args={"check_same_thread": False},
+        pool_size=readers + writers,
+    )
+    install_sqlite_pragmas(engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    user_id = str(uuid.uuid4())
+    with Session() as db:
+        db.add(User(id=user_id, email=f"{user_id}@bench.local", hashed_password="x"))
+        db.add_all(make_entry(user_id) for _ in range(seed))
+        db.commit()
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        done = 0
+        with Session() as db:
+            while time.perf_counter() < deadline:
+                db.execute(
+                    select(DecisionJournalEntry)
+                    .where(DecisionJournalEntry.user_id == user_id)
+                    .order_by(DecisionJournalEntry.created_at.desc())
+                    .limit(50)
+                ).all()
+                db.rollback()
+                done += 1
+        with lock:
+            counts["reads"] += done
+
+    def writer():
+        done = errors = 0
+        with Session() as db:
+            while time.perf_counter() < deadline:
+                db.add(make_entry(user_id))
+                try:
+                    db.commit()
+                    done += 1
+                except Exception:
+                    db.rollback()
+                    errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    return {k: v / seconds if k != "errors" else v for k, v in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=200, help="pre-existing entries")
+    args = parser.parse_args()
+    for label, mode in (("default journal", False), ("performance mode", True)):
+        result = run_mode(mode, args.readers, args.writers, args.seconds, args.seed)
+        print(
+            f"{label:>16}: {result['reads']:8.0f} reads/s "
+            f"{result['writes']:8.0f} writes/s  errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
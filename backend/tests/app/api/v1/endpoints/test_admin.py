@@ -0,0 +1,66 @@
+import uuid
+from app.models.decision import DecisionJournalEntry
+
+
+def test_backfill_tags_expected(fake_llm, client, db_session, monkeypatch):
+    monkeypatch.setenv("MIGRATE_SECRET", "s3cret")
+    entry = DecisionJournalEntry(
+        id=str(uuid.uuid4()),
+        user_id=str(uuid.uuid4()),
+        title="Job offer",
+        context=f"Imported entry {uuid.uuid4().hex}",
+    )
+    db_session.add(entry)
+    db_session.commit()
+    resp = client.post(
+        "/api/v1/admin/tags/backfill?limit=1000",
+        headers={"x-migrate-secret": "s3cret"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["processed"] >= 1
+    assert resp.json()["next_cursor"] is None
+    db_session.refresh(entry)
+    assert entry.domain_tags == fake_llm.function_arguments["domain_tags"]
+    assert entry.tagging_status == "done"
+
+
+def test_backfill_tags_failure_cursor_moves_past_failing_entries(
+    fake_llm, client, db_session, monkeypatch
+):
+    monkeypatch.setenv("MIGRATE_SECRET", "s3cret")
+    fake_llm.fail(400, times=10**6)
+    entry = DecisionJournalEntry(
+        id=str(uuid.uuid4()),
+        user_id=str(uuid.uuid4()),
+        title="Job offer",
+        context=f"Never taggable {uuid.uuid4().hex}",
+    )
+    db_session.add(entry)
+    db_session.commit()
+    candidates = client.post(
+        "/api/v1/admin/tags/backfill?limit=1000",
+        headers={"x-migrate-secret": "s3cret"},
+    ).json()["processed"]
+    cursor, processed = None, 0
+    for _ in range(candidates + 1):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.post(
+            "/api/v1/admin/tags/backfill",
+            params=params,
+            headers={"x-migrate-secret": "s3cret"},
+        ).json()
+        processed += body["processed"]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    # The run ends even though entries keep failing, visiting each once
+    assert cursor is None
+    assert processed == candidates
+    db_session.refresh(entry)
+    assert entry.tagged_content_hash is None
+
+
+def test_backfill_tags_unauthorized(client, monkeypatch):
+    monkeypatch.setenv("MIGRATE_SECRET", "s3cret")
+    resp = client.post("/api/v1/admin/tags/backfill", headers={"x-migrate-secret": "x"})
+    assert resp.status_code == 403
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.core.password_hasher import PasswordHasher
+
+
+def make_hasher(rounds=4, max_workers=2, max_queue=2):
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    return PasswordHasher(context, max_workers=max_workers, max_queue=max_queue)
+
+
+def test_hash_and_verify_expected():
+    hasher = make_hasher()
+
+    async def run():
+        hashed = await hasher.hash("TestPass123!")
+        return await hasher.verify_and_update("TestPass123!", hashed)
+
+    valid, new_hash = asyncio.run(run())
+    assert valid is True
+    assert new_hash is None
+    assert hasher.stats()["completed"] == 2
+
+
+def test_verify_edge_rehash_when_cost_changes():
+    old_hash = make_hasher(rounds=4).context.hash("TestPass123!")
+    hasher = make_hasher(rounds=5)
+    valid, new_hash = asyncio.run(hasher.verify_and_update("TestPass123!", old_hash))
+    assert valid is True
+    assert new_hash is not None
+    assert hasher.context.verify("TestPass123!", new_hash)
+
+
+def test_verify_failure_wrong_password():
+    hasher = make_hasher()
+    hashed = hasher.context.hash("TestPass123!")
+    valid, new_hash = asyncio.run(hasher.verify_and_update("wrong", hashed))
+    assert valid is False
+    assert new_hash is None
+
+
+def test_submit_failure_sheds_when_saturated():
+    hasher = make_hasher(max_workers=1, max_queue=0)
+    release = threading.Event()
+    hasher._submit(release.wait)  # Occupy the only slot
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            hasher._submit(lambda: None)
+        assert exc_info.value.status_code == 503
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        release.set()
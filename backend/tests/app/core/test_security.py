@@ -0,0 +1,62 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.user import Base as UserBase
+from app.db.session import engine
+from app.core.security import user_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_db():
+    UserBase.metadata.create_all(bind=engine)
+    yield
+    # DB cleanup handled in conftest.py
+
+
+@pytest.fixture
+def registered_user():
+    email = f"sec_{uuid.uuid4().hex[:8]}@example.com"
+    password = "TestPass123!"
+    reg = client.post("/api/v1/register", json={"email": email, "password": password})
+    assert reg.status_code == 201
+    login = client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    assert login.status_code == 200
+    token = login.json()["access_token"]
+    return reg.json(), {"Authorization": f"Bearer {token}"}
+
+
+def test_principal_cache_expected_hit(registered_user):
+    user, headers = registered_user
+    before = user_cache.stats()["hits"]
+    assert client.get("/api/v1/me", headers=headers).status_code == 200
+    resp = client.get("/api/v1/me", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["id"] == user["id"]
+    assert user_cache.stats()["hits"] > before
+
+
+def test_principal_cache_edge_invalidated_on_profile_update(registered_user):
+    user, headers = registered_user
+    client.get("/api/v1/me", headers=headers)  # Warm the cache
+    new_email = f"sec_{uuid.uuid4().hex[:8]}@example.com"
+    payload = {
+        "id": user["id"],
+        "email": new_email,
+        "is_active": True,
+        "is_superuser": False,
+    }
+    put = client.put("/api/v1/me", json=payload, headers=headers)
+    assert put.status_code == 200
+    assert put.json()["email"] == new_email
+    resp = client.get("/api/v1/me", headers=headers)
+    assert resp.json()["email"] == new_email
+
+
+def test_principal_cache_failure_invalid_token():
+    resp = client.get("/api/v1/me", headers={"Authorization": "Bearer not-a-jwt"})
+    assert resp.status_code == 401
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.db.pool_metrics import InstrumentedQueuePool, PoolTelemetry
+from app.db.session import engine_kwargs, is_memory_sqlite
+
+
+@pytest.fixture
+def telemetry_engine(tmp_path):
+    telemetry = PoolTelemetry()
+
+    class TestPool(InstrumentedQueuePool):
+        pass
+
+    TestPool.telemetry = telemetry
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TestPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        connect_args={"check_same_thread": False},
+    )
+    yield engine, telemetry
+    engine.dispose()
+
+
+def test_pool_telemetry_expected_checkouts(telemetry_engine):
+    engine, telemetry = telemetry_engine
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        snapshot = telemetry.snapshot(engine.pool)
+        assert snapshot["checkedout"] == 1
+    snapshot = telemetry.snapshot(engine.pool)
+    assert snapshot["checkedout"] == 0
+    assert snapshot["checkouts"] == 1
+    assert sum(snapshot["wait_ms_histogram"].values()) == 1
+
+
+def test_pool_telemetry_failure_timeout_counted(telemetry_engine):
+    engine, telemetry = telemetry_engine
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    snapshot = telemetry.snapshot(engine.pool)
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms_max"] >= 50
+
+
+def test_engine_kwargs_edge_memory_sqlite(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    assert is_memory_sqlite("sqlite://")
+    assert "poolclass" not in engine_kwargs("sqlite:///:memory:")
+    kwargs = engine_kwargs("postgresql://u:p@localhost/db")
+    assert kwargs["pool_size"] == 7
+    assert kwargs["poolclass"] is InstrumentedQueuePool
@@ -0,0 +1,36 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from app.db.session import (
+    AsyncSessionLocal,
+    shared_memory_url,
+    to_async_url,
+)
+
+
+def test_to_async_url_expected():
+    assert to_async_url("sqlite:////tmp/app.db") == "sqlite+aiosqlite:////tmp/app.db"
+    assert (
+        to_async_url("postgresql+psycopg2://u:p@db/app")
+        == "postgresql+asyncpg://u:p@db/app"
+    )
+    assert to_async_url("mssql+pyodbc://u:p@dsn").startswith("mssql+aioodbc://")
+
+
+def test_shared_memory_url_edge():
+    url = shared_memory_url("sqlite:///:memory:")
+    assert "mode=memory" in url and "cache=shared" in url
+    assert shared_memory_url("sqlite:////tmp/app.db") == "sqlite:////tmp/app.db"
+
+
+def test_to_async_url_failure_unknown_backend():
+    with pytest.raises(ValueError):
+        to_async_url("oracle://u:p@db/app")
+
+
+def test_async_session_expected_executes():
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(text("select 1"))).scalar()
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import create_engine, text
+from app.db.sqlite_tuning import install_sqlite_pragmas, sqlite_pragmas
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_install_pragmas_expected(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'perf.db'}")
+    assert install_sqlite_pragmas(engine) is True
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "foreign_keys") == 1
+    assert pragma(engine, "busy_timeout") == 5000
+    engine.dispose()
+
+
+def test_sqlite_pragmas_edge_in_memory_skips_wal():
+    names = [name for name, _ in sqlite_pragmas(in_memory=True)]
+    assert "journal_mode" not in names
+    assert "mmap_size" not in names
+    assert "busy_timeout" in names
+
+
+def test_install_pragmas_failure_disabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("SQLITE_PERFORMANCE_MODE", "false")
+    engine = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+    assert install_sqlite_pragmas(engine) is False
+    assert pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
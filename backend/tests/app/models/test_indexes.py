@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.pool import StaticPool
+from app.models.user import Base
+from app.models.decision import DecisionChatSession, DecisionJournalEntry
+from app.models.reflection import DecisionChatMessage
+from app.models.value_calibration import ValueCalibrationCheckin
+from app.models.gamification import UserBadge, UserChallenge
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, stmt) -> str:
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "stmt, index_name",
+    [
+        (
+            select(DecisionJournalEntry)
+            .where(DecisionJournalEntry.user_id == "u1")
+            .order_by(DecisionJournalEntry.created_at.desc()),
+            "ix_decision_journal_entries_user_id_created_at",
+        ),
+        (
+            select(ValueCalibrationCheckin)
+            .where(ValueCalibrationCheckin.user_id == "u1")
+            .order_by(ValueCalibrationCheckin.created_at.desc()),
+            "ix_value_calibration_checkins_user_id_created_at",
+        ),
+        (
+            select(DecisionChatSession)
+            .where(DecisionChatSession.user_id == "u1")
+            .order_by(DecisionChatSession.started_at.desc()),
+            "ix_decision_chat_sessions_user_id_started_at",
+        ),
+        (
+            select(DecisionChatMessage)
+            .where(DecisionChatMessage.session_id == "s1")
+            .order_by(DecisionChatMessage.created_at),
+            "ix_decision_chat_messages_session_id_created_at",
+        ),
+        (
+            select(UserChallenge).where(UserChallenge.user_id == "u1"),
+            "ix_user_challenges_user_id_started_at",
+        ),
+        (
+            select(UserBadge).where(UserBadge.user_id == "u1"),
+            "ix_user_badges_user_id_awarded_at",
+        ),
+    ],
+)
+def test_list_queries_use_composite_index(engine, stmt, index_name):
+    plan = query_plan(engine, stmt)
+    assert index_name in plan
+    # Edge: the index already yields rows in order, so no sort step is needed.
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_unfiltered_query_does_not_use_index(engine):
+    # Failure case: without the leading user_id predicate the index cannot seek.
+    plan = query_plan(
+        engine,
+        select(DecisionJournalEntry).where(DecisionJournalEntry.title == "x"),
+    )
+    assert "SCAN" in plan
+    assert "ix_decision_journal_entries_user_id_created_at" not in plan
@@ -0,0 +1,248 @@
+import asyncio
+import time
+import pytest
+from app.services import llm
+from app.services.llm import async_client
+from app.services.llm import bulkhead as bulkheads
+from app.services.llm import client as llm_client
+
+HI = [{"role": "user", "content": "hi"}]
+
+
+def test_acomplete_text_retries_transient_failure(fake_llm):
+    fake_llm.content = "  recovered  "
+    fake_llm.fail(500, times=2)
+    assert asyncio.run(llm.acomplete_text(HI)) == "recovered"
+    assert len(fake_llm.requests) == 3
+
+
+def test_achat_completion_failure_retries_exhausted(fake_llm):
+    fake_llm.fail(503)
+    with pytest.raises(llm.LLMUnavailable):
+        asyncio.run(llm.achat_completion(HI))
+    assert len(fake_llm.requests) == llm_client.LLM_MAX_RETRIES + 1
+
+
+def test_achat_completion_shares_breaker(fake_llm, monkeypatch):
+    monkeypatch.setattr(llm_client.breaker, "failure_threshold", 1)
+    fake_llm.fail(503)
+    with pytest.raises(llm.LLMUnavailable):
+        asyncio.run(llm.achat_completion(HI))
+    with pytest.raises(llm.LLMCircuitOpen):
+        llm.chat_completion(HI)
+
+
+def test_async_calls_wait_concurrently(fake_llm):
+    # 50 calls with 0.2s provider latency on one thread: ~0.2s, not 10s
+    fake_llm.delay = 0.2
+
+    async def fan_out():
+        return await asyncio.gather(
+            *(
+                llm.acomplete_text([{"role": "user", "content": f"q{i}"}])
+                for i in range(50)
+            )
+        )
+
+    start = time.monotonic()
+    replies = asyncio.run(fan_out())
+    assert time.monotonic() - start < 1.5
+    assert len(replies) == 50 and len(fake_llm.requests) == 50
+
+
+def test_async_identical_calls_coalesced(fake_llm):
+    fake_llm.delay = 0.1
+    llm.single_flight.reset()
+
+    async def fan_out():
+        return await asyncio.gather(*(llm.acomplete_text(HI) for _ in range(5)))
+
+    assert asyncio.run(fan_out()) == ["Fake AI reply."] * 5
+    assert len(fake_llm.requests) == 1
+    assert llm.single_flight.stats()["coalesced"] == 4
+
+
+def test_async_bulkhead_sheds_when_full(fake_llm, monkeypatch):
+    monkeypatch.setitem(
+        bulkheads._bulkheads, "test_async", bulkheads.Bulkhead("test_async", 1, 0, 0)
+    )
+    fake_llm.delay = 0.2
+
+    async def fan_out():
+        return await asyncio.gather(
+            *(
+                llm.acomplete_text(
+                    [{"role": "user", "content": f"q{i}"}], bulkhead="test_async"
+                )
+                for i in range(2)
+            ),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(fan_out())
+    assert sum(isinstance(r, llm.LLMBulkheadFull) for r in results) == 1
+    assert bulkheads.get_bulkhead("test_async").stats()["active"] == 0
+
+
+def test_async_bulkhead_edge_queued_caller_admitted():
+    bulkhead = bulkheads.Bulkhead("queued", 1, 1, 1.0)
+    bulkhead.enter()
+
+    async def wait_for_slot():
+        await bulkhead.aenter()
+        bulkhead.leave()
+
+    async def scenario():
+        waiter = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0.05)
+        assert bulkhead.stats()["waiting"] == 1
+        bulkhead.leave()
+        await waiter
+
+    asyncio.run(scenario())
+    assert bulkhead.stats()["admitted"] == 2 and bulkhead.stats()["active"] == 0
+
+
+def test_async_bulkhead_edge_woken_from_thread():
+    import threading
+
+    bulkhead = bulkheads.Bulkhead("handoff", 1, 1, 2.0)
+    bulkhead.enter()
+    threading.Timer(0.05, bulkhead.leave).start()
+
+    async def wait_for_slot():
+        started = time.monotonic()
+        await bulkhead.aenter()
+        return time.monotonic() - started
+
+    # The slot is handed over on release, not picked up by a later poll
+    assert asyncio.run(wait_for_slot()) < 1.0
+    assert bulkhead.stats()["active"] == 1
+    bulkhead.leave()
+    assert bulkhead.stats()["active"] == 0
+
+
+def test_async_bulkhead_failure_queue_timeout():
+    bulkhead = bulkheads.Bulkhead("timeout", 1, 1, 0.05)
+    bulkhead.enter()
+    with pytest.raises(bulkheads.BulkheadFull):
+        asyncio.run(bulkhead.aenter())
+    bulkhead.leave()
+    stats = bulkhead.stats()
+    assert stats["timed_out"] == 1 and stats["waiting"] == 0
+    assert stats["active"] == 0
+
+
+def test_astream_text_yields_deltas(fake_llm):
+    fake_llm.content = "one two three"
+
+    async def collect():
+        return [delta async for delta in llm.astream_text(HI)]
+
+    assert "".join(asyncio.run(collect())) == "one two three"
+
+
+def test_get_async_pool_failure_not_configured(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    async def get_pool():
+        return llm.get_async_pool()
+
+    with pytest.raises(llm.LLMUnavailable):
+        asyncio.run(get_pool())
+
+
+def test_get_async_pool_edge_one_per_loop(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    async def get_twice():
+        first = llm.get_async_pool()
+        return first, llm.get_async_pool() is first
+
+    first, shared = asyncio.run(get_twice())
+    # A new event loop (e.g. another worker) gets its own clients
+    second, _ = asyncio.run(get_twice())
+    asyncio.run(first.close())
+    asyncio.run(llm.aclose_client())
+    assert shared and second is not first
+
+
+def test_get_async_pool_edge_replaced_pool_closed(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    async def rotate_key():
+        first = llm.get_async_pool()
+        monkeypatch.setenv("OPENAI_API_KEY", "rotated-key")
+        second = llm.get_async_pool()
+        await asyncio.sleep(0.01)
+        closed = all(client.is_closed() for client in first.clients)
+        await llm.aclose_client()
+        return closed, second is not first
+
+    assert asyncio.run(rotate_key()) == (True, True)
+
+
+def test_async_pool_sharded_and_least_busy_first(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(async_client, "LLM_MAX_CONNECTIONS", 50)
+    monkeypatch.setattr(async_client, "LLM_ASYNC_POOL_SHARD_SIZE", 20)
+
+    async def scenario():
+        pool = async_client.AsyncClientPool("test-key", None)
+        async with pool.connection(1) as first, pool.connection(1) as second:
+            busy = list(pool.in_flight)
+        await pool.close()
+        return pool, first, second, busy
+
+    pool, first, second, busy = asyncio.run(scenario())
+    assert len(pool.clients) == 3
+    assert first is not second and busy == [1, 1, 0]
+    assert pool.in_flight == [0, 0, 0]
+
+
+def test_async_pool_failure_exhausted(fake_llm, monkeypatch):
+    monkeypatch.setattr(async_client, "LLM_MAX_CONNECTIONS", 1)
+    monkeypatch.setattr(async_client, "LLM_CONNECT_TIMEOUT", 0.05)
+    monkeypatch.setattr(llm_client.breaker, "failure_threshold", 1)
+    fake_llm.delay = 0.3
+
+    async def fan_out():
+        return await asyncio.gather(
+            llm.acomplete_text([{"role": "user", "content": "a"}]),
+            llm.acomplete_text([{"role": "user", "content": "b"}]),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(fan_out())
+    assert sum(isinstance(r, llm.LLMUnavailable) for r in results) == 1
+    assert len(fake_llm.requests) == 1
+    # Local saturation is not a provider failure
+    assert llm_client.breaker.state == "closed"
+
+
+def test_achat_completion_failure_one_deadline(fake_llm, monkeypatch):
+    monkeypatch.setattr(async_client, "LLM_MAX_CONNECTIONS", 1)
+    monkeypatch.setattr(async_client, "LLM_CONNECT_TIMEOUT", 5)
+    bulkhead = bulkheads.Bulkhead("test_deadline", 1, 1, 5)
+    monkeypatch.setitem(bulkheads._bulkheads, "test_deadline", bulkhead)
+    fake_llm.delay = 0.3
+    bulkhead.enter()
+
+    async def scenario():
+        asyncio.get_running_loop().call_later(0.15, bulkhead.leave)
+        return await asyncio.gather(
+            llm.acomplete_text([{"role": "user", "content": "holds the pool"}]),
+            llm.acomplete_text(
+                [{"role": "user", "content": "queued"}],
+                budget=0.25,
+                bulkhead="test_deadline",
+            ),
+            return_exceptions=True,
+        )
+
+    held, queued = asyncio.run(scenario())
+    # 0.15s in the bulkhead leaves 0.1s of the budget to wait for the connection
+    assert held == "Fake AI reply."
+    assert isinstance(queued, llm.LLMUnavailable)
+    assert not isinstance(queued, llm.LLMBulkheadFull)
+    assert len(fake_llm.requests) == 1
@@ -0,0 +1,52 @@
+import time
+from app.services.llm.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_breaker_trips_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    stats = breaker.stats()
+    assert (stats["trips"], stats["short_circuits"]) == (1, 1)
+
+
+def test_breaker_edge_half_open_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    # Only one probe at a time while half-open
+    assert breaker.allow() is False
+    assert breaker.is_open()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.stats()["trips"] == 2
+
+
+def test_breaker_disabled():
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.allow() and not breaker.is_open()
+
+
+def test_release_probe_allows_next_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow() is True  # probe admitted
+    assert breaker.allow() is False
+    breaker.release_probe()
+    assert breaker.allow() is True
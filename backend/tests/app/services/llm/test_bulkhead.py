@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+from app.services.llm.bulkhead import Bulkhead, BulkheadFull, get_bulkhead, stats
+
+
+def test_admits_up_to_limit_then_queues():
+    bulkhead = Bulkhead("t", max_concurrent=1, max_queue=1, queue_timeout=2)
+    bulkhead.enter()
+    admitted = threading.Event()
+
+    def waiter():
+        with bulkhead.acquire():
+            admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    assert bulkhead.stats()["waiting"] == 1
+    assert not admitted.is_set()
+    bulkhead.leave()
+    thread.join()
+    assert admitted.is_set()
+    assert bulkhead.stats()["admitted"] == 2
+    assert bulkhead.stats()["active"] == 0
+
+
+def test_rejects_when_queue_full():
+    bulkhead = Bulkhead("t", max_concurrent=1, max_queue=0, queue_timeout=2)
+    with bulkhead.acquire():
+        started = time.monotonic()
+        with pytest.raises(BulkheadFull):
+            bulkhead.enter()
+        assert time.monotonic() - started < 0.1
+    assert bulkhead.stats()["rejected"] == 1
+
+
+def test_queue_timeout_failure():
+    bulkhead = Bulkhead("t", max_concurrent=1, max_queue=5, queue_timeout=0.05)
+    with bulkhead.acquire():
+        with pytest.raises(BulkheadFull):
+            bulkhead.enter()
+        # Reason: The caller's own (shorter) timeout wins
+        bulkhead.queue_timeout = 10
+        with pytest.raises(BulkheadFull):
+            bulkhead.enter(timeout=0.05)
+    stats = bulkhead.stats()
+    assert (stats["timed_out"], stats["waiting"], stats["active"]) == (2, 0, 0)
+
+
+def test_registry_uses_per_class_settings(monkeypatch):
+    monkeypatch.setenv("LLM_BULKHEAD_TEST_REGISTRY_MAX_CONCURRENT", "3")
+    bulkhead = get_bulkhead("test_registry")
+    assert bulkhead is get_bulkhead("test_registry")
+    assert bulkhead.max_concurrent == 3
+    assert "test_registry" in stats()
@@ -0,0 +1,131 @@
+import time
+import pytest
+from app.services import llm
+from app.services.llm import client as llm_client
+
+
+def test_complete_text_retries_transient_failure(fake_llm):
+    fake_llm.content = "  recovered  "
+    fake_llm.fail(500, times=2)
+    assert llm.complete_text([{"role": "user", "content": "hi"}]) == "recovered"
+    assert len(fake_llm.requests) == 3
+    assert fake_llm.requests[-1]["model"] == llm.DEFAULT_MODEL
+
+
+def test_chat_completion_edge_client_error_not_retried(fake_llm):
+    fake_llm.fail(400, times=1)
+    with pytest.raises(llm.LLMUnavailable):
+        llm.chat_completion([{"role": "user", "content": "hi"}])
+    assert len(fake_llm.requests) == 1
+
+
+def test_chat_completion_failure_retries_exhausted(fake_llm):
+    fake_llm.fail(503)
+    with pytest.raises(llm.LLMUnavailable):
+        llm.chat_completion([{"role": "user", "content": "hi"}])
+    assert len(fake_llm.requests) == llm_client.LLM_MAX_RETRIES + 1
+
+
+def test_get_client_failure_not_configured(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert llm.is_configured() is False
+    with pytest.raises(llm.LLMUnavailable):
+        llm.get_client()
+
+
+def test_get_client_shared_and_base_url(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:9999/v1")
+    llm.reset_client()
+    try:
+        first = llm.get_client()
+        assert llm.get_client() is first
+        assert str(first.base_url).startswith("http://localhost:9999/v1")
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:9998/v1")
+        assert llm.get_client() is not first
+    finally:
+        llm.reset_client()
+
+
+def test_breaker_short_circuits_after_failures(fake_llm, monkeypatch):
+    monkeypatch.setattr(llm_client.breaker, "failure_threshold", 2)
+    fake_llm.fail(503)
+    for _ in range(2):
+        with pytest.raises(llm.LLMUnavailable):
+            llm.chat_completion([{"role": "user", "content": "hi"}])
+    sent = len(fake_llm.requests)
+    with pytest.raises(llm.LLMCircuitOpen):
+        llm.chat_completion([{"role": "user", "content": "hi"}])
+    assert len(fake_llm.requests) == sent
+    assert llm.is_available() is False
+    assert llm.stats()["breaker"]["state"] == "open"
+
+
+def test_client_error_does_not_trip_breaker(fake_llm, monkeypatch):
+    monkeypatch.setattr(llm_client.breaker, "failure_threshold", 1)
+    fake_llm.fail(400, times=1)
+    with pytest.raises(llm.LLMUnavailable):
+        llm.chat_completion([{"role": "user", "content": "hi"}])
+    assert llm_client.breaker.state == "closed"
+
+
+def test_budget_stops_retries_failure(fake_llm, monkeypatch):
+    # Backoff longer than the budget: the first failure ends the call
+    monkeypatch.setattr(llm_client, "LLM_RETRY_BACKOFF_SECONDS", 10)
+    monkeypatch.setattr(llm_client.random, "uniform", lambda a, b: b)
+    fake_llm.fail(503)
+    start = time.monotonic()
+    with pytest.raises(llm.LLMUnavailable, match="deadline"):
+        llm.chat_completion([{"role": "user", "content": "hi"}], budget=0.5)
+    assert time.monotonic() - start < 0.5
+    assert len(fake_llm.requests) == 1
+    assert llm.stats()["deadline_exceeded"] >= 1
+
+
+def test_stream_text_yields_deltas(fake_llm):
+    fake_llm.content = "one two three"
+    deltas = list(llm.stream_text([{"role": "user", "content": "hi"}]))
+    assert deltas == ["one ", "two ", "three"]
+    assert llm.stats()["streams"] >= 1
+
+
+def test_stream_text_failure_before_first_token(fake_llm):
+    fake_llm.fail(503)
+    with pytest.raises(llm.LLMUnavailable):
+        list(llm.stream_text([{"role": "user", "content": "hi"}]))
+
+
+def test_identical_in_flight_calls_coalesced(fake_llm):
+    from concurrent.futures import ThreadPoolExecutor
+
+    fake_llm.delay = 0.2
+    fake_llm.content = "shared"
+    before = llm.single_flight.stats()["coalesced"]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        replies = list(
+            pool.map(
+                lambda text: llm.complete_text([{"role": "user", "content": text}]),
+                ["same input", "same input ", " same  input", "other input"],
+            )
+        )
+    assert replies == ["shared"] * 4
+    # Reason: Whitespace-only variants share a call; different text does not
+    assert len(fake_llm.requests) == 2
+    assert llm.single_flight.stats()["coalesced"] == before + 2
+    assert "single_flight" in llm.stats()
+
+
+def test_bulkhead_full_sheds_without_calling_provider(fake_llm, monkeypatch):
+    from app.services.llm import bulkhead as bulkheads
+
+    monkeypatch.setitem(
+        bulkheads._bulkheads, "test_class", bulkheads.Bulkhead("test_class", 0, 0, 0)
+    )
+    with pytest.raises(llm.LLMBulkheadFull):
+        llm.complete_text([{"role": "user", "content": "hi"}], bulkhead="test_class")
+    with pytest.raises(llm.LLMBulkheadFull):
+        list(
+            llm.stream_text([{"role": "user", "content": "hi"}], bulkhead="test_class")
+        )
+    assert fake_llm.requests == []
+    assert llm.stats()["shed"] >= 2
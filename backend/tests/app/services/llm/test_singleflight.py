@@ -0,0 +1,82 @@
+import threading
+import time
+import pytest
+from app.services.llm.singleflight import SingleFlight, SingleFlightTimeout
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = run_concurrently(5, lambda: flight.do("k", slow))
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    stats = flight.stats()
+    assert (stats["executions"], stats["coalesced"]) == (1, 4)
+    assert stats["coalescing_ratio"] == 0.8
+    assert stats["in_flight"] == 0
+
+
+def test_sequential_calls_not_cached():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_error_shared_with_waiters():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    results = run_concurrently(3, lambda: flight.do("k", failing))
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["executions"] == 1
+
+
+def test_waiter_timeout_failure():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flight.do("k", release.wait))
+    leader.start()
+    time.sleep(0.05)
+    with pytest.raises(SingleFlightTimeout):
+        flight.do("k", lambda: "unused", timeout=0.05)
+    release.set()
+    leader.join()
+
+
+def test_disabled_runs_every_call():
+    flight = SingleFlight(enabled=False)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+
+    run_concurrently(3, lambda: flight.do("k", slow))
+    assert len(calls) == 3
@@ -0,0 +1,112 @@
+import time
+import uuid
+from app.services.auto_tagger import AutoTagger, OpenAITagger, validate_tags
+from app.services.llm import client as llm_client
+
+
+def unique_entries(count):
+    return [("Job offer", f"Should I accept? {uuid.uuid4().hex}") for _ in range(count)]
+
+
+def test_tag_entries_expected_single_batch_call(fake_llm, db_session):
+    entries = unique_entries(4)
+    results = OpenAITagger.tag_entries(entries, db=db_session, batch_size=10)
+    assert results == [fake_llm.function_arguments] * 4
+    assert len(fake_llm.requests) == 1
+    # Batch results are cached, so the same entries need no further calls
+    assert OpenAITagger.tag_entries(entries, db=db_session) == results
+    assert len(fake_llm.requests) == 1
+
+
+def test_tag_entries_edge_duplicates_and_chunking(fake_llm):
+    entries = unique_entries(5)
+    entries.append(entries[0])
+    results = OpenAITagger.tag_entries(entries, batch_size=2)
+    assert all(tags == fake_llm.function_arguments for tags in results)
+    # 5 distinct texts in chunks of 2 -> 3 calls (the last chunk is a single entry)
+    assert len(fake_llm.requests) == 3
+
+
+def test_tag_entries_invalid_items_fall_back(fake_llm):
+    fake_llm.batch_results = [
+        {"index": 0, **fake_llm.function_arguments},
+        {"index": 1, "domain_tags": ["not-a-domain"], "sentiment_tag": "meh"},
+        {"index": 7, **fake_llm.function_arguments},
+    ]
+    results = OpenAITagger.tag_entries(unique_entries(3), batch_size=10)
+    assert results == [fake_llm.function_arguments] * 3
+    # One batch call plus single-entry retries for the invalid and missing items
+    assert len(fake_llm.requests) == 3
+
+
+def test_tag_entries_failure_returns_none(fake_llm):
+    fake_llm.fail(400)
+    assert OpenAITagger.tag_entries(unique_entries(2), batch_size=10) == [None, None]
+
+
+def test_tag_entries_failure_batch_call_not_retried_per_item(fake_llm):
+    fake_llm.fail(503)
+    results = OpenAITagger.tag_entries(unique_entries(6), batch_size=3)
+    assert results == [None] * 6
+    # Only the first batch call (with its gateway retries); no single-entry calls
+    assert len(fake_llm.requests) == llm_client.LLM_MAX_RETRIES + 1
+
+
+CONFIDENT_TEXT = (
+    "Job offer",
+    "My boss offered a promotion with a better salary. I am excited and proud.",
+)
+
+
+def test_local_tagger_expected():
+    result = AutoTagger.analyze(*CONFIDENT_TEXT)
+    assert result.tags["domain_tags"] == ["career"]
+    assert result.tags["sentiment_tag"] == "positive"
+    assert {"boss", "promotion", "salary"} <= set(result.tags["keywords"])
+    assert validate_tags(result.tags) == result.tags
+    assert result.confidence >= 0.8
+
+
+def test_local_tagger_edge_negation_and_ambiguous():
+    negated = AutoTagger.analyze("Family", "I am not happy with my family lately")
+    assert negated.tags["sentiment_tag"] == "negative"
+    # Negation stops at the end of its sentence
+    happy = "I am very happy and excited today."
+    assert AutoTagger.fallback_tags("Day", happy)["sentiment_tag"] == "positive"
+    assert (
+        AutoTagger.fallback_tags("Day", f"I am not sure. {happy}")["sentiment_tag"]
+        == "positive"
+    )
+    nothing = AutoTagger.analyze("asdfghjkl", "qwertyuiop")
+    assert nothing.tags == {
+        "domain_tags": ["ambiguous"],
+        "sentiment_tag": "neutral",
+        "keywords": ["ambiguous"],
+    }
+    assert nothing.confidence == 0.0
+    assert AutoTagger.analyze(None, None).confidence == 0.0
+
+
+def test_local_tier_skips_llm_when_confident(fake_llm, monkeypatch):
+    monkeypatch.setattr("app.services.auto_tagger.AUTO_TAG_LOCAL_CONFIDENCE", 0.8)
+    title, context = CONFIDENT_TEXT
+    tags = OpenAITagger.tag_entry(title, f"{context} {uuid.uuid4().hex}")
+    assert tags["domain_tags"] == ["career"]
+    assert fake_llm.requests == []
+    # Low-confidence text still goes to the LLM
+    OpenAITagger.tag_entry("Hmm", f"Not sure {uuid.uuid4().hex}")
+    assert len(fake_llm.requests) == 1
+
+
+def test_local_fallback_failure_disabled(monkeypatch):
+    monkeypatch.setattr("app.services.auto_tagger.AUTO_TAG_LOCAL_FALLBACK", False)
+    assert AutoTagger.fallback_tags(*CONFIDENT_TEXT) is None
+
+
+def test_local_tagger_throughput():
+    entries = [(f"Entry {i}", CONFIDENT_TEXT[1] * 3) for i in range(2000)]
+    start = time.perf_counter()
+    for title, context in entries:
+        AutoTagger.analyze(title, context)
+    # Loose bound: expected throughput is several thousand entries/s on one core
+    assert time.perf_counter() - start < 2.0
@@ -0,0 +1,126 @@
+import datetime
+import time
+import uuid
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.models.decision import DecisionJournalEntry
+from app.models.tagging_job import TaggingJob
+from app.services.background_jobs import JobWorker, enqueue_job
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(bind=db_engine, autoflush=False)
+
+
+def make_pending_entry(session_factory):
+    with session_factory() as db:
+        entry = DecisionJournalEntry(
+            id=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()),
+            title="Job offer",
+            context=f"Should I accept? {uuid.uuid4().hex}",
+            tagging_status="pending",
+        )
+        db.add(entry)
+        job = enqueue_job(db, entry.id)
+        db.commit()
+        return entry.id, job.id
+
+
+def load(session_factory, model, key):
+    with session_factory() as db:
+        return db.get(model, key)
+
+
+def test_worker_tags_entry_expected(fake_llm, session_factory):
+    entry_id, job_id = make_pending_entry(session_factory)
+    worker = JobWorker(session_factory, workers=1)
+    assert worker.drain() >= 1
+    entry = load(session_factory, DecisionJournalEntry, entry_id)
+    assert entry.tagging_status == "done"
+    assert entry.domain_tags == fake_llm.function_arguments["domain_tags"]
+    job = load(session_factory, TaggingJob, job_id)
+    assert (job.status, job.attempts) == ("done", 1)
+
+
+def test_worker_retry_then_fail(fake_llm, session_factory):
+    fake_llm.fail(400)
+    entry_id, job_id = make_pending_entry(session_factory)
+    worker = JobWorker(
+        session_factory, workers=1, max_attempts=2, retry_backoff_seconds=0
+    )
+    worker.drain()
+    job = load(session_factory, TaggingJob, job_id)
+    assert (job.status, job.attempts) == ("failed", 2)
+    assert job.last_error
+    entry = load(session_factory, DecisionJournalEntry, entry_id)
+    assert entry.tagging_status == "failed"
+
+
+def test_worker_edge_backoff_and_stale_requeue(fake_llm, session_factory):
+    fake_llm.fail(400, times=1)
+    _, job_id = make_pending_entry(session_factory)
+    worker = JobWorker(
+        session_factory,
+        workers=1,
+        max_attempts=3,
+        retry_backoff_seconds=60,
+        stale_seconds=0,
+    )
+    # First attempt fails and is pushed into the future, so nothing else is runnable
+    assert worker.drain() == 1
+    job = load(session_factory, TaggingJob, job_id)
+    assert job.status == "pending"
+    assert job.run_after > datetime.datetime.utcnow()
+    with session_factory() as db:
+        stuck = db.get(TaggingJob, job_id)
+        stuck.status = "running"
+        stuck.updated_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        db.commit()
+    assert worker.requeue_stale() >= 1
+    assert load(session_factory, TaggingJob, job_id).status == "pending"
+
+
+def test_worker_threads_process_notified_job(fake_llm, session_factory):
+    worker = JobWorker(session_factory, workers=2, poll_seconds=5)
+    worker.start()
+    try:
+        entry_id, _ = make_pending_entry(session_factory)
+        worker.notify()
+        for _ in range(100):
+            entry = load(session_factory, DecisionJournalEntry, entry_id)
+            if entry.tagging_status == "done":
+                break
+            time.sleep(0.05)
+        assert entry.tagging_status == "done"
+    finally:
+        worker.stop()
+    assert worker.stats()["running"] is False
+
+
+def test_worker_batches_jobs_into_one_call(fake_llm, session_factory):
+    entry_ids = [make_pending_entry(session_factory)[0] for _ in range(3)]
+    worker = JobWorker(session_factory, workers=1, batch_size=10)
+    assert worker.drain() == 1
+    assert len(fake_llm.requests) == 1
+    for entry_id in entry_ids:
+        entry = load(session_factory, DecisionJournalEntry, entry_id)
+        assert entry.tagging_status == "done"
+    assert worker.stats()["completed"] >= 3
+
+
+def test_worker_batch_failure_retries_each_job(fake_llm, session_factory):
+    fake_llm.fail(400)
+    job_ids = [make_pending_entry(session_factory)[1] for _ in range(2)]
+    worker = JobWorker(
+        session_factory,
+        workers=1,
+        max_attempts=1,
+        retry_backoff_seconds=0,
+        batch_size=10,
+    )
+    worker.drain()
+    for job_id in job_ids:
+        job = load(session_factory, TaggingJob, job_id)
+        assert (job.status, job.attempts) == ("failed", 1)
@@ -0,0 +1,78 @@
+import asyncio
+import uuid
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.models.decision import DecisionChatSession
+from app.models.reflection import MessageType
+from app.models.user import User
+from app.services import chat_memory
+
+
+@pytest.fixture
+def chat_session(db_session):
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"mem_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="x",
+    )
+    session = DecisionChatSession(id=str(uuid.uuid4()), user_id=user.id, title="t")
+    db_session.add_all([user, session])
+    db_session.commit()
+    return session
+
+
+def test_build_prompt_summary_failure_keeps_full_window(
+    fake_llm, db_session, chat_session, monkeypatch
+):
+    monkeypatch.setattr(chat_memory, "CHAT_HISTORY_TOKEN_BUDGET", 30)
+    fake_llm.fail(500)
+
+    async def scenario():
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+        )
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            for i in range(4):
+                await chat_memory.add_message(
+                    db, chat_session.id, MessageType.user, "y" * 40
+                )
+            return await chat_memory.build_prompt(db, chat_session.id)
+
+    prompt = asyncio.run(scenario())
+    assert len(prompt) == 2  # full 30-token window, no summary message
+    db_session.refresh(chat_session)
+    assert chat_session.summarized_message_count == 0
+    assert chat_session.rolling_summary is None
+
+
+def test_fold_into_summary_failure_lost_race(fake_llm, db_session, chat_session):
+    fake_llm.content = "Merged summary."
+
+    async def scenario():
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+        )
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            stored = await chat_memory.add_message(
+                db, chat_session.id, MessageType.user, "x"
+            )
+            session = await db.get(DecisionChatSession, chat_session.id)
+            # Another turn folds first, so the compare-and-set matches no row
+            session.summarized_message_count = 0
+            db_session.query(DecisionChatSession).filter_by(id=chat_session.id).update(
+                {"summarized_message_count": 1}
+            )
+            db_session.commit()
+            folded = await chat_memory._fold_into_summary(
+                db,
+                session,
+                [{"role": "user", "content": "x"}],
+                (stored.created_at, stored.id),
+            )
+            return folded, session
+
+    folded, session = asyncio.run(scenario())
+    assert folded is False
+    assert session.summarized_message_count == 1
+    assert session.rolling_summary is None
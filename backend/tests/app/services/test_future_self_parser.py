@@ -0,0 +1,39 @@
+from app.services.future_self import SuggestionStreamParser, parse_simulation
+
+REPLY = "In 5 years, you will have grown. Suggestions:\n- Network\n- Learn finance"
+
+
+def feed_in_chunks(text, size):
+    parser = SuggestionStreamParser()
+    events = []
+    for start in range(0, len(text), size):
+        events += parser.feed(text[start : start + size])
+    return parser, events + parser.close()
+
+
+def test_parser_expected_matches_full_parse():
+    for size in (1, 3, 7, len(REPLY)):
+        parser, events = feed_in_chunks(REPLY, size)
+        assert (parser.projection, parser.suggestions) == parse_simulation(REPLY)
+        suggestions = [data for event, data in events if event == "suggestion"]
+        assert suggestions == [
+            {"index": 0, "text": "Network"},
+            {"index": 1, "text": "Learn finance"},
+        ]
+        projection = "".join(d["content"] for e, d in events if e == "projection")
+        # The split marker never leaks into projection text
+        assert "Sugg" not in projection
+        assert projection.strip() == "In 5 years, you will have grown."
+
+
+def test_parser_edge_suggestion_emitted_before_stream_ends():
+    parser = SuggestionStreamParser()
+    parser.feed("Projection. Suggestions:\n- First\n- Sec")
+    assert parser.suggestions == ["First"]
+    parser.feed("ond\n")
+    assert parser.suggestions == ["First", "Second"]
+
+
+def test_parser_no_marker():
+    assert parse_simulation("  Only a projection.  ") == ("Only a projection.", [])
+    assert parse_simulation("") == ("", [])
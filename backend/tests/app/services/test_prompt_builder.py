@@ -0,0 +1,80 @@
+import pytest
+from app.services import prompt_builder
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Reason: Keep counts deterministic whether or not tiktoken is installed
+    monkeypatch.setattr(prompt_builder, "_encoding", None)
+    monkeypatch.setattr(prompt_builder, "_encoding_loaded", True)
+    prompt_builder.token_count_cache.clear()
+
+
+def msg(content, role="user"):
+    return {"role": role, "content": content}
+
+
+def test_count_tokens_memoized(monkeypatch):
+    class WordEncoding:
+        def encode(self, text):
+            return text.split()
+
+    monkeypatch.setattr(prompt_builder, "_encoding", WordEncoding())
+    hits = prompt_builder.token_count_cache.hits
+    assert prompt_builder.count_tokens("one two three") == 3
+    assert prompt_builder.count_tokens("one two three") == 3
+    assert prompt_builder.token_count_cache.hits == hits + 1
+    assert prompt_builder.count_tokens("") == 0
+    assert prompt_builder.count_tokens(None) == 0
+
+
+def test_count_tokens_edge_estimate_not_cached():
+    stats = prompt_builder.token_count_cache.stats()
+    assert prompt_builder.count_tokens("a" * 40) == 10
+    assert prompt_builder.count_tokens("a" * 40) == 10
+    assert prompt_builder.token_count_cache.stats() == stats
+
+
+def test_fit_history_keeps_recent_suffix():
+    messages = [msg("a" * 40), msg("b" * 40), msg("c" * 40)]  # 14 tokens each
+    older, recent = prompt_builder.fit_history(messages, 30)
+    assert older == messages[:1]
+    assert recent == messages[1:]
+    assert prompt_builder.fit_history([], 10) == ([], [])
+
+
+def test_build_chat_keeps_system_and_truncates_huge_turn():
+    messages = [msg("Summary", "system"), msg("old"), msg("x" * 4000)]
+    prompt = prompt_builder.build_chat("test_chat", messages, 100)
+    assert prompt.trimmed is True
+    assert prompt.tokens <= 100
+    assert [m["role"] for m in prompt.messages] == ["system", "user"]
+    assert prompt.messages[-1]["content"].endswith(prompt_builder.TRUNCATION_MARKER)
+
+
+def test_build_chat_within_budget_untouched():
+    messages = [msg("Hi"), msg("Hello", "assistant"), msg("Help me")]
+    prompt = prompt_builder.build_chat("test_chat", messages, 100)
+    assert prompt.messages == messages
+    assert prompt.trimmed is False
+
+
+def test_build_entry_truncates_longest_field_only():
+    fields = [("Title", "Move abroad"), ("Context", "y" * 8000), ("Domain", None)]
+    prompt = prompt_builder.build_entry("test_entry", "Coach.", fields, 200)
+    assert prompt.trimmed is True
+    assert prompt.tokens <= 200
+    user = prompt.messages[1]["content"]
+    assert user.startswith("Title: Move abroad\nContext: yyy")
+    assert "Domain" not in user
+    stats = prompt_builder.stats()["endpoints"]["test_entry"]
+    assert stats["calls"] >= 1 and stats["trimmed"] >= 1
+    assert stats["max_tokens"] <= 200
+
+
+def test_build_entry_short_fields_verbatim():
+    prompt = prompt_builder.build_entry(
+        "test_entry", "Coach.", [("Title", "Tea"), ("Values", "calm")], 200
+    )
+    assert prompt.messages[1]["content"] == "Title: Tea\nValues: calm\n"
+    assert prompt.trimmed is False
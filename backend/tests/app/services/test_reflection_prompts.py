@@ -0,0 +1,94 @@
+import uuid
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.models.decision import DecisionJournalEntry
+from app.models.tagging_job import TaggingJob
+from app.services import reflection
+from app.services.background_jobs import JobWorker
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(bind=db_engine, autoflush=False)
+
+
+@pytest.fixture
+def precompute(monkeypatch):
+    monkeypatch.setattr(reflection, "REFLECTION_PRECOMPUTE", True)
+    monkeypatch.setattr(reflection, "background_tagging_enabled", lambda: True)
+
+
+def make_entry(**fields):
+    return DecisionJournalEntry(
+        id=str(uuid.uuid4()),
+        user_id=str(uuid.uuid4()),
+        title=fields.pop("title", "Job offer"),
+        context=fields.pop("context", "Should I accept?"),
+        **fields,
+    )
+
+
+def test_prompt_hash_ignores_whitespace_and_case():
+    a = make_entry(context="Should I  accept?", values=["Growth"])
+    b = make_entry(context=" should i accept? ", values=["growth"])
+    c = make_entry(context="Should I decline?", values=["Growth"])
+    assert reflection.prompt_content_hash(a) == reflection.prompt_content_hash(b)
+    assert reflection.prompt_content_hash(a) != reflection.prompt_content_hash(c)
+
+
+def test_cached_prompts_stale_after_edit():
+    entry = make_entry()
+    reflection.store_prompts(entry, ["Why?", "Why not?"])
+    assert reflection.cached_prompts(entry) == ["Why?", "Why not?"]
+    entry.anticipated_outcomes = "A raise"
+    assert reflection.cached_prompts(entry) is None
+
+
+def test_precompute_job_stores_prompts(fake_llm, precompute, session_factory):
+    fake_llm.content = "1. What matters most?\n2. What are you afraid of?"
+    with session_factory() as db:
+        entry = make_entry()
+        db.add(entry)
+        assert reflection.enqueue_precompute(db, entry) is True
+        db.commit()
+        entry_id = entry.id
+    JobWorker(session_factory, workers=1).drain()
+    with session_factory() as db:
+        entry = db.get(DecisionJournalEntry, entry_id)
+        assert reflection.cached_prompts(entry) == [
+            "What matters most?",
+            "What are you afraid of?",
+        ]
+        job = db.query(TaggingJob).filter_by(entry_id=entry_id).one()
+        assert (job.kind, job.status) == (
+            reflection.JOB_KIND_REFLECTION_PROMPTS,
+            "done",
+        )
+
+
+def test_precompute_disabled_by_default(fake_llm, session_factory):
+    with session_factory() as db:
+        entry = make_entry()
+        db.add(entry)
+        assert reflection.enqueue_precompute(db, entry) is False
+        db.rollback()
+
+
+def test_precompute_job_failure_leaves_no_prompts(
+    fake_llm, precompute, session_factory
+):
+    fake_llm.fail(400)
+    with session_factory() as db:
+        entry = make_entry()
+        db.add(entry)
+        reflection.enqueue_precompute(db, entry)
+        db.commit()
+        entry_id = entry.id
+    JobWorker(
+        session_factory, workers=1, max_attempts=1, retry_backoff_seconds=0
+    ).drain()
+    with session_factory() as db:
+        entry = db.get(DecisionJournalEntry, entry_id)
+        assert entry.reflection_prompts is None
+        job = db.query(TaggingJob).filter_by(entry_id=entry_id).one()
+        assert job.status == "failed"
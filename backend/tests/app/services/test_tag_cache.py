@@ -0,0 +1,107 @@
+import datetime
+import uuid
+import pytest
+from fastapi import HTTPException
+from app.models.tag_cache import TagCacheEntry
+from app.services.auto_tagger import OpenAITagger
+from app.services.tag_cache import TagCache, content_key, tag_cache
+from app.utils.cache import TTLCache
+
+
+def unique_text():
+    return f"Should I take the new job? {uuid.uuid4().hex}"
+
+
+def test_tag_entry_cached_expected(fake_llm, db_session):
+    context = unique_text()
+    first = OpenAITagger.tag_entry("Job offer", context, db=db_session)
+    # Normalization: case and whitespace differences share the same key
+    second = OpenAITagger.tag_entry("  job   OFFER ", context.upper(), db=db_session)
+    assert first == second == fake_llm.function_arguments
+    assert len(fake_llm.requests) == 1
+    assert db_session.query(TagCacheEntry).count() >= 1
+
+
+def test_tag_entry_edge_database_tier(fake_llm, db_session):
+    context = unique_text()
+    OpenAITagger.tag_entry("Job offer", context, db=db_session)
+    tag_cache.memory.clear()
+    db_hits = tag_cache.db_hits
+    assert OpenAITagger.tag_entry("Job offer", context, db=db_session)["keywords"]
+    assert len(fake_llm.requests) == 1
+    assert tag_cache.db_hits == db_hits + 1
+
+
+def test_tag_entry_failure_not_cached(fake_llm, db_session):
+    context = unique_text()
+    fake_llm.fail(400, times=1)
+    with pytest.raises(HTTPException):
+        OpenAITagger.tag_entry("Job offer", context, db=db_session)
+    assert OpenAITagger.tag_entry("Job offer", context, db=db_session)
+    assert len(fake_llm.requests) == 2
+
+
+def test_content_key_edge_model_and_taxonomy():
+    base = content_key("t", "c", "model-a", "v1")
+    assert base == content_key(" T ", "c", "model-a", "v1")
+    assert base != content_key("t", "c", "model-b", "v1")
+    assert base != content_key("t", "c", "model-a", "v2")
+
+
+def test_evict_by_age_and_size(db_session):
+    db_session.query(TagCacheEntry).delete()
+    db_session.commit()
+    cache = TagCache(
+        TTLCache(max_size=10, ttl_seconds=60),
+        max_age_days=30,
+        max_rows=2,
+        evict_every=0,
+    )
+    tags = {"domain_tags": ["career"], "sentiment_tag": "neutral", "keywords": ["job"]}
+    for key in ("a", "b", "c", "old"):
+        cache.put(db_session, key, tags, "model", "v1")
+    now = datetime.datetime.utcnow()
+    for key, age in (("a", 3), ("b", 2), ("c", 1), ("old", 31)):
+        row = db_session.get(TagCacheEntry, key)
+        row.last_used_at = now - datetime.timedelta(days=age)
+    db_session.commit()
+    assert cache.evict(db_session) == 2
+    db_session.expire_all()
+    remaining = {row.key for row in db_session.query(TagCacheEntry).all()}
+    assert remaining == {"b", "c"}
+
+
+def test_tag_cache_disabled_failure(db_session):
+    cache = TagCache(
+        TTLCache(), max_age_days=1, max_rows=1, evict_every=0, enabled=False
+    )
+    tags = {"domain_tags": ["career"], "sentiment_tag": "neutral", "keywords": ["job"]}
+    cache.put(db_session, "disabled", tags, "model", "v1")
+    assert cache.get(db_session, "disabled") is None
+
+
+def test_get_edge_hits_written_with_touch(db_session):
+    cache = TagCache(
+        TTLCache(max_size=10, ttl_seconds=60),
+        max_age_days=30,
+        max_rows=10,
+        evict_every=0,
+    )
+    tags = {"domain_tags": ["career"], "sentiment_tag": "neutral", "keywords": ["job"]}
+    key = f"hits-{uuid.uuid4().hex}"
+    cache.put(db_session, key, tags, "model", "v1")
+    for _ in range(2):
+        cache.memory.clear()
+        assert cache.get(db_session, key) == tags
+    db_session.expire_all()
+    row = db_session.get(TagCacheEntry, key)
+    # Fresh rows are only read; hits wait in memory for the next touch
+    assert row.hits == 0
+    row.last_used_at = datetime.datetime.utcnow() - datetime.timedelta(days=2)
+    db_session.commit()
+    cache.memory.clear()
+    assert cache.get(db_session, key) == tags
+    db_session.expire_all()
+    row = db_session.get(TagCacheEntry, key)
+    assert row.hits == 3
+    assert datetime.datetime.utcnow() - row.last_used_at < datetime.timedelta(hours=1)
@@ -0,0 +1,44 @@
+import pytest
+from app.utils.cache import TTLCache
+
+
+def test_cache_expected_hit_and_miss():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_cache_edge_lru_eviction():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_edge_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    now[0] += 4.9
+    assert cache.get("a") == 1
+    now[0] += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_failure_disabled_never_stores():
+    cache = TTLCache(max_size=10, ttl_seconds=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    cache.invalidate("missing")  # Should not raise
@@ -0,0 +1,22 @@
+import datetime
+import pytest
+from fastapi import HTTPException
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_expected():
+    ts = datetime.datetime(2025, 4, 19, 23, 25, 52, 909869)
+    cursor = encode_cursor(ts, "abc")
+    assert decode_cursor(cursor) == (ts, "abc")
+
+
+def test_cursor_edge_url_safe():
+    cursor = encode_cursor(datetime.datetime(2025, 1, 1), "id/with+chars?")
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["@@@", "bm90LWpzb24", "WzFd"])
+def test_cursor_failure_malformed(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 422
@@ -11,12 +11,15 @@ import os
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 from app.models import value_calibration, user, decision, gamification, reflection
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.main import app
 
 # Use a file-based SQLite DB for tests
 TEST_DB_URL = "sqlite:///./test.db"
+TEST_ASYNC_DB_URL = "sqlite+aiosqlite:///./test.db"
 Base = value_calibration.Base  # adjust if your Base is elsewhere
 
 import stat
@@ -41,6 +44,10 @@ def db_engine():
             os.remove("./test.db")
     except Exception as e:
         print(f"Warning: Could not remove old test.db: {e}")
+    # Reason: stale WAL/shared-memory files (SQLite performance mode) must not outlive test.db
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(f"./test.db{suffix}"):
+            os.remove(f"./test.db{suffix}")
     engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
     # Create all tables for all models
     Base.metadata.create_all(bind=engine)
@@ -98,6 +105,13 @@ def db_engine():
                 )
     except (Exception, sqlite3.OperationalError) as e:
         print(f"[conftest] Suppressed teardown error: {e}")
+    # Reason: WAL mode (SQLite performance mode) leaves these next to test.db
+    for suffix in ("-wal", "-shm"):
+        try:
+            if os.path.exists(f"./test.db{suffix}"):
+                os.remove(f"./test.db{suffix}")
+        except OSError as e:
+            print(f"[conftest] Could not remove test.db{suffix}: {e}")
 
 
 @pytest.fixture(scope="function")
@@ -130,7 +144,171 @@ def client(db_session):
     def override_get_db():
         yield db_session  # Always yield the same session object
 
+    # Reason: async handlers must read the same test.db the sync session writes to
+    async_engine = create_async_engine(TEST_ASYNC_DB_URL, poolclass=NullPool)
+
+    async def override_get_async_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     from fastapi.testclient import TestClient
 
     return TestClient(app)
+
+
+class FakeLLM:
+    """
+    OpenAI-compatible stand-in served through an in-process httpx transport.
+
+    - Requests with `functions` get a function_call reply built from `function_arguments`.
+    - Batch tagging requests get one result per "Entry N:" in the prompt, unless
+      `batch_results` is set.
+    - Other requests get `content` as the assistant message.
+    - Status codes queued in `failures` are returned (in order) before any success.
+    - Requests with `stream` get `content` as SSE chunks, one per word.
+    - `delay` adds simulated provider latency (seconds) to every request.
+    - `handle` serves the sync client and `ahandle` the async one.
+    """
+
+    def __init__(self):
+        self.content = "Fake AI reply."
+        self.function_arguments = {
+            "domain_tags": ["career"],
+            "sentiment_tag": "positive",
+            "keywords": ["promotion", "boss", "job"],
+        }
+        self.batch_results = None
+        self.delay = 0.0
+        self.failures = []
+        self.requests = []
+
+    def fail(self, status_code=500, times=100):
+        self.failures = [status_code] * times
+
+    def handle(self, request):
+        import time
+
+        if self.delay:
+            time.sleep(self.delay)
+        return self.respond(request)
+
+    async def ahandle(self, request):
+        import asyncio
+
+        # Reason: Async clients must not block the event loop while "waiting"
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.respond(request)
+
+    def respond(self, request):
+        import json
+        import httpx
+
+        body = json.loads(request.content)
+        self.requests.append(body)
+        if self.failures:
+            return httpx.Response(
+                self.failures.pop(0), json={"error": {"message": "fake failure"}}
+            )
+        if body.get("stream"):
+            return self.stream_response(body)
+        message = {"role": "assistant", "content": self.content}
+        if body.get("functions"):
+            name = body["functions"][0]["name"]
+            arguments = self.function_arguments
+            if name == "auto_tag_journal_entries":
+                count = body["messages"][-1]["content"].count("Entry ")
+                arguments = {
+                    "results": (
+                        self.batch_results
+                        if self.batch_results is not None
+                        else [
+                            {"index": i, **self.function_arguments}
+                            for i in range(count)
+                        ]
+                    )
+                }
+            message = {
+                "role": "assistant",
+                "content": None,
+                "function_call": {"name": name, "arguments": json.dumps(arguments)},
+            }
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": "stop", "message": message}],
+            },
+        )
+
+    def stream_response(self, body):
+        import json
+        import re
+        import httpx
+
+        def chunk(delta, finish_reason=None):
+            payload = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        events = [chunk({"role": "assistant", "content": ""})]
+        events += [
+            chunk({"content": piece}) for piece in re.findall(r"\S+\s*", self.content)
+        ]
+        events += [chunk({}, "stop"), "data: [DONE]\n\n"]
+        return httpx.Response(
+            200,
+            content="".join(events).encode(),
+            headers={"content-type": "text/event-stream"},
+        )
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Route the LLM gateway (sync and async) to a FakeLLM instead of the real provider."""
+    import asyncio
+    import httpx
+    import openai
+
+    from app.services.llm import client as llm_client
+
+    fake = FakeLLM()
+    fake_client = openai.OpenAI(
+        api_key="test-key",
+        base_url="http://llm.test/v1",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(fake.handle)),
+    )
+    # Reason: MockTransport opens no connections, so one client serves every loop
+    fake_async_client = openai.AsyncOpenAI(
+        api_key="test-key",
+        base_url="http://llm.test/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(fake.ahandle)),
+    )
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.llm.client.get_client", lambda: fake_client)
+    monkeypatch.setattr(
+        "app.services.llm.async_client._build_async_client",
+        lambda *args: fake_async_client,
+    )
+    monkeypatch.setattr("app.services.llm.client.LLM_RETRY_BACKOFF_SECONDS", 0)
+    llm_client.breaker.reset()
+    # Reason: Keep LLM-path tests deterministic; the local tier has its own tests
+    monkeypatch.setattr("app.services.auto_tagger.AUTO_TAG_LOCAL_CONFIDENCE", 2.0)
+    yield fake
+    fake_client.close()
+    asyncio.run(fake_async_client.close())
+    llm_client.breaker.reset()
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { postEventStream } from './sse';
 
 export interface Session {
   id: string;
@@ -37,9 +38,12 @@ export async function getOrCreateSession(decisionId: string): Promise<Session> {
   return newSession;
 }
 
-// 2. Fetch all messages for a session
-export async function getSessionMessages(sessionId: string): Promise<Message[]> {
-  const { data } = await axios.get(`/api/v1/sessions/${sessionId}/messages`);
+// 2. Fetch messages for a session: the latest `limit` by default, or older ones with `before`
+export async function getSessionMessages(
+  sessionId: string,
+  opts: { before?: string; after?: string; limit?: number } = {},
+): Promise<Message[]> {
+  const { data } = await axios.get(`/api/v1/sessions/${sessionId}/messages`, { params: opts });
   return data;
 }
 
@@ -78,3 +82,43 @@ export async function chatSession(sessionId: string, messages: { role: string; c
   const { data } = await axios.post(`/api/v1/decisions/sessions/${sessionId}/chat`, { messages });
   return data;
 }
+
+// 8b. Send one user turn; the backend keeps the session history and stores both turns.
+// A fallback reply (AI unavailable) is not stored and comes back with message_id null.
+export async function sendSessionTurn(
+  sessionId: string,
+  message: string,
+): Promise<{ reply: string; suggestions?: string[]; message_id?: string | null }> {
+  const { data } = await axios.post('/api/v1/decision-support/chat', { session_id: sessionId, message });
+  return data;
+}
+
+export interface StreamedReply {
+  reply: string;
+  suggestions?: string[] | null;
+  ai_generated: boolean;
+  message_id?: string | null;
+}
+
+// 9. Streaming decision-support chat (Server-Sent Events over POST).
+// Calls onToken for each text delta; resolves with the final reply. Pass the new user
+// turn as a string together with sessionId to use the server-side history (both turns
+// are stored); a full message list is still accepted for session-less chats.
+export async function streamDecisionSupportChat(
+  turn: string | { role: string; content: string }[],
+  onToken: (text: string) => void,
+  sessionId?: string,
+): Promise<StreamedReply> {
+  let result: StreamedReply | null = null;
+  const body = typeof turn === 'string' ? { message: turn, session_id: sessionId } : { messages: turn, session_id: sessionId };
+  await postEventStream('/decision-support/chat/stream', body, (event, data) => {
+    if (event === 'token') onToken(data.content);
+    else if (event === 'error') throw new Error(data.detail);
+    else if (event === 'done') {
+      result = data as StreamedReply;
+      return true;
+    }
+  });
+  if (!result) throw new Error('Stream ended before the reply completed');
+  return result;
+}
@@ -1,4 +1,5 @@
 import axios from "./client";
+import { postEventStream } from "./sse";
 
 export interface FutureSelfSimulationRequest {
   decision_context: string;
@@ -21,3 +22,51 @@ export async function simulateFutureSelf(
   );
   return response.data;
 }
+
+export interface FutureSelfStreamHandlers {
+  onProjection?: (text: string) => void;
+  onSuggestion?: (text: string, index: number) => void;
+}
+
+// Streaming variant: projection text and suggestions arrive as they are generated;
+// resolves with the same shape as simulateFutureSelf.
+export async function simulateFutureSelfStream(
+  payload: FutureSelfSimulationRequest,
+  handlers: FutureSelfStreamHandlers = {}
+): Promise<FutureSelfSimulationResponse> {
+  let result: FutureSelfSimulationResponse | null = null;
+  await postEventStream("/future-self/simulate/stream", payload, (event, data) => {
+    if (event === "projection") handlers.onProjection?.(data.content);
+    else if (event === "suggestion") handlers.onSuggestion?.(data.text, data.index);
+    else if (event === "error") throw new Error(data.detail);
+    else if (event === "done") {
+      result = data as FutureSelfSimulationResponse;
+      return true;
+    }
+  });
+  if (!result) throw new Error("Stream ended before the simulation completed");
+  return result;
+}
+
+export interface FutureSelfBatchRequest {
+  decision_context: string;
+  time_horizons?: (string | null)[];
+  value_sets?: string[][];
+}
+
+export interface FutureSelfBatchItem {
+  time_horizon?: string | null;
+  values?: string[] | null;
+  result: FutureSelfSimulationResponse;
+}
+
+// Compare several horizons/value sets in one request (simulated concurrently server-side).
+export async function simulateFutureSelfBatch(
+  payload: FutureSelfBatchRequest
+): Promise<FutureSelfBatchItem[]> {
+  const response = await axios.post<{ results: FutureSelfBatchItem[] }>(
+    "/future-self/simulate/batch",
+    payload
+  );
+  return response.data.results;
+}
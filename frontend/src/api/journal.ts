@@ -12,6 +12,10 @@ export interface JournalEntry {
   values?: string[];
   domain?: string;
   sentiment?: string;
+  domain_tags?: string[] | null;
+  sentiment_tag?: string | null;
+  keywords?: string[] | null;
+  tagging_status?: 'pending' | 'done' | 'failed' | null;
   created_at: string;
   updated_at: string;
 }
@@ -32,11 +36,26 @@ export interface JournalEntryUpdate {
   domain?: string;
 }
 
+// All of the user's entries in one response (no limit or cursor: unpaged).
 export async function listJournalEntries(): Promise<JournalEntry[]> {
   const resp = await axios.get(`${API_URL}/decisions/journal`, { withCredentials: true });
   return resp.data;
 }
 
+export interface JournalEntryPage {
+  entries: JournalEntry[];
+  nextCursor: string | null;
+}
+
+// Fetch one keyset page; pass the returned nextCursor to load older entries.
+export async function listJournalEntriesPage(cursor?: string, limit = 50): Promise<JournalEntryPage> {
+  const resp = await axios.get(`${API_URL}/decisions/journal`, {
+    params: { limit, ...(cursor ? { cursor } : {}) },
+    withCredentials: true,
+  });
+  return { entries: resp.data, nextCursor: resp.headers['x-next-cursor'] ?? null };
+}
+
 export async function createJournalEntry(payload: JournalEntryCreate): Promise<JournalEntry> {
   const resp = await axios.post(`${API_URL}/decisions/journal`, payload, { withCredentials: true });
   return resp.data;
@@ -46,3 +65,20 @@ export async function updateJournalEntry(id: string, payload: JournalEntryUpdate
   const resp = await axios.patch(`${API_URL}/decisions/journal/${id}`, payload, { withCredentials: true });
   return resp.data;
 }
+
+export interface JournalEntryTags {
+  entry_id: string;
+  tagging_status?: 'pending' | 'done' | 'failed' | null;
+  domain_tags?: string[] | null;
+  sentiment_tag?: string | null;
+  keywords?: string[] | null;
+}
+
+// Long-poll an entry's tags while background tagging is pending.
+export async function waitForJournalTags(id: string, waitSeconds = 20): Promise<JournalEntryTags> {
+  const resp = await axios.get(`${API_URL}/decisions/journal/${id}/tags`, {
+    params: { wait: waitSeconds },
+    withCredentials: true,
+  });
+  return resp.data;
+}
@@ -0,0 +1,49 @@
+// Minimal reader for Server-Sent Events sent in response to a POST request
+// (EventSource only supports GET). Each event's data is a JSON payload.
+
+const API_BASE = import.meta.env.VITE_API_URL || 'https://phronesis-backend-app.azurewebsites.net/api/v1';
+
+export async function postEventStream(
+  path: string,
+  body: unknown,
+  onEvent: (event: string, data: any) => boolean | void,
+): Promise<void> {
+  const token = localStorage.getItem('jwt');
+  const resp = await fetch(`${API_BASE}${path}`, {
+    method: 'POST',
+    credentials: 'include',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify(body),
+  });
+  if (!resp.ok || !resp.body) {
+    throw new Error(`Streaming request failed: ${resp.status}`);
+  }
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) >= 0) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      // Returning true from onEvent stops reading
+      if (onEvent(event, JSON.parse(data)) === true) {
+        await reader.cancel();
+        return;
+      }
+    }
+  }
+}
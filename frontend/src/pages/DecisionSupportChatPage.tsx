@@ -21,7 +21,8 @@ import {
   listSessions, 
   getSessionSummary, 
   getDecisionSummary,
-  chatSession // <--- added import
+  chatSession, // <--- added import
+  sendSessionTurn
 } from '../api/decisionChat';
 import { useParams } from 'react-router-dom';
 
@@ -93,22 +94,18 @@ const DecisionSupportChatPage: React.FC = () => {
     setError(null);
     setInput('');
     try {
-      // 1. Persist user message to backend
-      const userMsg = await postSessionMessage(session.id, { sender: 'user', content });
-      // 2. Fetch latest messages (including the new user message)
-      const updatedMessages = await getSessionMessages(session.id);
-      setMessages(updatedMessages);
-      // 3. Call AI chat endpoint with full message history
-      const { reply: aiReply, suggestions: aiSuggestions } = await chatSession(
-        session.id,
-        updatedMessages.map(m => ({ role: m.sender, content: m.content }))
-      );
-      // 4. Persist AI reply to backend
-      const aiMsg = await postSessionMessage(session.id, { sender: 'ai', content: aiReply });
-      // 5. Fetch all messages again (for audit/replay correctness)
+      // 1. Send only the new turn; the backend stores it, builds the prompt from
+      //    the session history and stores the AI reply
+      const { reply, suggestions: aiSuggestions, message_id } = await sendSessionTurn(session.id, content);
+      // 2. Fetch the latest messages (both new turns)
       const finalMessages = await getSessionMessages(session.id);
-      setMessages(finalMessages);
-      // 6. Handle suggestions
+      // A fallback reply (AI unavailable) is not stored, so show it here only
+      setMessages(
+        message_id
+          ? finalMessages
+          : [...finalMessages, { sender: 'ai', content: reply, transient: true }]
+      );
+      // 3. Handle suggestions
       setSuggestions(aiSuggestions || []);
       setTimeout(() => {
         if (chatRef.current) chatRef.current.scrollToBottom();